@@ -0,0 +1,175 @@
+"""Scan of the Keepa exports for ASINs with unusual price drops and stock-outs.
+
+Every signal column (the drop % of Buy Box, Amazon and New over every
+window and since the last visit, the ``Is Lowest`` flags, the ``90 days
+OOS`` shares and the ``OOS Count`` columns) is scored against the
+distribution of the ASIN's brand and of its subcategory with a robust
+z-score:
+
+    z = (value - group median) / (1.4826 x group MAD)
+
+When the MAD is zero, as for drop columns where most products did not
+move, the mean absolute deviation (x 1.2533) is used instead. Flags are
+scored by how rare they are in the group: ``(flag - share) /
+sqrt(share x (1 - share))``. Groups with fewer than ``min_group`` values
+are compared with the whole catalogue.
+
+An ASIN is unusual in a signal when it stands out from both its brand and
+its category, so a signal's score is the smaller of the two. Drops count in
+both directions (a sharp rise is as unusual as a sharp fall); stock-outs
+and flags only upwards. All columns are scored together with a few grouped
+medians, so a scan over millions of rows takes seconds.
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+from brand_metrics import BRAND_COLUMN, LOCALE_COLUMN
+from category_metrics import SUB_COLUMN
+from keepa_schema import columns_of_kind
+from profiling import profiled
+
+ASIN_COLUMN = 'ASIN'
+
+# Signal columns, by name; wider exports add their windows automatically
+DROP_PATTERN = r'^(Buy Box|Amazon|New) ?: (\d+ days? drop %|Drop % since last visit)$'
+SIGNAL_PATTERNS = [
+    DROP_PATTERN,
+    r'^(Buy Box|Amazon|New) ?: Is Lowest( \d+ days)?$',
+    r'^(Buy Box|Amazon|New) ?: \d+ days OOS$',
+    r'^(Buy Box|Amazon|New) ?: OOS Count \d+ days$',
+]
+
+PEER_COLUMNS = [BRAND_COLUMN, SUB_COLUMN]
+
+# Iglewicz and Hoaglin's cut-off for the modified z-score
+THRESHOLD = 3.5
+MIN_GROUP = 5
+
+
+def signal_columns(columns):
+    patterns = [re.compile(pattern) for pattern in SIGNAL_PATTERNS]
+    return [name for name in columns if any(pattern.search(name) for pattern in patterns)]
+
+
+def _values(frame, name):
+    return frame[name].to_numpy(dtype='float64', na_value=np.nan)
+
+
+def flag_columns(signals):
+    """Signals declared boolean in the schema, whatever dtype they were
+    loaded with (bool, nullable boolean or object)."""
+    return set(columns_of_kind(signals, 'bool'))
+
+
+def _scale(mad, mean_ad):
+    """Robust standard deviation: 1.4826 MAD, or 1.2533 mean absolute
+    deviation where the MAD is zero."""
+    return np.where(mad > 0, 1.4826 * mad, 1.2533 * mean_ad)
+
+
+def catalogue_statistics(frame, signals, flags=frozenset()):
+    """(centre, scale) of every signal over the whole catalogue; ``flags``
+    are scored by their share."""
+    statistics = {}
+    for name in signals:
+        values = _values(frame, name)
+        if name in flags:
+            share = np.nanmean(values)
+            statistics[name] = (share, np.sqrt(share * (1 - share)))
+        else:
+            center = np.nanmedian(values)
+            deviation = np.abs(values - center)
+            statistics[name] = (center, float(_scale(np.nanmedian(deviation), np.nanmean(deviation))))
+    return statistics
+
+
+def group_statistics(frame, signals, peer, catalogue, min_group=MIN_GROUP, flags=frozenset()):
+    """Group codes of ``peer`` and the (centre, scale) of every signal per
+    group, as arrays indexed by group code. The last entry holds the
+    ``catalogue`` statistics, used for rows without a group (code -1) and
+    for groups with fewer than ``min_group`` values.
+
+    The categorical group column is used as the grouper as is, so no
+    statistic factorizes it again.
+    """
+    keys = frame[peer]
+    if not isinstance(keys.dtype, pd.CategoricalDtype):
+        keys = keys.astype('category')
+    codes, keys = keys.cat.codes.to_numpy(), keys.array
+
+    statistics = {}
+    for name in signals:
+        values = _values(frame, name)
+        grouped = pd.Series(values).groupby(keys, observed=False)
+        small = grouped.count().to_numpy() < min_group
+        overall, overall_scale = catalogue[name]
+        if name in flags:
+            share = np.append(np.where(small, overall, grouped.mean().to_numpy()), overall)
+            statistics[name] = (share, np.sqrt(share * (1 - share)))
+            continue
+        center = np.append(np.where(small, overall, grouped.median().to_numpy()), overall)
+        grouped = pd.Series(np.abs(values - center[codes])).groupby(keys, observed=False)
+        scale = _scale(grouped.median().to_numpy(), grouped.mean().to_numpy())
+        statistics[name] = (center, np.append(np.where(small, overall_scale, scale), overall_scale))
+    return codes, statistics
+
+
+@profiled()
+def scan_anomalies(frame, threshold=THRESHOLD, min_group=MIN_GROUP, peers=PEER_COLUMNS):
+    """Ranked alerts: one row per ASIN with at least one signal scoring
+    ``threshold`` or more against each of its ``peers`` groups.
+
+    Each alert names the strongest signal with its value, the medians of
+    the peer groups (the share of the group for flags) and its score, and
+    counts the ASIN's unusual signals. Signals are then scored one column
+    at a time, keeping only the strongest per row.
+    """
+    signals = signal_columns(frame.columns)
+    peers = [name for name in peers if name in frame]
+    keys = [name for name in (LOCALE_COLUMN, ASIN_COLUMN, BRAND_COLUMN, SUB_COLUMN) if name in frame]
+    if not signals or not peers:
+        return pd.DataFrame(columns=keys + ['Signal', 'Value'] + [f'{name} median' for name in peers]
+                            + ['Score', 'Signals'])
+    flags = flag_columns(signals)
+    catalogue = catalogue_statistics(frame, signals, flags)
+    groups = {name: group_statistics(frame, signals, name, catalogue, min_group, flags) for name in peers}
+
+    rows = len(frame)
+    best = np.full(rows, -np.inf)
+    strongest = np.zeros(rows, dtype=np.int16)
+    value = np.full(rows, np.nan)
+    medians = {name: np.full(rows, np.nan) for name in peers}
+    count = np.zeros(rows, dtype=np.int16)
+    for position, signal in enumerate(signals):
+        values = _values(frame, signal)
+        score, centers = None, {}
+        for name in peers:
+            codes, statistics = groups[name]
+            center, scale = statistics[signal]
+            centers[name] = center[codes]
+            # A zero scale means every value of the group equals its centre:
+            # 0 / 0 is NaN, which never counts as unusual
+            with np.errstate(divide='ignore', invalid='ignore'):
+                z = (values - centers[name]) / scale[codes]
+            if re.search(DROP_PATTERN, signal):
+                z = np.abs(z)
+            score = z if score is None else np.minimum(score, z)
+        count += score >= threshold
+        stronger = score > best
+        best[stronger] = score[stronger]
+        strongest[stronger] = position
+        value[stronger] = values[stronger]
+        for name in peers:
+            medians[name][stronger] = centers[name][stronger]
+
+    hits = np.flatnonzero(count > 0)
+    alerts = frame[keys].iloc[hits].reset_index(drop=True)
+    alerts['Signal'] = pd.Categorical.from_codes(strongest[hits], signals)
+    alerts['Value'] = value[hits]
+    for name in peers:
+        alerts[f'{name} median'] = medians[name][hits]
+    alerts['Score'] = best[hits]
+    alerts['Signals'] = count[hits]
+    return alerts.sort_values(['Score', 'Signals'], ascending=False, ignore_index=True)
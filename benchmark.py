@@ -0,0 +1,181 @@
+"""Benchmark of the data pipeline on synthetic data.
+
+For every size, ``synthetic_data`` writes a Keepa export and a combined
+pricing file (reused on later runs) and every pipeline stage runs on them
+in dashboard order. Each stage records its wall time (best of ``--repeat``
+runs) and its peak memory. Peak memory is the process high-water mark
+during the stage, read from ``/proc`` on Linux so that Arrow allocations
+count too; elsewhere only the allocations ``tracemalloc`` sees are counted,
+in an extra run.
+
+Results go to a JSON file named after the git revision, so two versions can
+be compared:
+
+    python benchmark.py --sizes 1000 100000 1000000
+    python benchmark.py --sizes 1000 100000 --compare bench_results/<revision>.json
+"""
+import argparse
+import datetime
+import gc
+import json
+import os
+import platform
+import re
+import subprocess
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from anomalies import scan_anomalies
+from box_stats import box_stats
+from brand_metrics import ALL_LOCALES, BRAND_COLUMN, LOCALE_COLUMN, brand_metrics, top_n
+from category_metrics import ROOT_COLUMN, SUB_COLUMN, category_metrics
+from category_tree import CategoryTree
+from data_loader import NUMERIC_COLUMNS, anomaly_column, read_keepa, read_pricing
+from filters import FilterIndex
+from ingest import ingest
+from keepa_schema import apply_schema
+from margins import MarginModel
+from pricing_stream import CORRELATED, GROUPED, stream_pricing
+from summary_stats import approximate_summary_statistics, summary_statistics
+from synthetic_data import ensure_files
+
+SIZES = [1_000, 10_000, 100_000, 1_000_000]
+
+
+def stages(paths):
+    """(name, function) per stage; a function gets the outputs of the
+    stages before it and returns its own."""
+    keepa_path, pricing_path = paths
+    return [
+        # CSV read and value parsing only; the typed frame is not kept
+        ('parsing', lambda out: apply_schema(pd.read_csv(keepa_path, dtype=str))[1]),
+        ('ingest', lambda out: (ingest(keepa_path, 'keepa'), ingest(pricing_path, 'pricing'))),
+        ('load', lambda out: (read_keepa(keepa_path), read_pricing(pricing_path))),
+        ('cleaning', lambda out: out['load'][0][FilterIndex(out['load'][0]).mask(())]),
+        ('brand aggregations', lambda out: top_n(
+            brand_metrics(out['cleaning'], by=[LOCALE_COLUMN, BRAND_COLUMN], total=ALL_LOCALES),
+            'Buy Box : Current')),
+        ('summary stats', lambda out: summary_statistics(out['cleaning'], NUMERIC_COLUMNS)),
+        ('approximate summary stats', lambda out: approximate_summary_statistics(out['cleaning'], NUMERIC_COLUMNS)),
+        ('category counts', lambda out: [category_metrics(out['cleaning'], column, by=LOCALE_COLUMN,
+                                                          total=ALL_LOCALES) for column in (ROOT_COLUMN, SUB_COLUMN)]),
+        ('category tree', lambda out: CategoryTree(out['cleaning'])),
+        # The dashboard loads the signals only for the Price Drop Analysis page
+        ('signal load', lambda out: read_keepa(keepa_path, anomaly_column).dropna(subset=['Brand'])),
+        ('anomaly scan', lambda out: scan_anomalies(out['signal load'])),
+        ('margin model', lambda out: MarginModel(out['cleaning'])),
+        ('margin what-if', lambda out: (out['margin model'].proceeds(price_change=-5, cogs=40, fba=4),
+                                        out['margin model'].group_margins(price_change=-5, cogs=40, fba=4,
+                                                                          total=ALL_LOCALES))),
+        ('box-plot prep', lambda out: [box_stats(out['load'][1], group, value) for value, group in GROUPED]),
+        ('correlations', lambda out: [out['load'][1][x].corr(out['load'][1][y]) for x, y in CORRELATED]),
+        ('streaming pricing', lambda out: stream_pricing(pricing_path)),
+    ]
+
+
+def _high_water_mark():
+    with open('/proc/self/status') as handle:
+        return int(re.search(r'VmHWM:\s+(\d+) kB', handle.read()).group(1)) * 1024
+
+
+def _reset_high_water_mark():
+    """Reset the process peak RSS; False where that is not supported."""
+    try:
+        with open('/proc/self/clear_refs', 'w') as handle:
+            handle.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def measure(function, outputs, repeat=1):
+    """Best wall time, peak memory above the start and output of a stage."""
+    seconds, peak, result = [], None, None
+    for _ in range(repeat):
+        result = None
+        gc.collect()
+        tracked = _reset_high_water_mark()
+        before = _high_water_mark() if tracked else 0
+        start = time.perf_counter()
+        result = function(outputs)
+        seconds.append(time.perf_counter() - start)
+        if tracked:
+            peak = max(peak or 0, _high_water_mark() - before)
+    if peak is None:
+        result = None
+        gc.collect()
+        tracemalloc.start()
+        result = function(outputs)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return min(seconds), peak, result
+
+
+def revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(sizes, data_dir, repeat=1, seed=0):
+    results = []
+    for rows in sizes:
+        paths = ensure_files(data_dir, rows, seed)
+        outputs = {}
+        for stage, function in stages(paths):
+            seconds, peak, outputs[stage] = measure(function, outputs, repeat)
+            results.append({'rows': rows, 'stage': stage, 'seconds': round(seconds, 6), 'peak_bytes': peak})
+            print(f"{rows:>10,} {stage:28s} {seconds:10.4f} s {peak / 2 ** 20:10.1f} MB", flush=True)
+    return {
+        'revision': revision(),
+        'created': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'platform': platform.platform(),
+        'python': platform.python_version(),
+        'versions': {'numpy': np.__version__, 'pandas': pd.__version__, 'pyarrow': pa.__version__},
+        'repeat': repeat,
+        'seed': seed,
+        'peak_memory': 'rss' if _reset_high_water_mark() else 'tracemalloc',
+        'results': results,
+    }
+
+
+def compare(current, baseline):
+    """Time and memory of ``current`` relative to ``baseline`` per stage."""
+    key = ['rows', 'stage']
+    table = pd.DataFrame(current['results']).merge(pd.DataFrame(baseline['results']), on=key,
+                                                   suffixes=('', ' baseline'))
+    table['time ratio'] = table['seconds'] / table['seconds baseline']
+    table['memory ratio'] = table['peak_bytes'] / table['peak_bytes baseline']
+    return table.set_index(key)[['seconds baseline', 'seconds', 'time ratio', 'memory ratio']]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the data pipeline on synthetic data.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES,
+                        help="rows per dataset (default: 1000 10000 100000 1000000)")
+    parser.add_argument('--repeat', type=int, default=1, help="runs per stage, the best time is kept")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--data', default='bench_data', help="directory of the synthetic files")
+    parser.add_argument('--output', help="result file (default: bench_results/<revision>.json)")
+    parser.add_argument('--compare', help="earlier result file to compare with")
+    args = parser.parse_args(argv)
+
+    report = run(args.sizes, args.data, args.repeat, args.seed)
+    output = args.output or os.path.join('bench_results', f"{report['revision'] or 'local'}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w') as handle:
+        json.dump(report, handle, indent=2)
+    print(f"-> {output}")
+    if args.compare:
+        with open(args.compare) as handle:
+            print(compare(report, json.load(handle)).round(3).to_string())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""Per-group box plot statistics: quartiles, Tukey whiskers and a capped
+set of outliers.
+
+``box_stats`` computes them exactly from a frame; the streaming pricing
+aggregates derive the same table from quantile sketches and the tracked
+extreme values of each group (``sketch_box_stats``).
+"""
+import numpy as np
+import pandas as pd
+
+from profiling import profiled
+
+# Default number of outlier points kept per box
+MAX_OUTLIERS = 50
+
+
+def cap_outliers(outliers, median, max_outliers):
+    """Keep the ``max_outliers`` values furthest from the median."""
+    if len(outliers) <= max_outliers:
+        return outliers
+    distance = np.abs(outliers - median)
+    return outliers[np.argsort(-distance, kind='stable')[:max_outliers]]
+
+
+@profiled()
+def box_stats(frame, group, value, max_outliers=MAX_OUTLIERS):
+    """``describe()``-style box statistics of ``value`` per ``group``.
+
+    Adds Tukey whiskers (``lowerfence`` / ``upperfence``: the most extreme
+    values within 1.5 IQR of the box) and an ``outliers`` column holding at
+    most ``max_outliers`` points beyond the whiskers per group.
+    """
+    data = frame[[group, value]].dropna()
+    grouped = data.groupby(group, observed=True)[value]
+    stats = grouped.quantile([0.25, 0.5, 0.75]).unstack()
+    stats.columns = ['25%', '50%', '75%']
+    stats = grouped.agg(['count', 'mean', 'min', 'max']).join(stats)
+
+    iqr = stats['75%'] - stats['25%']
+    low = (stats['25%'] - 1.5 * iqr).reindex(data[group]).to_numpy()
+    high = (stats['75%'] + 1.5 * iqr).reindex(data[group]).to_numpy()
+    values = data[value].to_numpy()
+    inside = (values >= low) & (values <= high)
+
+    whiskers = data[inside].groupby(group, observed=True)[value].agg(['min', 'max'])
+    stats['lowerfence'] = whiskers['min']
+    stats['upperfence'] = whiskers['max']
+    outliers = data[~inside].groupby(group, observed=True)[value].agg(list)
+    stats['outliers'] = [
+        cap_outliers(np.asarray(outliers.get(key, []), dtype=float), median, max_outliers)
+        for key, median in stats['50%'].items()
+    ]
+    return stats
+
+
+def sketch_box_stats(stats, extremes, max_outliers=MAX_OUTLIERS):
+    """Box statistics from a sketch-based ``describe()`` frame.
+
+    ``extremes`` holds the smallest and largest values seen per group
+    (``key`` and ``value`` columns). Whiskers are the most extreme of those
+    inside 1.5 IQR; when none is, the fence clipped to min/max is used.
+    """
+    stats = stats.copy()
+    iqr = stats['75%'] - stats['25%']
+    low = np.maximum(stats['25%'] - 1.5 * iqr, stats['min'])
+    high = np.minimum(stats['75%'] + 1.5 * iqr, stats['max'])
+    by_group = dict(tuple(extremes.groupby('key')['value']))
+
+    lowerfence, upperfence, outliers = [], [], []
+    for key in stats.index:
+        values = by_group.get(key, pd.Series(dtype=float)).to_numpy()
+        inside = values[(values >= low[key]) & (values <= high[key])]
+        lowerfence.append(inside.min() if len(inside) else low[key])
+        upperfence.append(inside.max() if len(inside) else high[key])
+        beyond = values[(values < low[key]) | (values > high[key])]
+        outliers.append(cap_outliers(beyond, stats.at[key, '50%'], max_outliers))
+    stats['lowerfence'] = lowerfence
+    stats['upperfence'] = upperfence
+    stats['outliers'] = outliers
+    return stats
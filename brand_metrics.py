@@ -0,0 +1,101 @@
+"""Per-brand metrics table computed in one grouped pass.
+
+Every brand chart and top-N list reads from ``brand_metrics``; the metric
+columns are picked by name, so additional drop or winner-count windows in
+wider exports are included automatically.
+
+Grouped by ``['Locale', 'Brand']`` the table holds every marketplace, and
+the across-marketplace rows are summed from the same per-locale partials
+instead of being grouped again.
+"""
+import re
+
+import pandas as pd
+
+from profiling import profiled
+
+BRAND_COLUMN = 'Brand'
+LOCALE_COLUMN = 'Locale'
+
+# Locale label of the rows rolled up across marketplaces
+ALL_LOCALES = 'All'
+
+PRICE_COLUMN = 'Buy Box : Current'
+RANK_COLUMN = 'Sales Rank: 90 days avg.'
+
+# Metric families aggregated per brand besides price and rank
+METRIC_PATTERNS = [
+    r'^Buy Box : \d+ days? drop %$',
+    r'^Buy Box: Winner Count \d+ days$',
+    r'^Count of retrieved live offers: ',
+]
+
+
+def metric_columns(columns):
+    patterns = [re.compile(pattern) for pattern in METRIC_PATTERNS]
+    return [PRICE_COLUMN, RANK_COLUMN] + [
+        name for name in columns
+        if any(pattern.search(name) for pattern in patterns)
+    ]
+
+
+def append_total(partials, total=ALL_LOCALES):
+    """Append the rows of ``partials`` summed over the first index level
+    (the locale) under the label ``total``.
+
+    Only additive partials (sums and counts) may be rolled up this way.
+    """
+    levels = list(range(1, partials.index.nlevels))
+    rolled = partials.groupby(level=levels, observed=True).sum()
+    rolled = pd.concat({total: rolled}, names=[partials.index.names[0]])
+    return pd.concat([partials, rolled])
+
+
+def brand_partials(df, by=BRAND_COLUMN):
+    """Per-group sum and count of every metric column plus ``Products``.
+
+    Partials are additive: those of two frames can be added (or one
+    subtracted from the other) with ``DataFrame.add``/``sub``.
+    """
+    columns = [name for name in metric_columns(df.columns) if name in df.columns]
+    grouped = df.groupby(by, observed=True)
+    partials = grouped[columns].agg(['sum', 'count'])
+    partials[('Products', 'sum')] = grouped.size()
+    return partials
+
+
+def metrics_from_partials(partials, total=None):
+    if total is not None:
+        partials = append_total(partials, total)
+    table = (partials.xs('sum', axis=1, level=1).drop(columns='Products')
+             / partials.xs('count', axis=1, level=1))
+    table.insert(0, 'Products', partials[('Products', 'sum')].round().astype('int64'))
+    return table
+
+
+@profiled()
+def brand_metrics(df, by=BRAND_COLUMN, total=None):
+    """Mean of every metric column and the product count per brand.
+
+    Means are derived from one ``agg(['sum', 'count'])`` pass; the metric
+    columns keep their Keepa names, ``Products`` counts rows per brand.
+    With a list ``by`` such as ``['Locale', 'Brand']`` and a ``total``
+    label, the across-locale rows are appended, see ``append_total``.
+    """
+    return metrics_from_partials(brand_partials(df, by), total)
+
+
+def for_locale(table, locale):
+    """Rows of one locale (or of ``ALL_LOCALES``) of a per-locale table."""
+    if locale not in table.index.unique(LOCALE_COLUMN):
+        return table.iloc[:0].droplevel(LOCALE_COLUMN)
+    return table.xs(locale, level=LOCALE_COLUMN)
+
+
+def top_n(table, column, n=10, ascending=False):
+    """The ``n`` brands with the highest (or lowest) ``column``.
+
+    Uses ``nlargest``/``nsmallest``, which select without sorting every brand.
+    """
+    values = table[column].dropna()
+    return values.nsmallest(n) if ascending else values.nlargest(n)
@@ -0,0 +1,57 @@
+"""Category counts and per-category sales rank of the Keepa export.
+
+``category_metrics`` computes product counts and rank partials in one
+grouped pass, per locale and across locales; ``top_categories`` and
+``category_sales_rank`` read from its table.
+"""
+import pandas as pd
+
+from brand_metrics import append_total
+from profiling import profiled
+
+ROOT_COLUMN = 'Categories: Root'
+SUB_COLUMN = 'Categories: Sub'
+RANK_COLUMN = 'Sales Rank: 90 days avg.'
+
+
+def category_partials(df, column=ROOT_COLUMN, by=None):
+    """Additive per-category partials: product count and rank sum and count.
+
+    ``by`` adds leading group columns (e.g. ``'Locale'``).
+    """
+    keys = [by, column] if isinstance(by, str) else list(by or []) + [column]
+    grouped = df.groupby(keys if len(keys) > 1 else column, observed=True)
+    return pd.DataFrame({
+        'Products': grouped.size(),
+        'rank_sum': grouped[RANK_COLUMN].sum(),
+        'rank_count': grouped[RANK_COLUMN].count(),
+    })
+
+
+def metrics_from_partials(partials, total=None):
+    if total is not None:
+        partials = append_total(partials, total)
+    return pd.DataFrame({
+        'Products': partials['Products'].round().astype('int64'),
+        RANK_COLUMN: partials['rank_sum'] / partials['rank_count'],
+    })
+
+
+@profiled()
+def category_metrics(df, column=ROOT_COLUMN, by=None, total=None):
+    """Product count and mean 90-day sales rank per category.
+
+    ``by`` adds leading group columns (e.g. ``'Locale'``); with a ``total``
+    label the rows summed across the first of them are appended.
+    """
+    return metrics_from_partials(category_partials(df, column, by), total)
+
+
+def top_categories(table, n=10):
+    """Product count of the ``n`` most common categories."""
+    return table['Products'].nlargest(n)
+
+
+def category_sales_rank(table):
+    """Mean 90-day sales rank per category, highest first."""
+    return table[RANK_COLUMN].dropna().sort_values(ascending=False)
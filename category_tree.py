@@ -0,0 +1,102 @@
+"""Hierarchical index of the ``Categories: Tree`` paths.
+
+``Categories: Tree`` holds paths such as ``Bellezza › Fragranze e profumi ›
+Uomo › Eau de Parfum``. ``CategoryTree`` parses every distinct path once
+into nodes (id, name, depth, parent) and precomputes, for every node, the
+product count and the mean price, sales rank and drop % of all products
+below it. Drilling down is then a lookup in the node table.
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+from brand_metrics import PRICE_COLUMN, RANK_COLUMN
+from profiling import profiled
+
+TREE_COLUMN = 'Categories: Tree'
+SEPARATOR = '›'
+
+# Columns averaged at every node besides price and rank
+DROP_PATTERN = r'^Buy Box : \d+ days? drop %$'
+
+
+def tree_metrics(columns):
+    return [PRICE_COLUMN, RANK_COLUMN] + [name for name in columns if re.search(DROP_PATTERN, name)]
+
+
+def split_path(path):
+    return [part.strip() for part in path.split(SEPARATOR) if part.strip()]
+
+
+class CategoryTree:
+    """Category nodes with rollups and ASIN membership.
+
+    ``nodes`` is indexed by node id with the columns ``path``, ``name``,
+    ``depth``, ``parent`` (-1 for roots), ``Products`` and the mean of every
+    ``tree_metrics`` column. A product counts towards its own node and every
+    ancestor.
+    """
+
+    @profiled()
+    def __init__(self, frame, column=TREE_COLUMN, metrics=None):
+        metrics = [name for name in (metrics or tree_metrics(frame.columns)) if name in frame.columns]
+        trees = frame[column]
+        if not isinstance(trees.dtype, pd.CategoricalDtype):
+            trees = trees.astype('category')
+        trees = trees.cat.remove_unused_categories()
+        codes = trees.cat.codes.to_numpy()
+
+        # Only the distinct paths are parsed; chains[code] lists the node ids
+        # from the root down to the node of that path
+        node_ids, rows, chains = {}, [], []
+        for path in trees.cat.categories:
+            parts = split_path(path)
+            chain, parent = [], -1
+            for depth in range(len(parts)):
+                key = tuple(parts[:depth + 1])
+                if key not in node_ids:
+                    node_ids[key] = len(rows)
+                    rows.append((f' {SEPARATOR} '.join(key), parts[depth], depth, parent))
+                parent = node_ids[key]
+                chain.append(parent)
+            chains.append(chain)
+        nodes = pd.DataFrame(rows, columns=['path', 'name', 'depth', 'parent'])
+        nodes.index.name = 'node'
+
+        # Sums and counts per distinct path in one grouped pass, then added
+        # into every node on the path
+        valid = codes >= 0
+        grouped = frame.loc[valid, metrics].astype('float64').groupby(codes[valid])
+        partials = grouped.sum().join(grouped.count(), rsuffix=' count')
+        partials['Products'] = grouped.size()
+        links = pd.DataFrame({
+            'code': np.repeat(np.arange(len(chains)), [len(chain) for chain in chains]),
+            'node': np.concatenate(chains) if chains else np.array([], dtype=np.int64),
+        })
+        totals = partials.reindex(links['code']).fillna(0).groupby(links['node'].to_numpy()).sum()
+        totals = totals.reindex(nodes.index, fill_value=0)
+        nodes['Products'] = totals['Products'].astype('int64')
+        for name in metrics:
+            nodes[name] = totals[name] / totals[f'{name} count']
+        self.nodes = nodes
+        self.metrics = metrics
+
+        # Membership: ASINs sorted by path code, with the offsets of each path
+        order = np.argsort(codes[valid], kind='stable')
+        self.members = frame['ASIN'].to_numpy()[valid][order] if 'ASIN' in frame else order
+        self.offsets = np.searchsorted(codes[valid][order], np.arange(len(chains) + 1))
+        self.node_codes = links.groupby('node')['code'].agg(list)
+        self.child_ids = {parent: list(ids) for parent, ids in nodes.groupby('parent').groups.items()}
+
+    def children(self, node=None):
+        """Child nodes of ``node`` (the roots for ``None``), largest first."""
+        ids = self.child_ids.get(-1 if node is None else node, [])
+        return self.nodes.loc[ids].sort_values('Products', ascending=False)
+
+    def asins(self, node):
+        """ASINs of all products in ``node`` and below."""
+        codes = self.node_codes.get(node, [])
+        if not codes:
+            return np.array([], dtype=object)
+        return np.concatenate([self.members[self.offsets[code]:self.offsets[code + 1]] for code in codes])
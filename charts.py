@@ -0,0 +1,144 @@
+"""Plotly figures built from precomputed statistics instead of raw rows.
+
+Box plots are sent to the browser as per-group quartiles, whiskers and a
+capped set of outliers (see ``box_stats``), so the payload grows with the
+number of groups and not with the number of rows.
+
+Every builder is served from ``figure_cache`` when its inputs are unchanged;
+the returned figures are shared and must not be modified.
+"""
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+from figure_cache import cached_figure
+
+
+@cached_figure
+def brand_bar(values, value_label, title, axis_label):
+    """Bar chart of a per-brand Series, e.g. from ``brand_metrics.top_n``."""
+    frame = values.round(2).rename(value_label).rename_axis('Brand').reset_index()
+    return px.bar(frame, x='Brand', y=value_label, title=title, labels={value_label: axis_label})
+
+
+@cached_figure
+def locale_bar(values, value_label, title, axis_label, name_label='Brand'):
+    """Grouped bar chart of a Series indexed by (locale, name), one bar per
+    locale in every group."""
+    frame = values.round(2).rename(value_label).rename_axis(['Locale', name_label]).reset_index()
+    return px.bar(frame, x=name_label, y=value_label, color='Locale', barmode='group',
+                  title=title, labels={value_label: axis_label})
+
+
+@cached_figure
+def history_line(history, column, title, axis_label):
+    """Line chart of ``column`` over the snapshots, one line per locale."""
+    frame = history.sort_values('Snapshot')
+    return px.line(frame, x='Snapshot', y=column, color='Locale', markers=True, title=title,
+                   labels={column: axis_label})
+
+
+@cached_figure
+def histogram_bar(counts, title, axis_label):
+    """Bar chart of precomputed bin counts, e.g. from ``margins.margin_histogram``."""
+    frame = counts.rename_axis('bin').rename('count').reset_index()
+    return px.bar(frame, x='bin', y='count', title=title, labels={'bin': axis_label, 'count': counts.name})
+
+
+@cached_figure
+def window_line(values, title, axis_label):
+    """Line chart of a metric over its windows, one line per brand, from a
+    ``mean`` Series indexed by brand and window (see ``metric_families``)."""
+    frame = values.round(2).rename('mean').reset_index()
+    return px.line(frame, x='window', y='mean', color='Brand', markers=True, title=title,
+                   labels={'window': 'Window (days)', 'mean': axis_label})
+
+
+@cached_figure
+def source_price_scatter(table):
+    """Source price against the Keepa Buy Box price, one point per product
+    and source (``identifiers.cross_source_prices``)."""
+    keepa = table.filter(like='Keepa ').mean(axis=1).rename('Keepa Buy Box Price')
+    prices = table.filter(regex='^price ').rename(columns=lambda name: name[len('price '):])
+    frame = (prices.join(keepa).join(table['Brand']).rename_axis('ASIN').reset_index()
+             .melt(id_vars=['ASIN', 'Brand', 'Keepa Buy Box Price'], var_name='Source', value_name='Source Price')
+             .dropna())
+    return px.scatter(frame, x='Keepa Buy Box Price', y='Source Price', color='Source',
+                      hover_data=['ASIN', 'Brand'], title='Source Price vs. Keepa Buy Box Price',
+                      labels={'Keepa Buy Box Price': 'Keepa Buy Box Price (€)', 'Source Price': 'Source Price (€)'})
+
+
+@cached_figure
+def category_pie(counts, name_label, title):
+    """Pie chart of per-category product counts."""
+    frame = counts.rename('Count').rename_axis(name_label).reset_index()
+    return px.pie(frame, names=name_label, values='Count', title=title)
+
+
+@cached_figure
+def category_node_bar(nodes, title):
+    """Product count per node of ``category_tree.CategoryTree``."""
+    return px.bar(nodes, x='name', y='Products', title=title, labels={'name': 'Category'},
+                  hover_data={column: ':.2f' for column in nodes.columns[5:]})
+
+
+@cached_figure
+def category_rank_bar(ranks):
+    """Average 90-day sales rank per main category."""
+    value_label = 'Avg. Sales Rank (90 days avg.)'
+    frame = ranks.round(2).rename(value_label).rename_axis('Main Category').reset_index()
+    fig = px.bar(
+        frame,
+        x='Main Category',
+        y=value_label,
+        title='Average Sales Rank by Category',
+        labels={value_label: 'Average Sales Rank (€)'},
+        text=value_label,
+        color=value_label,
+        color_continuous_scale=px.colors.sequential.Plasma
+    )
+    fig.update_traces(texttemplate='€%{text:,.2f}')
+    fig.update_layout(
+        xaxis_title='Main Category',
+        yaxis_title='Average Sales Rank (€)',
+        xaxis_tickangle=-45,
+        width=800,
+        height=600
+    )
+    return fig
+
+
+@cached_figure
+def precomputed_box(stats, title, x_label, y_label, width=None, height=None):
+    """Box plot from a ``describe()``-style frame indexed by group.
+
+    Uses the ``25%``, ``50%`` and ``75%`` columns for the box, ``lowerfence``
+    / ``upperfence`` (or ``min`` / ``max``) for the whiskers and draws the
+    optional ``outliers`` column as points.
+    """
+    groups = list(stats.index)
+    lower = stats['lowerfence'] if 'lowerfence' in stats else stats['min']
+    upper = stats['upperfence'] if 'upperfence' in stats else stats['max']
+    fig = go.Figure(go.Box(
+        x=groups,
+        q1=stats['25%'],
+        median=stats['50%'],
+        q3=stats['75%'],
+        lowerfence=lower.fillna(stats['25%']),
+        upperfence=upper.fillna(stats['75%']),
+        mean=stats['mean'],
+        boxpoints=False,
+        name=y_label,
+    ))
+    if 'outliers' in stats:
+        points = pd.Series(stats['outliers'].to_numpy(), index=groups).explode().dropna()
+        fig.add_trace(go.Scatter(
+            x=list(points.index),
+            y=points.astype(float).to_numpy(),
+            mode='markers',
+            marker={'size': 4},
+            name='Outliers',
+        ))
+    fig.update_layout(title=title, xaxis_title=x_label, yaxis_title=y_label, showlegend=False,
+                      width=width, height=height)
+    return fig
@@ -0,0 +1,191 @@
+"""Loading of the Keepa exports and the combined pricing file.
+
+Every marketplace has its own Keepa export (``fragance_it_keepa.csv``,
+``fragance_es_keepa.csv``, ...); ``read_keepa_exports`` combines them into
+one frame keyed by the ``Locale`` column. Both kinds of CSV are converted
+once into typed Parquet files (see ``ingest``) and the dashboard reads the
+columnar copies. The dashboard never calls these readers directly: it goes
+through cached wrappers keyed by ``file_fingerprint``, so a file is only
+read again when it changes on disk.
+"""
+import glob
+import hashlib
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from anomalies import signal_columns
+from brand_metrics import METRIC_PATTERNS
+from ingest import ingest, is_current, parse_failures, read_typed, typed_path
+from keepa_schema import columns_of_kind
+from profiling import profiled
+
+KEEPA_PATH = "fragance_it_keepa.csv"
+# Keepa exports of every marketplace, one file per locale
+KEEPA_PATTERN = os.environ.get('KEEPA_EXPORTS', "*_keepa.csv")
+PRICING_PATH = "combined_pricing_v1.csv"
+
+# Keepa columns summarised as numeric metrics
+NUMERIC_COLUMNS = [
+    'Sales Rank: 90 days avg.', 'Sales Rank: 30 days avg.',
+    'Buy Box : Current', 'Buy Box : 90 days avg.',
+    'Buy Box : 1 day drop %', 'Buy Box : 7 days drop %',
+    'Buy Box : 30 days drop %', 'Buy Box : 90 days drop %',
+    'Referral Fee %', 'Item: Dimension (cm³)', 'Item: Weight (g)'
+]
+
+# Buy Box competition columns aggregated per brand
+COMPETITION_COLUMNS = [
+    'Buy Box: Winner Count 30 days', 'Buy Box: Winner Count 90 days',
+    'Buy Box: Winner Count 180 days', 'Buy Box: Winner Count 365 days',
+    'Count of retrieved live offers: New, FBA', 'Count of retrieved live offers: New, FBM'
+]
+
+# Keepa columns each dashboard section reads
+SECTION_COLUMNS = {
+    'brands': ['Locale', 'ASIN', 'Brand'] + NUMERIC_COLUMNS + COMPETITION_COLUMNS,
+    'summary': ['Locale', 'Brand'] + NUMERIC_COLUMNS,
+    'categories': ['Locale', 'Brand', 'Categories: Root', 'Categories: Sub', 'Sales Rank: 90 days avg.'],
+    'category_tree': ['Locale', 'ASIN', 'Brand', 'Categories: Tree', 'Buy Box : Current', 'Sales Rank: 90 days avg.',
+                      'Buy Box : 1 day drop %', 'Buy Box : 7 days drop %', 'Buy Box : 30 days drop %',
+                      'Buy Box : 90 days drop %'],
+    'products': ['Locale', 'ASIN', 'Brand', 'Product Codes: EAN', 'Buy Box : Current'],
+    'filters': ['Locale', 'Brand', 'Categories: Root', 'Categories: Sub', 'Buy Box : Current',
+                'Buy Box: Is FBA', 'Is HazMat'],
+    'margins': ['Locale', 'ASIN', 'Brand', 'Buy Box : Current', 'Referral Fee %',
+                'Referral Fee based on current Buy Box price', 'FBA Pick&Pack Fee'],
+    # Loaded on their own with every signal window, see ``anomaly_column``
+    'anomalies': ['Locale', 'ASIN', 'Brand', 'Categories: Sub', 'Buy Box : Drop % since last visit',
+                  'Amazon: Drop % since last visit', 'New: Drop % since last visit', 'Buy Box : Is Lowest',
+                  'Amazon: Is Lowest', 'New: Is Lowest'],
+}
+
+
+def section_columns(sections=SECTION_COLUMNS):
+    """Union of the columns of ``sections``, in first-seen order."""
+    return list(dict.fromkeys(name for section in sections for name in SECTION_COLUMNS[section]))
+
+
+# Keepa columns of the shared dashboard frame; everything else stays on disk
+DASHBOARD_COLUMNS = section_columns([section for section in SECTION_COLUMNS if section != 'anomalies'])
+
+# Windowed families aggregated per brand, tree node and drop window
+WINDOW_PATTERNS = [re.compile(pattern) for pattern in METRIC_PATTERNS]
+
+
+def dashboard_column(name, named=frozenset(DASHBOARD_COLUMNS)):
+    """Whether the dashboard frame holds column ``name``: the section
+    columns plus every window of the families in ``WINDOW_PATTERNS``, so
+    windows an export adds are loaded without listing them."""
+    return name in named or any(pattern.search(name) for pattern in WINDOW_PATTERNS)
+
+
+def anomaly_column(name, named=frozenset(SECTION_COLUMNS['anomalies'])):
+    """Whether the anomaly scan reads column ``name``: its section columns
+    plus every drop, lowest-price and stock-out window (see ``anomalies``)."""
+    return name in named or bool(signal_columns([name]))
+
+
+def file_fingerprint(path, hash_content=False):
+    """Identify one version of a file: (absolute path, size, mtime).
+
+    With ``hash_content`` the digest of the file contents is added, for
+    setups where files are copied around with their mtime preserved.
+    """
+    stat = os.stat(path)
+    fingerprint = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    if hash_content:
+        digest = hashlib.blake2b(digest_size=16)
+        with open(path, 'rb') as handle:
+            for block in iter(lambda: handle.read(1 << 20), b''):
+                digest.update(block)
+        fingerprint += (digest.hexdigest(),)
+    return fingerprint
+
+
+def to_percent_points(df):
+    """The typed files store percentages as fractions; the dashboard
+    reports them in percent points (3% -> 3.0)."""
+    percent = columns_of_kind(df.columns, 'percent')
+    df[percent] = df[percent] * 100
+    return df
+
+
+def read_keepa(path=KEEPA_PATH, columns=dashboard_column, compact=True):
+    return to_percent_points(read_typed(path, 'keepa', columns, compact))
+
+
+def keepa_paths(pattern=KEEPA_PATTERN):
+    """The Keepa exports matching ``pattern``, or ``KEEPA_PATH`` if none do."""
+    return sorted(glob.glob(pattern)) or [KEEPA_PATH]
+
+
+def _ingest(path):
+    try:
+        ingest(path)
+    except OSError:
+        pass  # read-only data directory: read_typed converts in memory instead
+
+
+@profiled()
+def read_keepa_exports(paths, columns=dashboard_column, jobs=None):
+    """Combined frame of several Keepa exports, keyed by ``Locale``.
+
+    Exports without a current typed copy are ingested in parallel, one
+    worker process per export; the typed copies are then read with the
+    column projection, so only the projected columns cross a process
+    boundary.
+    """
+    stale = [path for path in paths if not is_current(path)]
+    if len(stale) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            list(pool.map(_ingest, stale))
+    frames = [read_keepa(path, columns) for path in paths]
+    return frames[0] if len(frames) == 1 else concat_frames(frames)
+
+
+def concat_frames(frames):
+    """``pd.concat`` that keeps categorical columns categorical.
+
+    Plain ``concat`` falls back to object columns when the categories of
+    the frames differ, so they are first set to their union.
+    """
+    frames = list(frames)
+    for name in frames[0].columns:
+        if all(isinstance(frame[name].dtype, pd.CategoricalDtype) for frame in frames):
+            categories = frames[0][name].cat.categories
+            for frame in frames[1:]:
+                categories = categories.union(frame[name].cat.categories)
+            frames = [frame.assign(**{name: frame[name].cat.set_categories(categories)}) for frame in frames]
+    return pd.concat(frames, ignore_index=True)
+
+
+@profiled()
+def read_pricing(path=PRICING_PATH, columns=None, compact=True):
+    return read_typed(path, 'pricing', columns, compact)
+
+
+def read_parse_failures(path=KEEPA_PATH):
+    """Per-column count of cells that failed to parse during ingest."""
+    return parse_failures(typed_path(path))
+
+
+def memory_report(frame):
+    """Memory per column of ``frame`` next to what it would take without the
+    compact types: object labels (one shared string per distinct value) and
+    float64 numbers."""
+    used = frame.memory_usage(index=False, deep=True)
+    plain = used.copy()
+    for name in frame.columns:
+        dtype = frame[name].dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            plain[name] = 8 * len(frame) + sum(sys.getsizeof(str(value)) for value in dtype.categories)
+        elif dtype == 'float32':
+            plain[name] = 8 * len(frame)
+    report = pd.DataFrame({'dtype': frame.dtypes.astype(str), 'bytes': used, 'plain bytes': plain})
+    report.loc['Total'] = ['', used.sum(), plain.sum()]
+    report['saved'] = 1 - report['bytes'] / report['plain bytes']
+    return report
@@ -0,0 +1,115 @@
+"""Background reloading of the data files.
+
+``DataWatcher`` watches the directories of the Keepa exports and the
+combined pricing file with ``watchdog``. When a matching file is created,
+changed or moved in, a worker thread reads the new version of the sources
+and runs ``warm`` on it (in the dashboard: parsing, indexing and the
+default aggregates into the shared caches). Only then is ``current``
+replaced, in one assignment, so readers keep the previous version until the
+new one is complete and never wait on a reload.
+"""
+import fnmatch
+import os
+import threading
+import time
+
+from watchdog.events import FileSystemEventHandler
+from watchdog.observers import Observer
+
+# Files are usually written in several steps; wait for the events to settle
+SETTLE_SECONDS = 2.0
+
+
+# Events that can change a file; reading the files must not trigger a reload
+CHANGE_EVENTS = {'created', 'modified', 'moved', 'deleted', 'closed'}
+
+
+class _Handler(FileSystemEventHandler):
+
+    def __init__(self, watcher):
+        self.watcher = watcher
+
+    def on_any_event(self, event):
+        if event.is_directory or event.event_type not in CHANGE_EVENTS:
+            return
+        for path in (event.src_path, getattr(event, 'dest_path', '')):
+            if path and self.watcher.matches(path):
+                self.watcher.schedule()
+                return
+
+
+class DataWatcher:
+    """Keeps ``current`` at the latest fully loaded version of the sources.
+
+    ``sources()`` returns the key of the files on disk (paths and
+    fingerprints) and ``warm(key)`` loads everything for that key. A reload
+    that fails (e.g. a file still being copied) keeps the previous version
+    and records the exception in ``error``; the next change retries.
+    """
+
+    def __init__(self, patterns, sources, warm, settle=SETTLE_SECONDS):
+        self.patterns = [os.path.abspath(pattern) for pattern in patterns]
+        self.sources = sources
+        self.warm = warm
+        self.settle = settle
+        self.current = sources()
+        self.loaded_at = time.time()
+        self.error = None
+        self.observer = None
+        self._changed = threading.Event()
+        self._lock = threading.Lock()
+        self.reloading = False
+
+    def matches(self, path):
+        path = os.path.abspath(path)
+        return any(fnmatch.fnmatch(path, pattern) for pattern in self.patterns)
+
+    def start(self):
+        self.observer = Observer()
+        handler = _Handler(self)
+        for directory in sorted({os.path.dirname(pattern) for pattern in self.patterns}):
+            if os.path.isdir(directory):
+                self.observer.schedule(handler, directory, recursive=False)
+        self.observer.daemon = True
+        self.observer.start()
+        return self
+
+    def stop(self):
+        if self.observer is not None:
+            self.observer.stop()
+            self.observer.join()
+
+    def schedule(self):
+        """Reload on the worker thread; events during a reload start another."""
+        with self._lock:
+            self._changed.set()
+            if not self.reloading:
+                self.reloading = True
+                threading.Thread(target=self._run, name='data-watcher', daemon=True).start()
+
+    def _run(self):
+        while True:
+            # Wait until no event has arrived for ``settle`` seconds
+            while self._changed.is_set():
+                self._changed.clear()
+                time.sleep(self.settle)
+            self.reload()
+            with self._lock:
+                if not self._changed.is_set():
+                    self.reloading = False
+                    return
+
+    def reload(self):
+        """Load the sources on disk and publish them; True if they changed."""
+        try:
+            key = self.sources()
+            if key == self.current:
+                return False
+            self.warm(key)
+        except Exception as exc:
+            self.error = exc
+            return False
+        self.error = None
+        self.loaded_at = time.time()
+        self.current = key
+        return True
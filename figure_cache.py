@@ -0,0 +1,122 @@
+"""Content-addressed cache of built Plotly figures.
+
+``cached_figure`` wraps a chart builder of ``charts``: the figure is keyed
+by a hash of the builder's name and the contents of its arguments (the
+aggregate frames and the chart parameters), so an unchanged aggregate is
+served without building the figure again, in every session. Entries are
+evicted least recently used once their estimated size passes the cap.
+
+Cached figures are shared; callers must not modify them.
+"""
+import functools
+import hashlib
+import os
+import pickle
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from profiling import span
+
+FIGURE_CACHE_BYTES = int(os.environ.get('FIGURE_CACHE_BYTES', 64 * 1024 * 1024))
+
+
+def content_hash(*values):
+    """Digest of the contents of pandas objects, arrays and plain values."""
+    digest = hashlib.blake2b(digest_size=16)
+    for value in values:
+        if isinstance(value, (pd.Series, pd.DataFrame)):
+            names = list(value.columns) if isinstance(value, pd.DataFrame) else [value.name]
+            dtypes = value.dtypes.tolist() if isinstance(value, pd.DataFrame) else [value.dtype]
+            digest.update(repr((type(value).__name__, value.shape, names, list(value.index.names),
+                                [str(dtype) for dtype in dtypes])).encode())
+            try:
+                digest.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+            except TypeError:
+                # Unhashable cells, e.g. the outlier lists of box statistics
+                digest.update(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        elif isinstance(value, np.ndarray):
+            digest.update(repr((value.dtype, value.shape)).encode())
+            digest.update(np.ascontiguousarray(value).tobytes())
+        else:
+            digest.update(repr(value).encode())
+    return digest.hexdigest()
+
+
+def _value_bytes(value):
+    if isinstance(value, np.ndarray):
+        return value.nbytes if value.dtype != object else 16 * value.size
+    if isinstance(value, (list, tuple)):
+        return 16 * len(value)
+    if isinstance(value, dict):
+        return sum(_value_bytes(item) for item in value.values())
+    return 16
+
+
+def figure_bytes(fig):
+    """Estimated size of ``fig``: the nbytes of its data arrays, 16 bytes per
+    element of other sequences and per scalar property. Walks the property
+    dicts of ``to_plotly_json``, which copies the arrays (a few ms for a
+    million points) but does not serialize them as ``to_json`` would."""
+    figure = fig.to_plotly_json()
+    return sum(_value_bytes(trace) for trace in figure['data']) + _value_bytes(figure['layout'])
+
+
+class FigureCache:
+    """LRU cache of figures, capped by their estimated size (``figure_bytes``)."""
+
+    def __init__(self, max_bytes=FIGURE_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, fig):
+        size = figure_bytes(fig)
+        if size > self.max_bytes:
+            return
+        with self.lock:
+            if key in self.entries:
+                self.bytes -= self.entries.pop(key)[1]
+            self.entries[key] = (fig, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, (_, evicted) = self.entries.popitem(last=False)
+                self.bytes -= evicted
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.bytes = 0
+
+
+# One cache per process, shared by all sessions
+FIGURES = FigureCache()
+
+
+def cached_figure(builder):
+    """Serve ``builder``'s figures from ``FIGURES``."""
+    @functools.wraps(builder)
+    def wrapper(*args, **kwargs):
+        key = content_hash(builder.__module__, builder.__qualname__, *args,
+                           *[item for pair in sorted(kwargs.items()) for item in pair])
+        fig = FIGURES.get(key)
+        if fig is None:
+            with span(builder.__name__, 'chart'):
+                fig = builder(*args, **kwargs)
+            FIGURES.put(key, fig)
+        return fig
+    return wrapper
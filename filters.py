@@ -0,0 +1,98 @@
+"""Row filters of the Keepa sections, backed by precomputed indexes.
+
+``FilterIndex`` is built once per data version. For every label column it
+keeps the row positions of each value (rows sorted by category code plus
+offsets), for every flag column a mask per value, and for every range
+column the row order sorted by value. Applying a filter combines those
+into one boolean mask without scanning a string column.
+
+A selection is a tuple of ``(column, condition)`` pairs, so it can be part
+of a cache key: a tuple of values for label columns, a ``(low, high)``
+pair for range columns and ``True``/``False`` for flag columns.
+"""
+import numpy as np
+import pandas as pd
+
+from profiling import profiled
+
+LABEL_COLUMNS = ['Locale', 'Brand', 'Categories: Root', 'Categories: Sub']
+FLAG_COLUMNS = ['Buy Box: Is FBA', 'Is HazMat']
+RANGE_COLUMNS = ['Buy Box : Current']
+
+
+class FilterIndex:
+    """Precomputed membership of the rows of ``frame`` per filter value."""
+
+    @profiled()
+    def __init__(self, frame):
+        self.rows = len(frame)
+        self.labels = {}
+        self.present = {}
+        for column in LABEL_COLUMNS:
+            if column not in frame:
+                continue
+            values = frame[column]
+            if not isinstance(values.dtype, pd.CategoricalDtype):
+                values = values.astype('category')
+            codes = values.cat.codes.to_numpy()
+            order = np.argsort(codes, kind='stable')
+            offsets = np.searchsorted(codes[order], np.arange(-1, len(values.cat.categories) + 1))
+            # The offsets start with the missing values (code -1)
+            self.labels[column] = (pd.Index(values.cat.categories), order, offsets)
+            self.present[column] = codes >= 0
+        self.flags = {
+            column: {flag: (frame[column] == flag).fillna(False).to_numpy(dtype=bool) for flag in (True, False)}
+            for column in FLAG_COLUMNS if column in frame
+        }
+        self.ranges = {}
+        for column in RANGE_COLUMNS:
+            if column not in frame:
+                continue
+            values = frame[column].to_numpy(dtype='float64', na_value=np.nan)
+            order = np.argsort(values, kind='stable')
+            # NaN sorts last; it never falls inside a range
+            self.ranges[column] = (values[order][:np.count_nonzero(~np.isnan(values))], order)
+
+    def values(self, column):
+        """Filter values of a label column."""
+        return self.labels[column][0]
+
+    def bounds(self, column):
+        """Smallest and largest value of a range column; None when the column
+        is missing or has no values."""
+        if column not in self.ranges or not len(self.ranges[column][0]):
+            return None
+        values = self.ranges[column][0]
+        return float(values[0]), float(values[-1])
+
+    def _positions_mask(self, positions):
+        mask = np.zeros(self.rows, dtype=bool)
+        mask[positions] = True
+        return mask
+
+    def condition_mask(self, column, condition):
+        if column in self.labels:
+            categories, order, offsets = self.labels[column]
+            codes = categories.get_indexer(list(condition))
+            codes = codes[codes >= 0] + 1
+            return self._positions_mask(np.concatenate(
+                [order[offsets[code]:offsets[code + 1]] for code in codes] or [np.array([], dtype=np.int64)]))
+        if column in self.flags:
+            return self.flags[column][bool(condition)]
+        if column in self.ranges:
+            values, order = self.ranges[column]
+            low, high = condition
+            return self._positions_mask(order[np.searchsorted(values, low, 'left'):np.searchsorted(values, high, 'right')])
+        raise KeyError(column)
+
+    @profiled()
+    def mask(self, selection, required=('Brand',)):
+        """Mask of the rows meeting every condition of ``selection`` and
+        having a value in each ``required`` label column."""
+        mask = np.ones(self.rows, dtype=bool)
+        for column in required:
+            if column in self.present:
+                mask &= self.present[column]
+        for column, condition in selection:
+            mask &= self.condition_mask(column, condition)
+        return mask
@@ -0,0 +1,145 @@
+"""Exact product identifiers and the ASIN/EAN index joining the datasets.
+
+Keepa lists several EANs per product (``3145891073706, 0751125331875``);
+some exports carry them in lossy scientific notation (``3.61427E+12``),
+which cannot be turned back into a code. ``parse_eans`` keeps only exact
+GTINs with a valid check digit and counts the lossy cells.
+
+``ProductIndex`` maps ASINs and EANs to product ids through hash indexes;
+``cross_source_prices`` uses it to put the Keepa Buy Box price of each
+product next to its prices and ratings in the combined pricing data.
+"""
+import numpy as np
+import pandas as pd
+
+from profiling import profiled
+
+ASIN_COLUMN = 'ASIN'
+EAN_COLUMN = 'Product Codes: EAN'
+PRICE_COLUMN = 'Buy Box : Current'
+# Identifier columns of the combined pricing data
+IDENTIFIER_COLUMNS = ['asin', 'ean']
+
+ASIN_PATTERN = r'[0-9A-Z]{10}'
+# EAN-8, UPC-A, EAN-13 and GTIN-14
+GTIN_PATTERN = r'\d{8}|\d{12,14}'
+LOSSY_PATTERN = r'\d(\.\d+)?[eE][+]?\d+'
+
+
+def parse_asins(values):
+    """ASINs upper-cased and stripped; anything else becomes NA."""
+    asins = values.astype('string').str.strip().str.upper()
+    return asins.where(asins.str.fullmatch(ASIN_PATTERN).fillna(False))
+
+
+def valid_check_digit(codes):
+    """Boolean array: GTIN check digit of each digit string is correct."""
+    padded = codes.str.zfill(14).to_numpy(dtype=str)
+    if not len(padded):
+        return np.zeros(0, dtype=bool)
+    digits = (np.frombuffer(''.join(padded).encode('ascii'), dtype=np.uint8) - ord('0')).reshape(-1, 14)
+    weights = np.tile([3, 1], 7)[:13]
+    return (10 - (digits[:, :13] * weights).sum(axis=1) % 10) % 10 == digits[:, 13]
+
+
+def parse_eans(values):
+    """Exact EANs per row and the number of lossy cells.
+
+    Returns a Series of codes zero-padded to 13 digits (GTIN-14 is kept as
+    is) indexed by the row position in ``values``, one entry per code, and
+    the count of cells in scientific notation.
+    """
+    cells = pd.Series(values.to_numpy(), dtype='string')
+    lossy = int(cells.str.strip().str.fullmatch(LOSSY_PATTERN).fillna(False).sum())
+    codes = cells.str.split(',').explode().astype('string').str.strip()
+    codes = codes[codes.str.fullmatch(GTIN_PATTERN).fillna(False)]
+    codes = codes[valid_check_digit(codes)]
+    codes = codes.str.zfill(13)
+    return codes.rename('EAN'), lossy
+
+
+class ProductIndex:
+    """Hash indexes from ASIN and EAN to product ids of the Keepa data.
+
+    ``row_products`` holds the product id of every Keepa row (-1 without a
+    valid ASIN); the same ASIN in several marketplaces is one product.
+    """
+
+    @profiled()
+    def __init__(self, keepa):
+        self.row_products, self.asins = pd.factorize(parse_asins(keepa[ASIN_COLUMN]))
+        self.asins = pd.Index(self.asins, name=ASIN_COLUMN)
+        self.lossy_eans = 0
+        eans = pd.Series(dtype='string', name='EAN')
+        if EAN_COLUMN in keepa:
+            eans, self.lossy_eans = parse_eans(keepa[EAN_COLUMN])
+        products = self.row_products[eans.index.to_numpy(dtype=np.int64)]
+        pairs = pd.DataFrame({'EAN': eans.to_numpy(), 'product': products})
+        # An EAN listed under several ASINs resolves to the first of them
+        pairs = pairs[pairs['product'] >= 0].drop_duplicates('EAN')
+        self.eans = pd.Index(pairs['EAN'].to_numpy(dtype=object), name='EAN')
+        self.ean_products = pairs['product'].to_numpy()
+
+    def __len__(self):
+        return len(self.asins)
+
+    def lookup_asins(self, asins):
+        return self.asins.get_indexer(parse_asins(pd.Series(asins)).fillna(''))
+
+    def lookup_eans(self, eans):
+        positions = self.eans.get_indexer(pd.Series(eans, dtype='string').str.strip()
+                                          .str.zfill(13).fillna('').to_numpy(dtype=object))
+        return np.where(positions >= 0, self.ean_products[positions], -1)
+
+    def lookup(self, identifiers):
+        """Product ids of ASINs or EANs, -1 where neither is known."""
+        products = self.lookup_asins(identifiers)
+        missing = products < 0
+        if missing.any():
+            products[missing] = self.lookup_eans(np.asarray(identifiers, dtype=object)[missing])
+        return products
+
+
+@profiled()
+def cross_source_prices(index, keepa, pricing_chunks):
+    """Keepa Buy Box price per marketplace next to the price and rating per
+    source of the combined pricing data, one row per product matched in
+    both.
+
+    ``pricing_chunks`` is an iterable of typed pricing frames (the whole
+    frame, or the chunks of ``pricing_stream.pricing_chunks``); rows are
+    matched on ``asin``, or on ``ean`` where there is no ASIN match, with
+    whichever of the two columns the file has. Without either, nothing
+    matches.
+    """
+    keepa_prices = (keepa[PRICE_COLUMN].astype('float64')
+                    .groupby([index.row_products, keepa['Locale'].astype(str)]).mean()
+                    .drop(index=-1, level=0, errors='ignore').unstack())
+    keepa_prices.columns = [f'Keepa {locale}' for locale in keepa_prices.columns]
+
+    partials = []
+    for chunk in pricing_chunks:
+        if not any(name in chunk for name in IDENTIFIER_COLUMNS):
+            continue
+        products = index.lookup_asins(chunk['asin']) if 'asin' in chunk else np.full(len(chunk), -1)
+        if 'ean' in chunk:
+            missing = products < 0
+            products[missing] = index.lookup_eans(chunk['ean'].to_numpy(dtype=object)[missing])
+        matched = chunk[products >= 0]
+        grouped = matched[['price', 'rating']].astype('float64').groupby(
+            [products[products >= 0], matched['source'].astype(str).to_numpy()])
+        partials.append(grouped.sum().join(grouped.count(), rsuffix=' count'))
+    if not partials:
+        return pd.DataFrame()
+    totals = pd.concat(partials).groupby(level=[0, 1]).sum()
+    sources = pd.DataFrame({
+        'price': totals['price'] / totals['price count'],
+        'rating': totals['rating'] / totals['rating count'],
+    }).unstack()
+    sources.columns = [f'{value} {source}' for value, source in sources.columns]
+
+    table = keepa_prices.join(sources, how='inner')
+    brands = keepa['Brand'].astype(object).groupby(index.row_products).first()
+    table.insert(0, 'Brand', brands.reindex(table.index).to_numpy())
+    table.index = index.asins[table.index]
+    return table
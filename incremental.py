@@ -0,0 +1,157 @@
+"""Incremental refresh of the Keepa aggregates between snapshots.
+
+A fresh Keepa export usually differs from the previous one in a small share
+of ASINs. ``KeepaAggregates`` keeps the brand and category partials and the
+summary sketches of the latest snapshot; ``refresh`` compares a new
+snapshot with it by per-row hash and only feeds the added, removed and
+changed rows into the aggregates, so the update cost follows the number of
+changes rather than the catalogue size. Only the columns the aggregates
+read are hashed and kept.
+"""
+import threading
+
+import pandas as pd
+
+from brand_metrics import ALL_LOCALES, BRAND_COLUMN, LOCALE_COLUMN, brand_partials, metric_columns
+from brand_metrics import metrics_from_partials as brand_from_partials
+from category_metrics import RANK_COLUMN, ROOT_COLUMN, SUB_COLUMN, category_partials
+from category_metrics import metrics_from_partials as category_from_partials
+from profiling import profiled
+from summary_stats import SummarySketch
+
+ASIN_COLUMN = 'ASIN'
+
+# The same ASIN is listed once per marketplace
+KEY_COLUMNS = [LOCALE_COLUMN, ASIN_COLUMN]
+
+
+def row_hashes(frame):
+    """One 64-bit hash per row of ``frame`` over all its columns."""
+    return pd.util.hash_pandas_object(frame, index=False)
+
+
+def diff_snapshots(previous, current):
+    """Keys added, removed and changed between two ``row_hashes`` Series."""
+    added = current.index.difference(previous.index)
+    removed = previous.index.difference(current.index)
+    common = current.index.intersection(previous.index)
+    changed = common[current.reindex(common).to_numpy() != previous.reindex(common).to_numpy()]
+    return added, removed, changed
+
+
+def _add(partials, delta, sign):
+    if partials is None:
+        return delta
+    combined = partials.add(delta, fill_value=0) if sign > 0 else partials.sub(delta, fill_value=0)
+    products = combined['Products']
+    if isinstance(products, pd.DataFrame):
+        products = products['sum']
+    return combined[products.round() > 0]
+
+
+class KeepaAggregates:
+    """Brand, category and summary aggregates of the latest Keepa snapshot.
+
+    Rows are keyed by (``Locale``, ``ASIN``); rows without a brand are left
+    out, as in the Keepa sections of the dashboard. The summary follows
+    ``SummarySketch``: quartiles carry the sketch's relative error
+    ``alpha``, and so do min and max once rows have changed or gone.
+    """
+
+    def __init__(self, summary_columns, alpha=0.01):
+        self.summary_columns = summary_columns
+        self.alpha = alpha
+        self.version = None
+        # Latest snapshot, restricted to the aggregated columns
+        self.rows = None
+        self.hashes = pd.Series(dtype='uint64', index=pd.Index([], dtype='uint64'))
+        self.brands = None
+        self.categories = {ROOT_COLUMN: None, SUB_COLUMN: None}
+        self.summaries = {}
+        # Versions applied before the current one
+        self.retired = set()
+        self.lock = threading.Lock()
+
+    @profiled()
+    def refresh(self, frame, version=None):
+        """Bring the aggregates to the snapshot ``frame``.
+
+        Returns the number of (added, removed, changed) rows; a refresh with
+        the ``version`` already applied does nothing.
+        """
+        with self.lock:
+            return self._refresh(frame, version)
+
+    def read(self, frame, version, read):
+        """``read(self)`` with the aggregates brought to ``frame``, in one
+        locked section so that no other refresh runs in between.
+
+        Returns None for a ``version`` the aggregates have already moved
+        past: the caller computes that snapshot in full rather than undo
+        the newer one.
+        """
+        with self.lock:
+            if version != self.version and version in self.retired:
+                return None
+            self._refresh(frame, version)
+            return read(self)
+
+    def _refresh(self, frame, version):
+        if version is not None and version == self.version:
+            return 0, 0, 0
+        frame = frame.loc[frame[BRAND_COLUMN].notna().to_numpy(), self.columns(frame.columns)]
+        # Keyed by a hash of (Locale, ASIN), cheaper to index and diff than the
+        # strings themselves
+        frame.index = pd.Index(row_hashes(frame[KEY_COLUMNS]).to_numpy())
+        frame = frame[~frame.index.duplicated(keep='last')]
+        hashes = row_hashes(frame)
+        added, removed, changed = diff_snapshots(self.hashes, hashes)
+        if self.rows is not None:
+            self._apply(self.rows.loc[removed.append(changed)], -1)
+        self._apply(frame.loc[added.append(changed)], 1)
+        if self.version is not None:
+            self.retired.add(self.version)
+        self.rows, self.hashes, self.version = frame, hashes, version
+        return len(added), len(removed), len(changed)
+
+    def columns(self, available):
+        """The ``available`` columns the partials and the summary read."""
+        wanted = (KEY_COLUMNS + [BRAND_COLUMN, ROOT_COLUMN, SUB_COLUMN, RANK_COLUMN]
+                  + metric_columns(available) + list(self.summary_columns))
+        return [name for name in dict.fromkeys(wanted) if name in available]
+
+    def _apply(self, rows, sign):
+        if rows.empty:
+            return
+        rows = rows.reset_index(drop=True)
+        self.brands = _add(self.brands, brand_partials(rows, [LOCALE_COLUMN, BRAND_COLUMN]), sign)
+        for column in self.categories:
+            self.categories[column] = _add(self.categories[column],
+                                           category_partials(rows, column, LOCALE_COLUMN), sign)
+        for locale, part in rows.groupby(LOCALE_COLUMN, observed=True):
+            delta = SummarySketch(self.alpha).update(part, self.summary_columns)
+            summary = self.summaries.setdefault(locale, SummarySketch(self.alpha))
+            if sign > 0:
+                summary.merge(delta)
+            else:
+                summary.subtract(delta)
+
+    def brand_metrics(self, total=ALL_LOCALES):
+        """``brand_metrics.brand_metrics`` by locale and brand."""
+        return brand_from_partials(self.brands, total)
+
+    def category_metrics(self, column=ROOT_COLUMN, total=ALL_LOCALES):
+        """``category_metrics.category_metrics`` by locale and category."""
+        return category_from_partials(self.categories[column], total)
+
+    def summary(self, locale=ALL_LOCALES):
+        """Approximate statistical summary of one locale or of all."""
+        if locale == ALL_LOCALES:
+            sketch = SummarySketch(self.alpha)
+            for summary in self.summaries.values():
+                sketch.merge(summary)
+        else:
+            # A locale without branded rows has an empty summary
+            sketch = self.summaries.get(locale, SummarySketch(self.alpha))
+        columns = [name for name in self.summary_columns if name in self.rows.columns]
+        return sketch.summary().reindex(columns)
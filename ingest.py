@@ -0,0 +1,137 @@
+"""Convert raw Keepa / combined pricing CSVs into typed Parquet files.
+
+Each CSV is parsed once against the declared schema in ``keepa_schema`` and
+written next to it as ``<name>.parquet``. The fingerprint of the source CSV
+is stored in the Parquet metadata together with ``SCHEMA_VERSION``, so a
+copy that is stale, or was typed by older rules, is detected and rebuilt.
+
+Usage:
+    python ingest.py fragance_it_keepa.csv
+    python ingest.py --pricing combined_pricing_v1.csv
+"""
+import argparse
+import json
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from keepa_schema import (CATEGORICAL_COLUMNS, KEEPA_RULES, PRICING_RULES, SCHEMA_VERSION, apply_schema,
+                          arrow_schema, compact_table)
+from profiling import profiled
+
+RULES = {'keepa': KEEPA_RULES, 'pricing': PRICING_RULES}
+
+FINGERPRINT_KEY = b'source_fingerprint'
+SCHEMA_VERSION_KEY = b'schema_version'
+FAILURES_KEY = b'parse_failures'
+
+
+def typed_path(csv_path):
+    return os.path.splitext(csv_path)[0] + '.parquet'
+
+
+def source_fingerprint(csv_path):
+    stat = os.stat(csv_path)
+    return json.dumps([os.path.basename(csv_path), stat.st_size, stat.st_mtime_ns])
+
+
+@profiled()
+def convert(csv_path, kind='keepa', decimal='.'):
+    """Parse a raw CSV into a typed Arrow table.
+
+    The per-column count of cells that failed to parse is kept in the
+    table metadata, see ``parse_failures``.
+    """
+    rules = RULES[kind]
+    raw = pd.read_csv(csv_path, dtype=str)
+    typed, failures = apply_schema(raw, rules, decimal)
+    table = pa.Table.from_pandas(typed, schema=arrow_schema(typed.columns, rules), preserve_index=False)
+    return table.replace_schema_metadata({
+        FINGERPRINT_KEY: source_fingerprint(csv_path),
+        SCHEMA_VERSION_KEY: str(SCHEMA_VERSION),
+        FAILURES_KEY: failures[failures > 0].to_json(),
+    })
+
+
+def parse_failures(parquet_path):
+    """Cells per column that failed to parse when the file was ingested."""
+    if not os.path.exists(parquet_path):
+        return pd.Series(name='failed cells', dtype='int64')
+    metadata = pq.read_schema(parquet_path).metadata or {}
+    return pd.Series(json.loads(metadata.get(FAILURES_KEY, b'{}')), name='failed cells', dtype='int64')
+
+
+def is_current(csv_path, parquet_path=None):
+    parquet_path = parquet_path or typed_path(csv_path)
+    if not os.path.exists(parquet_path):
+        return False
+    metadata = pq.read_schema(parquet_path).metadata or {}
+    return (metadata.get(FINGERPRINT_KEY, b'').decode() == source_fingerprint(csv_path)
+            and metadata.get(SCHEMA_VERSION_KEY, b'').decode() == str(SCHEMA_VERSION))
+
+
+def ingest(csv_path, kind='keepa', parquet_path=None, decimal='.'):
+    """Write the typed Parquet copy of ``csv_path`` and return its path."""
+    parquet_path = parquet_path or typed_path(csv_path)
+    pq.write_table(convert(csv_path, kind, decimal), parquet_path)
+    return parquet_path
+
+
+def _projection(columns, available):
+    """The ``available`` columns selected by a list of names or a predicate."""
+    if callable(columns):
+        return [name for name in available if columns(name)]
+    return [name for name in columns if name in available]
+
+
+@profiled()
+def read_typed(csv_path, kind='keepa', columns=None, compact=False):
+    """Typed frame for ``csv_path``, read from its Parquet copy.
+
+    The copy is (re)built first when it is missing or stale. If it cannot
+    be written (read-only data directory) the converted table is used as is.
+    With ``compact`` the frame uses the memory-lean types of
+    ``keepa_schema.compact_table``. ``columns`` is a list of names or a
+    predicate on a column name.
+    """
+    parquet_path = typed_path(csv_path)
+    if not is_current(csv_path, parquet_path):
+        table = convert(csv_path, kind)
+        try:
+            pq.write_table(table, parquet_path)
+        except OSError:
+            if columns is not None:
+                table = table.select(_projection(columns, table.column_names))
+            return (compact_table(table, RULES[kind]) if compact else table).to_pandas()
+    available = pq.read_schema(parquet_path).names
+    if columns is not None:
+        columns = _projection(columns, available)
+    if not compact:
+        return pd.read_parquet(parquet_path, columns=columns)
+    # Categorical columns are read dictionary encoded, without building one
+    # Python string per row
+    categorical = [name for name in CATEGORICAL_COLUMNS if name in (columns or available)]
+    table = pq.read_table(parquet_path, columns=columns, read_dictionary=categorical)
+    return compact_table(table, RULES[kind]).to_pandas()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert Keepa exports to typed Parquet files.")
+    parser.add_argument('keepa', nargs='*', help="raw Keepa export CSVs")
+    parser.add_argument('--pricing', nargs='*', default=[], help="combined pricing CSVs")
+    parser.add_argument('--decimal', default='.', choices=['.', ','],
+                        help="decimal separator for ambiguous values such as 1.234 (default: .)")
+    args = parser.parse_args(argv)
+
+    for kind, paths in (('keepa', args.keepa), ('pricing', args.pricing)):
+        for path in paths:
+            parquet_path = ingest(path, kind, decimal=args.decimal)
+            print(f"{path} -> {parquet_path}")
+            for column, count in parse_failures(parquet_path).items():
+                print(f"    {column}: {count} cells failed to parse")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,258 @@
+"""Insight text of the dashboard sections, filled in from the aggregate tables.
+
+Every function takes a table the dashboard already caches (brand and
+category metrics, the statistical summary, per-group ``describe`` tables of
+the combined pricing data) and returns the figures of one insight block as
+Markdown. The narratives then follow the data instead of quoting numbers
+typed in by hand; the dashboard memoizes them per data version, so drawing
+a page only looks them up.
+"""
+import numpy as np
+import pandas as pd
+
+from brand_metrics import PRICE_COLUMN, RANK_COLUMN
+
+# Upper bound of each tier of the average price drop, in percent
+DROP_TIERS = {'none': 0.0, 'low': 1.0, 'moderate': 2.5, 'significant': np.inf}
+
+# Names listed per tier; longer tiers end with "and N more"
+MAX_LISTED = 8
+
+
+def euros(value):
+    return f"€{value:,.2f}" if np.isfinite(value) else "n/a"
+
+
+def count(value):
+    return f"{value:,.0f}" if np.isfinite(value) else "n/a"
+
+
+def percent(value):
+    return f"{value:.2f}%" if np.isfinite(value) else "n/a"
+
+
+def listing(values, format=None, limit=MAX_LISTED):
+    """``"A (€1.00), B (€2.00)"`` for a Series indexed by name; names alone
+    without ``format``."""
+    if values.empty:
+        return "none"
+    shown = values.iloc[:limit]
+    items = [str(name) if format is None else f"{name} ({format(value)})" for name, value in shown.items()]
+    if len(values) > limit:
+        items.append(f"and {len(values) - limit:,} more")
+    return ", ".join(items)
+
+
+def split_ranked(values, sizes):
+    """Consecutive slices of ``values`` of the given ``sizes``; the last
+    slice takes the rest."""
+    bounds = np.cumsum((0,) + tuple(sizes))
+    bounds[-1] = max(bounds[-1], len(values))
+    return [values.iloc[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+
+
+def brand_price_tiers(brand_table, n=10, sizes=(3, 4, 3)):
+    """Premium, mid-range and value brands among the ``n`` brands with the
+    highest average Buy Box price, and the price range they span."""
+    prices = brand_table[PRICE_COLUMN].dropna().nlargest(n)
+    premium, mid_range, value = split_ranked(prices, sizes)
+    text = {tier: listing(brands, euros) for tier, brands in
+            (('premium', premium), ('mid-range', mid_range), ('value', value))}
+    text['range'] = (f"{euros(prices.iloc[-1])} ({prices.index[-1]}) to {euros(prices.iloc[0])} ({prices.index[0]})"
+                     if len(prices) else "no prices")
+    return text
+
+
+def sales_rank_tiers(brand_table, n=10, sizes=(3, 3, 4)):
+    """High, mid-range and lower performers among the ``n`` brands with the
+    best (lowest) average 90-day sales rank."""
+    ranks = brand_table[RANK_COLUMN].dropna().nsmallest(n)
+    high, mid_range, lower = split_ranked(ranks, sizes)
+    return {tier: listing(brands, count) for tier, brands in
+            (('high', high), ('mid-range', mid_range), ('lower', lower))}
+
+
+def price_drop_tiers(drops, tiers=DROP_TIERS):
+    """Brands per tier of their average price drop (a Series per brand),
+    largest drops first within a tier."""
+    drops = drops.dropna().sort_values(ascending=False)
+    text, low = {}, -np.inf
+    for tier, high in tiers.items():
+        members = drops[(drops > low) & (drops <= high)]
+        text[tier] = listing(members, None if tier == 'none' else percent)
+        low = high
+    return text
+
+
+def _stat(stats, column, statistic):
+    return stats.at[column, statistic] if column in stats.index else np.nan
+
+
+def summary_insights(stats):
+    """Figures of the Sales Insights of the statistical summary, from its
+    table (one row per column, see ``summary_stats``)."""
+    drop = 'Buy Box : {} drop %'.format
+    short = [_stat(stats, drop(window), 'Median') for window in ('1 day', '7 days', '30 days')]
+    if np.allclose(short, short[0], equal_nan=True):
+        drops = f"Median percentage drops are {percent(short[0])} for 1 day, 7 days, and 30 days"
+    else:
+        drops = (f"Median percentage drops are {percent(short[0])} for 1 day, {percent(short[1])} for 7 days "
+                 f"and {percent(short[2])} for 30 days")
+    current = _stat(stats, PRICE_COLUMN, 'Median')
+    average = _stat(stats, 'Buy Box : 90 days avg.', 'Median')
+    if average > 0:
+        change = current / average - 1
+        trend = "remained stable" if abs(change) < 0.02 else "risen" if change > 0 else "fallen"
+        trend = (f"The median current price is {euros(current)} against a median 90-day average of "
+                 f"{euros(average)}: prices have {trend} over the last 90 days.")
+    else:
+        trend = "No 90-day average price is available."
+    return {
+        'drops': (f"{drops}, and {percent(_stat(stats, drop('90 days'), 'Median'))} for 90 days. "
+                  f"Maximum recorded drop is {percent(_stat(stats, drop('90 days'), 'Max'))}."),
+        'referral': (f"Median referral fee percentage is {percent(_stat(stats, 'Referral Fee %', 'Median'))}, "
+                     f"with a maximum of {percent(_stat(stats, 'Referral Fee %', 'Max'))}."),
+        'prices': (f"Median Buy Box price is {euros(current)}, "
+                   f"ranging up to {euros(_stat(stats, PRICE_COLUMN, 'Max'))}."),
+        'trend': trend,
+        'rank': (f"Median sales rank is {count(_stat(stats, 'Sales Rank: 30 days avg.', 'Median'))} for 30 days "
+                 f"and {count(_stat(stats, RANK_COLUMN, 'Median'))} for 90 days, with a standard deviation of "
+                 f"{count(_stat(stats, RANK_COLUMN, 'Standard Deviation'))}."),
+    }
+
+
+def category_rank_tiers(ranks, sizes=(2, 4)):
+    """High, moderate and low sales volume categories from their average
+    90-day sales rank (a lower rank sells more), and the categories
+    without a sales rank. ``sizes`` are those of the high and moderate
+    tiers; the low tier takes the rest."""
+    ranked = ranks[ranks > 0].sort_values()
+    tiers = dict(zip(('high', 'moderate', 'low'), (listing(tier, count) for tier in split_ranked(ranked, tuple(sizes) + (0,)))))
+    tiers['unranked'] = listing(pd.Series(index=ranks.index.difference(ranked.index), dtype=float))
+    return tiers
+
+
+def _spread(describe):
+    return describe['75%'] - describe['25%']
+
+
+def rating_breakdown(describe):
+    """Markdown per rating from ``describe`` of price by rating: the figures
+    and how the rating compares with the others. Ratings without priced
+    products are left out."""
+    describe = describe[describe['count'] > 0]
+    if describe.empty:
+        return {}
+    overall_median = np.average(describe['50%'], weights=describe['count'])
+    overall_spread = np.average(_spread(describe), weights=describe['count'])
+    largest = describe['count'].idxmax()
+    text = {}
+    for rating, row in describe.iterrows():
+        level = "above" if row['50%'] > overall_median else "below"
+        spread = "wider" if row['75%'] - row['25%'] > overall_spread else "narrower"
+        notes = [f"the median price is {level} the average median of all ratings ({euros(overall_median)})",
+                 f"the interquartile range is {spread} than average"]
+        if rating == largest:
+            notes.insert(0, "the most numerous rating")
+        text[rating] = "\n".join([
+            f"- **Count**: {count(row['count'])} products",
+            f"- **Mean Price**: {euros(row['mean'])}",
+            f"- **Median Price**: {euros(row['50%'])}",
+            f"- **Standard Deviation**: {euros(row['std'])}",
+            f"- **Min Price**: {euros(row['min'])}",
+            f"- **Max Price**: {euros(row['max'])}",
+            f"- **Q1 (25th Percentile)**: {euros(row['25%'])}",
+            f"- **Q3 (75th Percentile)**: {euros(row['75%'])}",
+            "",
+            f"**Interpretation**: For a rating of {rating}, {', '.join(notes)}.",
+        ])
+    return text
+
+
+def _trend(name, values):
+    """How ``name`` moves along the index order of ``values``."""
+    steps = np.diff(values.dropna().to_numpy(dtype=float))
+    if len(steps) and (steps >= 0).all():
+        return f"{name} tends to increase"
+    if len(steps) and (steps <= 0).all():
+        return f"{name} tends to decrease"
+    return f"{name} shows no consistent trend"
+
+
+def rating_summary(describe):
+    """Markdown on how prices move with the rating."""
+    ordered = describe[describe['count'] > 0].sort_index()
+    if ordered.empty:
+        return "No priced products to compare across ratings."
+    ranges = ordered['max'] - ordered['min']
+    return "\n".join([
+        f"- **Average and Median Prices**: From the lowest to the highest rating, the "
+        f"{_trend('mean', ordered['mean'])} and the {_trend('median', ordered['50%'])}.",
+        f"- **Price Range**: The widest range is at rating {ranges.idxmax() if ranges.notna().any() else 'n/a'}, "
+        f"the largest standard deviation at rating "
+        f"{ordered['std'].idxmax() if ordered['std'].notna().any() else 'n/a'}.",
+        f"- **Quartiles**: With the rating, the {_trend('first quartile', ordered['25%'])} and the "
+        f"{_trend('third quartile', ordered['75%'])}.",
+    ])
+
+
+def correlation_insight(value, x, y):
+    """Interpretation of a Pearson correlation between ``x`` and ``y``."""
+    if not np.isfinite(value):
+        return f"Not enough data to correlate {x} and {y}."
+    size = abs(value)
+    strength = ("negligible" if size < 0.1 else "weak" if size < 0.3 else "moderate" if size < 0.5
+                else "strong")
+    sign = "positive" if value > 0 else "negative"
+    tendency = "increase" if value > 0 else "decrease"
+    text = (f"{value:.3f} indicates a {strength} {sign} correlation between {x} and {y}: as {x} increases, "
+            f"{y} tends to {'slightly ' if size < 0.3 else ''}{tendency}.")
+    if size < 0.3:
+        text += (f" Since the value is close to 0, the relationship is weak and might not be practically "
+                 f"significant: {x} does not have a strong impact on {y}.")
+    return text
+
+
+def _compare(values, format, label):
+    """One bullet per source plus which source is highest."""
+    lines = [f"- **{source}**: The {label} is {format(value)}." for source, value in values.items()]
+    if len(values) > 1 and values.max() == values.min():
+        lines.append(f"\nAll sources have the same {label}.")
+    elif len(values) > 1:
+        lines.append(f"\n**{values.idxmax()}** has the highest {label} and **{values.idxmin()}** the lowest "
+                     f"({format(values.max())} against {format(values.min())}).")
+    return "\n".join(lines)
+
+
+def source_price_insights(prices, ratings, reviews):
+    """Markdown comparing the sources from ``describe`` of price, rating and
+    number of reviews by source."""
+    ranges = prices['max'] - prices['min']
+    return "\n\n".join([
+        "#### 1. Average Price:\n" + _compare(prices['mean'], euros, "average price"),
+        "#### 2. Minimum Price:\n" + _compare(prices['min'], euros, "minimum price"),
+        "#### 3. Maximum Price:\n" + _compare(prices['max'], euros, "maximum price"),
+        "#### 4. Average Rating:\n" + _compare(ratings['mean'], "{:.6f}".format, "average rating"),
+        "#### 5. Total Number of Reviews:\n" + _compare(reviews['sum'], count, "total number of reviews"),
+        "### Overall Implications:\n"
+        f"- **Pricing:** {ranges.idxmax()} has the broadest price range ({euros(ranges.max())}).\n"
+        f"- **Customer Satisfaction:** Average ratings range from {ratings['mean'].min():.3f} to "
+        f"{ratings['mean'].max():.3f}.\n"
+        f"- **Review Volume:** {reviews['sum'].idxmax()} has the most reviews, which might reflect higher "
+        f"engagement or a larger market presence.",
+    ])
+
+
+def source_rating_insights(ratings):
+    """Markdown comparing the rating distribution of the sources."""
+    return "\n\n".join([
+        "#### 1. Average Rating:\n" + _compare(ratings['mean'], "{:.6f}".format, "average rating"),
+        "#### 2. Minimum Rating:\n" + _compare(ratings['min'], "{:.1f}".format, "minimum rating"),
+        "#### 3. Maximum Rating:\n" + _compare(ratings['max'], "{:.1f}".format, "maximum rating"),
+        "#### 4. Standard Deviation of Ratings:\n" + _compare(ratings['std'], "{:.6f}".format,
+                                                               "standard deviation of ratings"),
+        "### Overall Implications:\n"
+        f"- **Rating Consistency:** Ratings range from {ratings['min'].min():.1f} to {ratings['max'].max():.1f} "
+        f"across sources, with standard deviations between {ratings['std'].min():.3f} and "
+        f"{ratings['std'].max():.3f}.",
+    ])
@@ -0,0 +1,117 @@
+"""Single-pass parser for Keepa display values.
+
+All numeric-looking columns are concatenated into one Arrow string array
+and parsed with a fixed number of ``pyarrow.compute`` kernels, however many
+columns the export has:
+
+- currency symbols, ``%`` and whitespace are stripped, the sign is kept
+- ``-`` and empty cells are missing values, not failures
+- ``yes``/``no`` become 1/0 in boolean columns
+- ``%`` values become fractions (``-20%`` -> -0.2)
+- thousands and decimal separators are resolved per cell: with both ``.``
+  and ``,`` present the rightmost one is the decimal separator, repeated
+  separators are thousands separators, and the only ambiguous case, one
+  separator followed by exactly three digits (``1.234``), uses ``decimal``.
+
+Cells that are present but still not numbers are counted per column.
+"""
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from profiling import profiled
+
+MISSING_VALUES = ['', '-', '–', 'nan']
+
+BOOLEAN_VALUES = {'yes': 1.0, 'no': 0.0}
+
+# Stripped from both ends of a cell; spaces inside it are thousands separators
+SYMBOLS = '€$£%'
+SPACES = ' \t\xa0\u202f'
+
+# What the float cast accepts; anything else is a failed cell
+NUMBER = r'^[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?$'
+
+
+def _numpy(array, fill):
+    """Arrow array as a writable numpy array, nulls replaced by ``fill``."""
+    return pc.fill_null(array, fill).to_numpy(zero_copy_only=False, writable=True)
+
+
+@profiled()
+def parse_values(frame, columns=None, boolean_columns=(), decimal='.'):
+    """Parse ``columns`` of a raw string frame in one vectorized pass.
+
+    Returns a float frame with the parsed values and a Series with the
+    number of cells per column that failed to parse.
+    """
+    columns = list(frame.columns if columns is None else columns)
+    rows = len(frame)
+    # Column-major so that every column is one contiguous slice
+    text = pa.concat_arrays([pa.array(frame[name], type=pa.string(), from_pandas=True) for name in columns]
+                            or [pa.array([], type=pa.string())])
+    text = pc.utf8_trim_whitespace(text)
+    missing = _numpy(pc.or_(pc.is_null(text), pc.is_in(text, pa.array(MISSING_VALUES))), True)
+    percent = _numpy(pc.ends_with(text, '%'), False)
+
+    # yes/no only count in boolean columns, so only those slices are lowered
+    in_boolean_column = np.repeat(np.isin(columns, list(boolean_columns)), rows)
+    boolean = np.full(len(text), np.nan)
+    for position, name in enumerate(columns):
+        if name in boolean_columns:
+            flags = pc.utf8_lower(text.slice(position * rows, rows))
+            boolean[position * rows:(position + 1) * rows] = np.where(
+                _numpy(pc.equal(flags, 'yes'), False), BOOLEAN_VALUES['yes'],
+                np.where(_numpy(pc.equal(flags, 'no'), False), BOOLEAN_VALUES['no'], np.nan))
+
+    body = pc.utf8_trim(text, SYMBOLS + SPACES)
+    for space in SPACES:
+        if pc.any(pc.match_substring(body, space)).as_py():
+            body = pc.replace_substring(body, space, '')
+    if pc.any(pc.match_substring(body, '−')).as_py():
+        body = pc.replace_substring(body, '−', '-')
+
+    # Separators are ASCII, so byte positions are enough; positions in the
+    # reversed cell are counted from its end
+    commas = _numpy(pc.count_substring(body, ','), 0)
+    dots = _numpy(pc.count_substring(body, '.'), 0)
+    first = np.maximum(_numpy(pc.find_substring(body, ','), -1), _numpy(pc.find_substring(body, '.'), -1))
+    reverse = pc.binary_reverse(body.cast(pa.binary()))
+    comma_from_end = _numpy(pc.find_substring(reverse, ','), -1)
+    dot_from_end = _numpy(pc.find_substring(reverse, '.'), -1)
+    signed = _numpy(pc.starts_with(body, '-'), False) | _numpy(pc.starts_with(body, '+'), False)
+    length = _numpy(pc.binary_length(body), 0)
+    # One separator between 1-3 and exactly 3 digits, e.g. 1.234 or 1,234
+    grouped = (commas + dots == 1) & (length - first - 1 == 3) & (first - signed >= 1) & (first - signed <= 3)
+
+    both = (commas > 0) & (dots > 0)
+    comma_only = (commas > 0) & (dots == 0)
+    dot_only = (dots > 0) & (commas == 0)
+    comma_is_decimal = (
+        (both & (comma_from_end < dot_from_end))
+        | (comma_only & (commas == 1) & ~(grouped & (decimal == '.')))
+    )
+    dot_is_thousands = dot_only & ((dots > 1) | (grouped & (decimal == ',')))
+
+    # Two candidate normalisations; each cell picks the one matching its
+    # separators. Missing and yes/no cells get a null choice, i.e. no number.
+    comma_decimal = pc.replace_substring(pc.replace_substring(body, '.', ''), ',', '.')
+    dot_decimal = pc.replace_substring(body, ',', '')
+    choice = pa.array(comma_is_decimal | dot_is_thousands, mask=missing | in_boolean_column)
+    normalised = pc.if_else(choice, comma_decimal, dot_decimal)
+    try:
+        numbers = pc.cast(normalised, pa.float64())
+    except pa.ArrowInvalid:
+        # Some cells are not numbers: null them first
+        numbers = pc.cast(pc.if_else(pc.match_substring_regex(normalised, NUMBER), normalised, None), pa.float64())
+    values = _numpy(numbers, np.nan)
+
+    values[percent] /= 100
+    values[in_boolean_column] = boolean[in_boolean_column]
+    values[missing] = np.nan
+    failed = np.isnan(values) & ~missing
+
+    parsed = pd.DataFrame(values.reshape(len(columns), rows).T, index=frame.index, columns=columns)
+    failures = pd.Series(failed.reshape(len(columns), rows).sum(axis=1), index=columns, name='failed cells')
+    return parsed, failures
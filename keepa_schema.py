@@ -0,0 +1,140 @@
+"""Declared column schema for Keepa exports and the combined pricing file.
+
+Keepa exports every value as a display string (``€ 121.60``, ``3%``, ``-``,
+``yes``/``no``). The schema assigns each column a kind, and ``apply_schema``
+turns the raw strings into typed columns:
+
+- money: float euros
+- percent: float fractions (``3%`` -> 0.03)
+- bool: nullable boolean
+- int: nullable Int64 (ranks, counts)
+- float: plain floats (weights, dimensions, stock)
+- string: kept verbatim, including identifiers such as ASIN and EAN
+
+Value parsing itself lives in ``keepa_parser``.
+"""
+import re
+
+import pandas as pd
+import pyarrow as pa
+
+from keepa_parser import parse_values
+
+# Version of what a typed column holds; bump it whenever the rules, the
+# parser or ``compact_table`` change, so that typed Parquet copies and
+# shared frames written by an older version are rebuilt.
+SCHEMA_VERSION = 1
+
+# (pattern, kind) rules matched against the cleaned column name, first match
+# wins. Keepa repeats the same families across prefixes and windows, so the
+# rules also cover the columns of the wider 94-column exports.
+KEEPA_RULES = [
+    (r'^(Locale|ASIN|Title|Brand|Image|Buy Box Seller)$', 'string'),
+    (r'^Product Codes: ', 'string'),
+    (r'^Categories: Launchpad$', 'bool'),
+    (r'^Categories: ', 'string'),
+    (r'Is FBA$|Is Lowest|^Is HazMat$', 'bool'),
+    (r'%|OOS$', 'percent'),
+    (r'^Sales Rank: |OOS Count|Winner Count|^Count of |^Bought in past month$', 'int'),
+    (r'^Item: |Stock$', 'float'),
+    (r'Current$|avg\.$|Lowest$|Highest$|Last visit$|since last visit$|Fee$|^Referral Fee based on', 'money'),
+]
+
+PRICING_RULES = [
+    (r'^price$', 'money'),
+    (r'^rating$', 'float'),
+    (r'^number_of_reviews$', 'int'),
+]
+
+ARROW_TYPES = {
+    'money': pa.float64(),
+    'percent': pa.float64(),
+    'bool': pa.bool_(),
+    'int': pa.int64(),
+    'float': pa.float64(),
+    'string': pa.string(),
+}
+
+PANDAS_TYPES = {
+    'money': 'float64',
+    'percent': 'float64',
+    'bool': 'boolean',
+    'int': 'Int64',
+    'float': 'float64',
+    'string': 'string',
+}
+
+# Memory-lean reads (``read_typed(..., compact=True)``): columns of repeated
+# labels become dictionary columns, i.e. pandas categoricals, and prices and
+# percentages float32
+CATEGORICAL_COLUMNS = ['Locale', 'Brand', 'Categories: Root', 'Categories: Sub', 'Categories: Tree',
+                       'Buy Box Seller', 'source']
+COMPACT_ARROW_TYPES = {
+    'money': pa.float32(),
+    'percent': pa.float32(),
+}
+
+
+def clean_column_name(name):
+    """Strip the delivery emoji Keepa puts in the Buy Box column names."""
+    return name.replace("🚚", "").strip()
+
+
+def column_kind(name, rules=KEEPA_RULES):
+    for pattern, kind in rules:
+        if re.search(pattern, name):
+            return kind
+    return 'string'
+
+
+def column_kinds(columns, rules=KEEPA_RULES):
+    return {name: column_kind(name, rules) for name in columns}
+
+
+def columns_of_kind(columns, kind, rules=KEEPA_RULES):
+    return [name for name in columns if column_kind(name, rules) == kind]
+
+
+def arrow_schema(columns, rules=KEEPA_RULES):
+    return pa.schema([(name, ARROW_TYPES[column_kind(name, rules)]) for name in columns])
+
+
+def compact_table(table, rules=KEEPA_RULES):
+    """Memory-lean copy of a typed Arrow table, see ``CATEGORICAL_COLUMNS``
+    and ``COMPACT_ARROW_TYPES``."""
+    for index, name in enumerate(table.column_names):
+        column = table.column(index)
+        kind = column_kind(name, rules)
+        if name in CATEGORICAL_COLUMNS:
+            if not pa.types.is_dictionary(column.type):
+                column = column.dictionary_encode()
+        elif kind in COMPACT_ARROW_TYPES:
+            column = column.cast(COMPACT_ARROW_TYPES[kind])
+        else:
+            continue
+        table = table.set_column(index, name, column)
+    return table
+
+
+def apply_schema(raw, rules=KEEPA_RULES, decimal='.'):
+    """Typed copy of a frame read with ``dtype=str``.
+
+    All non-string columns go through one ``parse_values`` pass; the
+    per-kind step afterwards only casts. Returns the typed frame and the
+    number of cells per column that failed to parse.
+    """
+    raw = raw.rename(columns=clean_column_name)
+    kinds = column_kinds(raw.columns, rules)
+    numeric = [name for name, kind in kinds.items() if kind != 'string']
+    parsed, failures = parse_values(raw, numeric, boolean_columns=columns_of_kind(numeric, 'bool', rules),
+                                    decimal=decimal)
+
+    typed = {}
+    for name, kind in kinds.items():
+        if kind == 'string':
+            typed[name] = raw[name].astype('string')
+        elif kind == 'int':
+            typed[name] = parsed[name].round().astype('Int64')
+        else:
+            typed[name] = parsed[name].astype(PANDAS_TYPES[kind])
+    return pd.DataFrame(typed, index=raw.index), failures
@@ -0,0 +1,116 @@
+"""Net proceeds and margin per ASIN, with what-if pricing.
+
+For every ASIN with a Buy Box price the margin is what is left of the price
+after the referral fee, the FBA pick & pack fee and the cost of goods:
+
+    net proceeds = price - referral % x price - FBA fee - cost of goods
+    margin       = net proceeds / price
+
+A scenario changes the price by ``price_change`` percent, sets the cost of
+goods to ``cogs`` percent of the current price and can override the
+referral fee percentage (``referral``) or the FBA fee (``fba``) of every
+ASIN. ``MarginModel`` prepares the inputs once per data version; a scenario
+then recomputes every ASIN with a few array operations. Both the net
+proceeds and the margin are linear in the per-ASIN inputs, so the brand
+rollups come from per-brand sums kept in the model and cost one operation
+per brand, whatever the number of rows.
+"""
+import numpy as np
+import pandas as pd
+
+from brand_metrics import BRAND_COLUMN, LOCALE_COLUMN, PRICE_COLUMN, append_total
+from profiling import profiled
+
+ASIN_COLUMN = 'ASIN'
+REFERRAL_PERCENT_COLUMN = 'Referral Fee %'
+REFERRAL_FEE_COLUMN = 'Referral Fee based on current Buy Box price'
+FBA_FEE_COLUMN = 'FBA Pick&Pack Fee'
+
+MARGIN_COLUMNS = [LOCALE_COLUMN, ASIN_COLUMN, BRAND_COLUMN, PRICE_COLUMN, REFERRAL_PERCENT_COLUMN,
+                  REFERRAL_FEE_COLUMN, FBA_FEE_COLUMN]
+
+
+def _values(frame, column):
+    return frame[column].to_numpy(dtype='float64', na_value=np.nan)
+
+
+class MarginModel:
+    """Fee inputs of the ASINs of ``frame`` and their sums per ``by`` group.
+
+    ASINs without a positive Buy Box price are left out. A missing referral
+    percentage is taken from the referral fee charged at the current price,
+    or else from the median of the catalogue; a missing FBA fee counts as
+    none (merchant fulfilled).
+    """
+
+    @profiled()
+    def __init__(self, frame, by=(LOCALE_COLUMN, BRAND_COLUMN)):
+        price = _values(frame, PRICE_COLUMN)
+        priced = price > 0
+        self.price = price[priced]
+        referral = _values(frame, REFERRAL_PERCENT_COLUMN)[priced] / 100
+        referral = np.where(np.isnan(referral), _values(frame, REFERRAL_FEE_COLUMN)[priced] / self.price, referral)
+        median = np.nanmedian(referral) if np.isfinite(referral).any() else 0.0
+        self.referral = np.where(np.isnan(referral), median, referral)
+        self.fba = np.nan_to_num(_values(frame, FBA_FEE_COLUMN)[priced])
+        self.by = list(by)
+        self.keys = frame.loc[priced, self.by + [ASIN_COLUMN]].reset_index(drop=True)
+        # Sums per group of every term of the net proceeds and the margin
+        terms = pd.DataFrame({
+            'products': 1,
+            'price': self.price,
+            'referral fee': self.price * self.referral,
+            'referral': self.referral,
+            'fba': self.fba,
+            'fba / price': self.fba / self.price,
+            '1 / price': 1 / self.price,
+        })
+        self.partials = terms.groupby([self.keys[name] for name in self.by], observed=True).sum()
+
+    def __len__(self):
+        return len(self.price)
+
+    def proceeds(self, price_change=0.0, cogs=0.0, referral=None, fba=None):
+        """Per-ASIN price, fees, cost of goods, net proceeds and margin %
+        under the scenario."""
+        price = self.price * (1 + price_change / 100)
+        referral_fee = price * (self.referral if referral is None else referral / 100)
+        fba_fee = self.fba if fba is None else np.full(len(self), float(fba))
+        cost = self.price * (cogs / 100)
+        net = price - referral_fee - fba_fee - cost
+        return self.keys.assign(**{
+            'Price': price, 'Referral fee': referral_fee, 'FBA fee': fba_fee, 'Cost of goods': cost,
+            'Net proceeds': net, 'Margin %': 100 * net / price,
+        })
+
+    def group_margins(self, price_change=0.0, cogs=0.0, referral=None, fba=None, total=None):
+        """Per-group products, mean price, mean and total net proceeds and
+        mean margin % under the scenario, from the group sums only. With a
+        ``total`` label the rows across the first ``by`` level (the locale)
+        are appended, see ``brand_metrics.append_total``."""
+        sums = self.partials if total is None else append_total(self.partials, total)
+        scale, cost = 1 + price_change / 100, cogs / 100
+        products = sums['products']
+        if referral is None:
+            referral_fee, referral_share = sums['referral fee'], sums['referral']
+        else:
+            referral_fee, referral_share = referral / 100 * sums['price'], referral / 100 * products
+        if fba is None:
+            fba_fee, fba_share = sums['fba'], sums['fba / price']
+        else:
+            fba_fee, fba_share = fba * products, fba * sums['1 / price']
+        net = scale * (sums['price'] - referral_fee) - fba_fee - cost * sums['price']
+        margin = 1 - referral_share / products - fba_share / (scale * products) - cost / scale
+        return pd.DataFrame({
+            'Products': products.astype('int64'), 'Price': scale * sums['price'] / products,
+            'Net proceeds': net / products, 'Margin %': 100 * margin, 'Total net proceeds': net,
+        })
+
+
+def margin_histogram(margins, width=5, low=-100, high=100):
+    """ASIN counts per ``width``-point margin bin, indexed by the lower bin
+    edge; margins outside [low, high) count in the outermost bins."""
+    edges = np.arange(low, high + width, width)
+    values = np.clip(np.asarray(margins, dtype='float64'), low, high - width / 2)
+    counts, _ = np.histogram(values[~np.isnan(values)], edges)
+    return pd.Series(counts, index=pd.Index(edges[:-1], name='Margin %'), name='ASINs')
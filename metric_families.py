@@ -0,0 +1,101 @@
+"""Windowed Keepa metric families in tidy form.
+
+Keepa repeats the same metrics across prefixes and windows: ``Buy Box``,
+``Amazon`` and ``New`` each have ``Current``, 30/90/180 days averages and
+1/7/30/90 days drop %, and ``Buy Box: % Amazon``, ``% Top Seller`` and
+``Winner Count`` come for 30/90/180/365 days. ``metric_families`` parses the
+column names into (source, metric, window), so that every window a wider
+export adds is picked up without naming it:
+
+    Buy Box : 30 days drop %    -> ('Buy Box', 'drop %', 30)
+    Buy Box: % Amazon 90 days   -> ('Buy Box', '% Amazon', 90)
+    Amazon: OOS Count 30 days   -> ('Amazon', 'OOS Count', 30)
+    New: Current                -> ('New', 'Current', 0)
+
+``metric_table`` relabels the columns with that (source, metric, window)
+index and ``aggregate_metrics`` computes every window of the families
+``select_families`` picks (all by default) per group in one grouped pass.
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+from brand_metrics import append_total
+from profiling import profiled
+
+WINDOW_PATTERN = re.compile(
+    r'^(?P<source>[^:]+?) ?: (?P<metric>.*?) ?(?P<window>\d+) days?(?P<suffix> avg\.| drop %| OOS)?$')
+CURRENT_PATTERN = re.compile(r'^(?P<source>[^:]+?) ?: Current$')
+
+FAMILY_LEVELS = ['source', 'metric', 'window']
+
+
+def parse_column(name):
+    """(source, metric, window in days) of a metric column, None for any
+    other column. ``Current`` values have window 0."""
+    match = WINDOW_PATTERN.match(name)
+    if match:
+        metric = f"{match['metric']} {(match['suffix'] or '').strip()}".strip()
+        return match['source'], metric, int(match['window'])
+    match = CURRENT_PATTERN.match(name)
+    if match:
+        return match['source'], 'Current', 0
+    return None
+
+
+def metric_families(columns):
+    """Frame of the metric columns among ``columns``, indexed by column name,
+    with their ``source``, ``metric`` and ``window``."""
+    parsed = {name: parse_column(name) for name in columns}
+    families = pd.DataFrame([family for family in parsed.values() if family], columns=FAMILY_LEVELS,
+                            index=pd.Index([name for name, family in parsed.items() if family], name='column'))
+    return families.sort_values(FAMILY_LEVELS)
+
+
+def select_families(families, source=None, metric=None, window=None):
+    """Rows of ``families`` matching every given value (or list of values)."""
+    keep = np.ones(len(families), dtype=bool)
+    for level, value in zip(FAMILY_LEVELS, (source, metric, window)):
+        if value is not None:
+            keep &= families[level].isin(value if isinstance(value, (list, tuple, set)) else [value]).to_numpy()
+    return families[keep]
+
+
+def metric_table(frame, families=None):
+    """The metric columns of ``frame`` as floats under a (source, metric,
+    window) column index."""
+    families = metric_families(frame.columns) if families is None else families
+    table = frame[families.index].astype('float64')
+    table.columns = pd.MultiIndex.from_frame(families)
+    return table
+
+
+@profiled()
+def aggregate_metrics(frame, by, families=None, total=None):
+    """Mean and count of every metric and window per group of ``by``.
+
+    One grouped pass over all metric columns; the result is indexed by the
+    ``by`` columns plus ``source``, ``metric`` and ``window``. With a list
+    ``by`` starting with the locale and a ``total`` label, the rows across
+    locales are appended (see ``brand_metrics.append_total``).
+    """
+    by = [by] if isinstance(by, str) else list(by)
+    table = metric_table(frame, families)
+    grouped = table.groupby([frame[name] for name in by], observed=True)
+    partials = pd.DataFrame({
+        'sum': grouped.sum().stack(FAMILY_LEVELS, future_stack=True),
+        'count': grouped.count().stack(FAMILY_LEVELS, future_stack=True),
+    })
+    partials = partials[partials['count'] > 0]
+    if total is not None:
+        partials = append_total(partials, total)
+    return pd.DataFrame({'mean': partials['sum'] / partials['count'], 'count': partials['count'].astype('int64')})
+
+
+def family_means(aggregates, source, metric):
+    """``mean`` of one metric of ``aggregate_metrics`` over all its windows,
+    indexed by the group and ``window``; empty if the metric is absent."""
+    index = aggregates.index
+    keep = (index.get_level_values('source') == source) & (index.get_level_values('metric') == metric)
+    return aggregates.loc[keep, 'mean'].droplevel(['source', 'metric'])
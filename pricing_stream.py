@@ -0,0 +1,295 @@
+"""Streaming aggregates for the combined pricing file.
+
+``stream_pricing`` reads the file in chunks and only keeps running
+aggregates, so peak memory stays flat however many rows the file has:
+
+- ``GroupStats``: count, mean, variance, min and max of a value per group
+- ``QuantileSketch``: per-group log-bucket histogram with relative error
+  ``alpha`` on every quantile
+- ``Correlation``: co-moments of a pair of columns (Pearson correlation)
+- ``Extremes``: the smallest and largest values per group, from which box
+  plot whiskers and outliers are drawn
+
+Every aggregate has a ``merge``, so chunks, files or worker processes can
+be combined in any order. ``GroupStats`` and ``QuantileSketch`` also have a
+``subtract``, which takes rows back out (see ``incremental``).
+"""
+import numpy as np
+import pandas as pd
+
+from box_stats import MAX_OUTLIERS, sketch_box_stats
+from keepa_schema import PRICING_RULES, apply_schema
+from profiling import profiled
+
+PRICING_COLUMNS = ['price', 'rating', 'number_of_reviews', 'source']
+
+# (value, group) pairs summarised per group
+GROUPED = [('price', 'rating'), ('price', 'source'), ('rating', 'source'), ('number_of_reviews', 'source')]
+
+# (x, y) pairs correlated
+CORRELATED = [('price', 'rating'), ('number_of_reviews', 'rating')]
+
+# Sketch bucket keys are sign * (log bucket + offset), so that they sort in
+# value order; values closer to zero than TINY share the zero bucket
+BUCKET_OFFSET = 1 << 20
+TINY = 1e-9
+
+
+class GroupStats:
+    """Count, mean, variance, min and max of a value per group."""
+
+    def __init__(self):
+        self.state = pd.DataFrame(columns=['count', 'mean', 'm2', 'min', 'max'], dtype=float)
+
+    def update(self, keys, values):
+        grouped = pd.Series(values).groupby(keys)
+        count = grouped.count()
+        chunk = pd.DataFrame({
+            'count': count,
+            'mean': grouped.mean(),
+            'm2': grouped.var(ddof=0) * count,
+            'min': grouped.min(),
+            'max': grouped.max(),
+        })
+        self._combine(chunk[chunk['count'] > 0].astype(float))
+
+    def merge(self, other):
+        self._combine(other.state)
+        return self
+
+    def subtract(self, other):
+        """Remove values that were added before (count, mean and variance
+        only: min and max stay the bounds of everything ever added)."""
+        chunk = other.state.reindex(self.state.index).fillna(0.0)
+        a = self.state
+        count = a['count'] - chunk['count']
+        # Chan et al. update run backwards
+        mean = (a['count'] * a['mean'] - chunk['count'] * chunk['mean']) / count
+        delta = chunk['mean'] - mean
+        m2 = a['m2'] - chunk['m2'] - delta ** 2 * count * chunk['count'] / a['count']
+        self.state = a.assign(count=count, mean=mean, m2=m2.clip(lower=0))[count > 0]
+        return self
+
+    def _combine(self, chunk):
+        # Chan et al. parallel update of mean and sum of squared deviations
+        groups = self.state.index.union(chunk.index)
+        fill = {'count': 0.0, 'mean': 0.0, 'm2': 0.0, 'min': np.inf, 'max': -np.inf}
+        a = self.state.reindex(groups).fillna(fill)
+        b = chunk.reindex(groups).fillna(fill)
+        count = a['count'] + b['count']
+        delta = b['mean'] - a['mean']
+        self.state = pd.DataFrame({
+            'count': count,
+            'mean': a['mean'] + delta * b['count'] / count,
+            'm2': a['m2'] + b['m2'] + delta ** 2 * a['count'] * b['count'] / count,
+            'min': np.minimum(a['min'], b['min']),
+            'max': np.maximum(a['max'], b['max']),
+        })
+
+    def summary(self):
+        state = self.state
+        var = state['m2'] / (state['count'] - 1)
+        return pd.DataFrame({
+            'count': state['count'],
+            'mean': state['mean'],
+            'std': np.sqrt(var),
+            'var': var,
+            'min': state['min'],
+            'max': state['max'],
+            'sum': state['mean'] * state['count'],
+        })
+
+
+class QuantileSketch:
+    """Mergeable per-group quantile sketch.
+
+    Values fall into logarithmic buckets of ratio ``gamma`` (mirrored for
+    negative values), so a quantile is returned with a relative error of at
+    most ``alpha``.
+    """
+
+    def __init__(self, alpha=0.01):
+        self.alpha = alpha
+        self.gamma = (1 + alpha) / (1 - alpha)
+        self.counts = pd.Series(dtype='int64')
+
+    def update(self, keys, values):
+        values = np.asarray(values, dtype=float)
+        valid = ~np.isnan(values) & pd.notna(np.asarray(keys))
+        values = values[valid]
+        magnitude = np.abs(values)
+        nonzero = magnitude >= TINY
+        buckets = np.zeros(len(values), dtype=np.int64)
+        buckets[nonzero] = np.sign(values[nonzero]) * (
+            np.ceil(np.log(magnitude[nonzero]) / np.log(self.gamma)) + BUCKET_OFFSET)
+        chunk = pd.Series(1, index=pd.MultiIndex.from_arrays([np.asarray(keys)[valid], buckets])).groupby(level=[0, 1]).sum()
+        self._combine(chunk)
+
+    def merge(self, other):
+        self._combine(other.counts)
+        return self
+
+    def subtract(self, other):
+        """Remove values that were added before."""
+        counts = self.counts.sub(other.counts, fill_value=0).astype('int64')
+        self.counts = counts[counts > 0]
+        return self
+
+    def _combine(self, chunk):
+        self.counts = chunk if self.counts.empty else self.counts.add(chunk, fill_value=0).astype('int64')
+
+    def _bucket_values(self, buckets):
+        exponent = (np.abs(buckets) - BUCKET_OFFSET).astype(float)
+        return np.sign(buckets) * 2 * self.gamma ** exponent / (self.gamma + 1)
+
+    def quantiles(self, qs=(0.25, 0.5, 0.75)):
+        """Frame of approximate quantiles, one row per group."""
+        rows = {}
+        for key, counts in self.counts.groupby(level=0):
+            counts = counts.droplevel(0).sort_index()
+            cumulative = counts.cumsum().to_numpy()
+            ranks = np.asarray(qs) * (cumulative[-1] - 1)
+            buckets = counts.index.to_numpy()[np.searchsorted(cumulative, ranks, side='right')]
+            rows[key] = self._bucket_values(buckets)
+        return pd.DataFrame.from_dict(rows, orient='index', columns=[f'{q:.0%}' for q in qs])
+
+    def modes(self):
+        """Approximate mode per group: the centre of the fullest bucket."""
+        fullest = self.counts.groupby(level=0).idxmax()
+        buckets = np.array([bucket for _, bucket in fullest], dtype=np.int64)
+        return pd.Series(self._bucket_values(buckets), index=fullest.index)
+
+
+class Extremes:
+    """The ``k`` smallest and ``k`` largest values per group."""
+
+    def __init__(self, k=500):
+        self.k = k
+        self.values = pd.DataFrame({'key': pd.Series(dtype=object), 'value': pd.Series(dtype=float)})
+
+    def update(self, keys, values):
+        chunk = pd.DataFrame({'key': keys, 'value': values}).dropna()
+        self._combine(chunk)
+
+    def merge(self, other):
+        self._combine(other.values)
+        return self
+
+    def _combine(self, chunk):
+        data = pd.concat([self.values, chunk], ignore_index=True).sort_values('value', kind='stable')
+        grouped = data.groupby('key', sort=False)
+        kept = grouped.head(self.k).index.union(grouped.tail(self.k).index)
+        self.values = data.loc[kept].reset_index(drop=True)
+
+
+class Correlation:
+    """Pearson correlation from running co-moments, pairwise-complete like
+    ``Series.corr``."""
+
+    def __init__(self):
+        self.n = 0
+        self.mean_x = self.mean_y = 0.0
+        self.m2_x = self.m2_y = self.c_xy = 0.0
+
+    def update(self, x, y):
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        valid = ~(np.isnan(x) | np.isnan(y))
+        x, y = x[valid], y[valid]
+        if len(x):
+            dx, dy = x - x.mean(), y - y.mean()
+            self._combine(len(x), x.mean(), y.mean(), (dx * dx).sum(), (dy * dy).sum(), (dx * dy).sum())
+
+    def merge(self, other):
+        if other.n:
+            self._combine(other.n, other.mean_x, other.mean_y, other.m2_x, other.m2_y, other.c_xy)
+        return self
+
+    def _combine(self, n, mean_x, mean_y, m2_x, m2_y, c_xy):
+        total = self.n + n
+        delta_x = mean_x - self.mean_x
+        delta_y = mean_y - self.mean_y
+        weight = self.n * n / total
+        self.m2_x += m2_x + delta_x ** 2 * weight
+        self.m2_y += m2_y + delta_y ** 2 * weight
+        self.c_xy += c_xy + delta_x * delta_y * weight
+        self.mean_x += delta_x * n / total
+        self.mean_y += delta_y * n / total
+        self.n = total
+
+    @property
+    def value(self):
+        if self.n < 2 or self.m2_x == 0 or self.m2_y == 0:
+            return np.nan
+        return self.c_xy / np.sqrt(self.m2_x * self.m2_y)
+
+
+class PricingAggregates:
+    """All aggregates the review and source sections render from."""
+
+    def __init__(self, alpha=0.01, extremes=500):
+        self.rows = 0
+        self.stats = {pair: GroupStats() for pair in GROUPED}
+        self.sketches = {pair: QuantileSketch(alpha) for pair in GROUPED}
+        self.extremes = {pair: Extremes(extremes) for pair in GROUPED}
+        self.correlations = {pair: Correlation() for pair in CORRELATED}
+
+    def update(self, chunk):
+        self.rows += len(chunk)
+        for value, group in GROUPED:
+            values = chunk[value].to_numpy(dtype=float, na_value=np.nan)
+            keys = chunk[group].to_numpy(dtype=object, na_value=None)
+            self.stats[value, group].update(keys, values)
+            self.sketches[value, group].update(keys, values)
+            self.extremes[value, group].update(keys, values)
+        for x, y in CORRELATED:
+            self.correlations[x, y].update(chunk[x].to_numpy(dtype=float, na_value=np.nan),
+                                           chunk[y].to_numpy(dtype=float, na_value=np.nan))
+        return self
+
+    def merge(self, other):
+        self.rows += other.rows
+        for pair in GROUPED:
+            self.stats[pair].merge(other.stats[pair])
+            self.sketches[pair].merge(other.sketches[pair])
+            self.extremes[pair].merge(other.extremes[pair])
+        for pair in CORRELATED:
+            self.correlations[pair].merge(other.correlations[pair])
+        return self
+
+    def describe(self, value, group):
+        """``groupby(group)[value].describe()`` computed from the aggregates."""
+        summary = self.stats[value, group].summary()
+        quartiles = self.sketches[value, group].quantiles()
+        return summary[['count', 'mean', 'std', 'min']].join(quartiles).join(summary[['max', 'sum']])
+
+    def box_stats(self, value, group, max_outliers=MAX_OUTLIERS):
+        """Box plot statistics, see ``box_stats.sketch_box_stats``."""
+        return sketch_box_stats(self.describe(value, group), self.extremes[value, group].values, max_outliers)
+
+    def correlation(self, x, y):
+        return self.correlations[x, y].value
+
+
+def pricing_header(path):
+    """Column names of a combined pricing CSV."""
+    return pd.read_csv(path, nrows=0).columns
+
+
+def pricing_chunks(path, columns=PRICING_COLUMNS, chunksize=200_000):
+    """Typed chunks of a combined pricing CSV; requested columns the file
+    lacks are left out."""
+    header = pricing_header(path)
+    usecols = [name for name in columns if name in header]
+    for raw in pd.read_csv(path, usecols=usecols, dtype=str, chunksize=chunksize):
+        chunk, _ = apply_schema(raw, PRICING_RULES)
+        yield chunk
+
+
+@profiled()
+def stream_pricing(path, chunksize=200_000, alpha=0.01):
+    """Aggregate a combined pricing CSV chunk by chunk."""
+    aggregates = PricingAggregates(alpha)
+    for chunk in pricing_chunks(path, chunksize=chunksize):
+        aggregates.update(chunk)
+    return aggregates
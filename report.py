@@ -0,0 +1,156 @@
+"""Headless batch reports with the dashboard's analytics.
+
+Every Keepa export in a directory (the files matching ``*_keepa.csv``, or
+``--pattern``) is processed in its own worker process. For each export the brand, summary, category and price-drop tables are
+written as Parquet and JSON and the dashboard figures as static HTML,
+under ``<output-dir>/<export name>/``. When there are several exports the
+per-marketplace and across-marketplace brand and category tables are
+written under ``<output-dir>/marketplaces/``. With ``--pricing`` the
+combined pricing file is streamed into the review and source analyses as
+well.
+
+As in the dashboard, each export is read through its typed Parquet copy,
+which is written next to the CSV (``<name>.parquet``) when it is missing or
+stale and reused by later runs and by the dashboard.
+
+Usage:
+    python report.py exports/ --output-dir reports --jobs 8
+    python report.py exports/ --pricing combined_pricing_v1.csv
+"""
+import argparse
+import glob
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from brand_metrics import ALL_LOCALES, LOCALE_COLUMN, brand_metrics, top_n
+from category_metrics import ROOT_COLUMN, SUB_COLUMN, category_metrics, category_sales_rank, top_categories
+from charts import brand_bar, category_pie, category_rank_bar, precomputed_box
+from data_loader import KEEPA_PATTERN, NUMERIC_COLUMNS, read_keepa, read_keepa_exports
+from pricing_stream import stream_pricing
+from summary_stats import summary_statistics
+
+
+def write_table(table, output_dir, name):
+    frame = table.to_frame() if hasattr(table, 'to_frame') else table
+    frame = frame.reset_index()
+    frame.columns = [str(column) for column in frame.columns]
+    frame.to_parquet(os.path.join(output_dir, f'{name}.parquet'), index=False)
+    frame.to_json(os.path.join(output_dir, f'{name}.json'), orient='records', indent=2, force_ascii=False)
+
+
+def write_figure(fig, output_dir, name):
+    fig.write_html(os.path.join(output_dir, f'{name}.html'), include_plotlyjs='cdn')
+
+
+def keepa_report(path, output_dir):
+    """Brand, summary, category and price-drop analyses of one Keepa export."""
+    output_dir = os.path.join(output_dir, os.path.splitext(os.path.basename(path))[0])
+    os.makedirs(output_dir, exist_ok=True)
+    data = read_keepa(path).dropna(subset=['Brand'])
+    brand_table = brand_metrics(data)
+    root_table = category_metrics(data, ROOT_COLUMN)
+
+    tables = {
+        'brand_metrics': brand_table,
+        'summary_statistics': summary_statistics(data, NUMERIC_COLUMNS),
+        'root_categories': top_categories(root_table),
+        'sub_categories': top_categories(category_metrics(data, SUB_COLUMN)),
+        'category_sales_rank': category_sales_rank(root_table),
+    }
+    figures = {
+        'top_brands_price': brand_bar(top_n(brand_table, 'Buy Box : Current'), 'Average Current Buy Box Price',
+                                      title='Top 10 Brands by Average Current Buy Box Price',
+                                      axis_label='Average Current Buy Box Price (€)'),
+        'top_brands_sales_rank': brand_bar(top_n(brand_table, 'Sales Rank: 90 days avg.', ascending=True),
+                                           'Avg. Sales Rank (90 days avg.)',
+                                           title='Top 10 Brands by Average Sales Rank (90 days avg.)',
+                                           axis_label='Average Sales Rank (90 days avg.)'),
+        'top_brands_price_drop': brand_bar(top_n(brand_table, 'Buy Box : 30 days drop %'),
+                                           'Average Price Drop (30 days)',
+                                           title='Top 10 Brands by Average Price Drop (30 days)',
+                                           axis_label='Average Price Drop (30 days) (%)'),
+        'root_categories': category_pie(tables['root_categories'], 'Category',
+                                        title='Top 10 Popular Root Categories'),
+        'sub_categories': category_pie(tables['sub_categories'], 'Subcategory',
+                                       title='Top 10 Popular Subcategories'),
+        'category_sales_rank': category_rank_bar(tables['category_sales_rank']),
+    }
+    for name, table in tables.items():
+        write_table(table, output_dir, name)
+    for name, fig in figures.items():
+        write_figure(fig, output_dir, name)
+    return output_dir, len(data)
+
+
+def marketplace_report(paths, output_dir):
+    """Brand and category tables per marketplace and across marketplaces."""
+    output_dir = os.path.join(output_dir, 'marketplaces')
+    os.makedirs(output_dir, exist_ok=True)
+    data = read_keepa_exports(paths).dropna(subset=['Brand'])
+    write_table(brand_metrics(data, by=[LOCALE_COLUMN, 'Brand'], total=ALL_LOCALES), output_dir, 'brand_metrics')
+    for name, column in (('root_categories', ROOT_COLUMN), ('sub_categories', SUB_COLUMN)):
+        write_table(category_metrics(data, column, by=LOCALE_COLUMN, total=ALL_LOCALES), output_dir, name)
+    return output_dir, len(data)
+
+
+def pricing_report(path, output_dir):
+    """Review and source analyses of a combined pricing file."""
+    output_dir = os.path.join(output_dir, os.path.splitext(os.path.basename(path))[0])
+    os.makedirs(output_dir, exist_ok=True)
+    aggregates = stream_pricing(path)
+
+    for value, group in (('price', 'rating'), ('price', 'source'), ('rating', 'source')):
+        write_table(aggregates.describe(value, group), output_dir, f'{value}_by_{group}')
+    write_figure(precomputed_box(aggregates.box_stats('price', 'rating'), title='Price Distribution by Rating',
+                                 x_label='Rating', y_label='Price (€)'),
+                 output_dir, 'price_by_rating')
+    write_figure(precomputed_box(aggregates.box_stats('price', 'source'), title='Price Variation by Source',
+                                 x_label='Source', y_label='Price ($)'),
+                 output_dir, 'price_by_source')
+    write_figure(precomputed_box(aggregates.box_stats('rating', 'source'), title='Rating Comparison by Source',
+                                 x_label='Source', y_label='Rating'),
+                 output_dir, 'rating_by_source')
+    correlations = {
+        'price_rating': aggregates.correlation('price', 'rating'),
+        'number_of_reviews_rating': aggregates.correlation('number_of_reviews', 'rating'),
+    }
+    with open(os.path.join(output_dir, 'correlations.json'), 'w') as handle:
+        json.dump(correlations, handle, indent=2)
+    return output_dir, aggregates.rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write the dashboard analyses for a directory of Keepa exports.")
+    parser.add_argument('input_dir', help="directory holding the Keepa export CSVs")
+    parser.add_argument('--pattern', default=KEEPA_PATTERN,
+                        help=f"file name pattern of the Keepa exports (default: {KEEPA_PATTERN})")
+    parser.add_argument('--output-dir', default='reports', help="where the reports are written (default: reports)")
+    parser.add_argument('--pricing', nargs='*', default=[], help="combined pricing CSVs to report on")
+    parser.add_argument('--jobs', type=int, default=os.cpu_count(),
+                        help="worker processes (default: number of CPUs)")
+    args = parser.parse_args(argv)
+
+    exports = sorted(glob.glob(os.path.join(args.input_dir, args.pattern)))
+    exports = [path for path in exports if os.path.abspath(path) not in map(os.path.abspath, args.pricing)]
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        futures = {pool.submit(keepa_report, path, args.output_dir): path for path in exports}
+        futures.update({pool.submit(pricing_report, path, args.output_dir): path for path in args.pricing})
+        failed = 0
+        for future in as_completed(futures):
+            try:
+                output_dir, rows = future.result()
+            except Exception as error:
+                failed += 1
+                print(f"{futures[future]}: failed: {error}")
+            else:
+                print(f"{futures[future]}: {rows:,} rows -> {output_dir}")
+    if len(exports) > 1 and not failed:
+        # The workers have written the typed copies, so this only reads Parquet
+        output_dir, rows = marketplace_report(exports, args.output_dir)
+        print(f"{len(exports)} marketplaces: {rows:,} rows -> {output_dir}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
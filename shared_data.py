@@ -0,0 +1,92 @@
+"""Loaded datasets shared through memory-mapped Arrow IPC files.
+
+A loaded frame is written once, uncompressed, to an Arrow IPC (Feather v2)
+file named after its source fingerprints and the ``SCHEMA_VERSION`` and
+then memory-mapped read-only. Every session of a server process uses the
+same frame, and every process on the host maps the same file, so numeric
+columns share physical pages instead of being copied per session or per
+process. Labels are held as categoricals and cost one small code per row in
+each process.
+
+The frames are read-only: their numeric columns are views of the mapped
+file, so derive new frames instead of assigning into them.
+"""
+import glob
+import hashlib
+import os
+import tempfile
+
+import pyarrow as pa
+
+from keepa_schema import SCHEMA_VERSION
+from profiling import profiled
+
+SHARED_ROOT = os.environ.get('SHARED_DATA', os.path.join(tempfile.gettempdir(), 'amazon_sales_analysis'))
+
+
+def shared_path(kind, key, root=SHARED_ROOT):
+    # Frames typed by an older schema are never served under a new one
+    digest = hashlib.blake2b(repr((SCHEMA_VERSION, key)).encode(), digest_size=12).hexdigest()
+    return os.path.join(root, f'{kind}-{digest}.arrow')
+
+
+def to_table(frame):
+    """Arrow table of ``frame`` that maps back without copies.
+
+    ``Table.from_pandas`` turns NaN into nulls, and a column with nulls has
+    to be copied on the way back; float columns are kept with NaN instead.
+    """
+    arrays = []
+    for name in frame.columns:
+        values = frame[name]
+        if values.dtype.kind == 'f':
+            arrays.append(pa.array(values.to_numpy()))
+        else:
+            arrays.append(pa.Array.from_pandas(values))
+    return pa.table(arrays, names=[str(name) for name in frame.columns])
+
+
+def write_shared(frame, path):
+    """Write ``frame`` to ``path``; readers never see a partial file."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    table = to_table(frame)
+    partial = f'{path}.{os.getpid()}.partial'
+    with pa.OSFile(partial, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(partial, path)
+
+
+def read_shared(path):
+    """Frame over the memory-mapped file at ``path``."""
+    table = pa.ipc.open_file(pa.memory_map(path, 'r')).read_all()
+    # split_blocks keeps every numeric column a view of its own buffer
+    return table.to_pandas(split_blocks=True)
+
+
+def _prune(kind, keep, root):
+    # Files of older versions; processes still mapping them keep their pages
+    for path in glob.glob(os.path.join(root, f'{kind}-*.arrow')):
+        if path != keep:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+@profiled()
+def shared_frame(kind, key, build, root=SHARED_ROOT):
+    """The frame ``build()`` returns for ``key``, mapped from its shared file.
+
+    The first process to need a version builds and writes it; the others
+    only map it. Without a writable ``root`` the built frame is returned.
+    """
+    path = shared_path(kind, key, root)
+    if not os.path.exists(path):
+        frame = build()
+        try:
+            write_shared(frame, path)
+        except OSError:
+            return frame
+        _prune(kind, path, root)
+    return read_shared(path)
+
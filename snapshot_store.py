@@ -0,0 +1,220 @@
+"""Local time-series store of Keepa snapshots.
+
+Every Keepa export that is added becomes one dated Parquet partition,
+``<root>/<YYYY-MM-DD>/<HHMMSS>_<export name>.parquet`` (with a ``_<n>``
+suffix for a second export of that name in the same second), sorted by
+ASIN and written in row groups of ``ROW_GROUP_SIZE`` rows. A SQLite index next to
+the partitions records, per row group, its ASIN range and the brands and
+root categories it holds, so a history query only opens the row groups
+that contain the ASIN, brand or category asked for.
+
+Usage:
+    python snapshot_store.py add fragance_it_keepa.csv
+    python snapshot_store.py history B00EXAMPLE --last 30
+    python snapshot_store.py history --brand "GIORGIO ARMANI"
+"""
+import argparse
+import contextlib
+import datetime
+import itertools
+import os
+import sqlite3
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from data_loader import DASHBOARD_COLUMNS, to_percent_points
+from ingest import read_typed, source_fingerprint
+
+SNAPSHOT_ROOT = os.environ.get('KEEPA_SNAPSHOTS', "snapshots")
+
+ROW_GROUP_SIZE = 16_384
+
+# Columns indexed per row group besides the ASIN range
+GROUP_COLUMNS = ['Brand', 'Categories: Root']
+
+# Columns returned by the history queries by default
+HISTORY_COLUMNS = ['Buy Box : Current', 'Sales Rank: 90 days avg.']
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY,
+    taken_at TEXT NOT NULL,
+    source TEXT NOT NULL,
+    fingerprint TEXT NOT NULL UNIQUE,
+    path TEXT NOT NULL,
+    rows INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS row_groups (
+    snapshot_id INTEGER NOT NULL,
+    row_group INTEGER NOT NULL,
+    first_asin TEXT NOT NULL,
+    last_asin TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS row_groups_asin ON row_groups (first_asin, last_asin);
+CREATE TABLE IF NOT EXISTS group_rows (
+    column_name TEXT NOT NULL,
+    value TEXT NOT NULL,
+    snapshot_id INTEGER NOT NULL,
+    row_group INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS group_rows_value ON group_rows (column_name, value, snapshot_id);
+"""
+
+
+class SnapshotStore:
+    """Dated Keepa partitions under ``root`` with their SQLite index."""
+
+    def __init__(self, root=SNAPSHOT_ROOT):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        with self._connect() as db:
+            db.executescript(SCHEMA)
+
+    @contextlib.contextmanager
+    def _connect(self):
+        # One connection per call: the dashboard queries from several threads
+        db = sqlite3.connect(os.path.join(self.root, 'index.sqlite'))
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def append(self, csv_path, taken_at=None, columns=DASHBOARD_COLUMNS):
+        """Store the export ``csv_path`` as a new snapshot and return its id.
+
+        ``taken_at`` defaults to the modification time of the export. An
+        export that is already stored is not added twice.
+        """
+        fingerprint = source_fingerprint(csv_path)
+        with self._connect() as db:
+            stored = db.execute("SELECT id FROM snapshots WHERE fingerprint = ?", (fingerprint,)).fetchone()
+        if stored:
+            return stored[0]
+
+        taken_at = taken_at or datetime.datetime.fromtimestamp(os.path.getmtime(csv_path))
+        frame = read_typed(csv_path, 'keepa', columns).dropna(subset=['ASIN'])
+        frame = frame.sort_values(['ASIN', 'Locale'] if 'Locale' in frame else 'ASIN', ignore_index=True)
+        name = os.path.splitext(os.path.basename(csv_path))[0]
+        path = self._partition_path(taken_at, name)
+        pq.write_table(pa.Table.from_pandas(frame, preserve_index=False), path, row_group_size=ROW_GROUP_SIZE)
+
+        row_group = frame.index // ROW_GROUP_SIZE
+        asins = frame['ASIN'].groupby(row_group).agg(['first', 'last'])
+        with self._connect() as db:
+            snapshot_id = db.execute(
+                "INSERT INTO snapshots (taken_at, source, fingerprint, path, rows) VALUES (?, ?, ?, ?, ?)",
+                (taken_at.isoformat(timespec='seconds'), name, fingerprint, path, len(frame))).lastrowid
+            db.executemany("INSERT INTO row_groups VALUES (?, ?, ?, ?)",
+                           [(snapshot_id, int(group), first, last) for group, first, last in asins.itertuples()])
+            for column in GROUP_COLUMNS:
+                if column not in frame:
+                    continue
+                pairs = pd.DataFrame({'value': frame[column], 'row_group': row_group}).dropna().drop_duplicates()
+                db.executemany("INSERT INTO group_rows VALUES (?, ?, ?, ?)",
+                               [(column, str(value), snapshot_id, int(group))
+                                for value, group in pairs.itertuples(index=False)])
+        return snapshot_id
+
+    def _partition_path(self, taken_at, name):
+        """A partition path no other snapshot uses."""
+        directory = os.path.join(self.root, taken_at.strftime('%Y-%m-%d'))
+        os.makedirs(directory, exist_ok=True)
+        stem = f"{taken_at.strftime('%H%M%S')}_{name}"
+        for count in itertools.count():
+            path = os.path.join(directory, f"{stem}_{count}.parquet" if count else f"{stem}.parquet")
+            # Created exclusively, so two appends never claim the same path
+            try:
+                open(path, 'xb').close()
+            except FileExistsError:
+                continue
+            return path
+
+    def snapshots(self):
+        """Stored snapshots, oldest first."""
+        with self._connect() as db:
+            return pd.read_sql_query("SELECT * FROM snapshots ORDER BY taken_at, id", db, parse_dates=['taken_at'])
+
+    def _read(self, matches, columns, key, value):
+        """Rows where ``key == value`` from the (snapshot id, path, taken_at,
+        row group) ``matches``, one partition read per snapshot."""
+        frames = []
+        for (snapshot_id, path, taken_at), groups in matches.groupby(['snapshot_id', 'path', 'taken_at']):
+            handle = pq.ParquetFile(path)
+            wanted = [name for name in ['Locale', 'ASIN', key] + columns if name in handle.schema_arrow.names]
+            rows = handle.read_row_groups(sorted(groups['row_group'].unique()), columns=list(dict.fromkeys(wanted)))
+            rows = rows.to_pandas()
+            rows = rows[rows[key] == value]
+            frames.append(rows.assign(Snapshot=pd.Timestamp(taken_at)))
+        if not frames:
+            return pd.DataFrame(columns=['Snapshot', 'Locale', 'ASIN'] + columns)
+        return to_percent_points(pd.concat(frames, ignore_index=True))
+
+    def _latest(self, matches, last):
+        if last is None:
+            return matches
+        snapshots = matches.drop_duplicates('snapshot_id').sort_values('taken_at')['snapshot_id'].tail(last)
+        return matches[matches['snapshot_id'].isin(snapshots)]
+
+    def asin_history(self, asin, columns=HISTORY_COLUMNS, last=None):
+        """``columns`` of one ASIN in each of the ``last`` snapshots holding it."""
+        with self._connect() as db:
+            matches = pd.read_sql_query(
+                "SELECT r.snapshot_id, s.path, s.taken_at, r.row_group FROM row_groups r "
+                "JOIN snapshots s ON s.id = r.snapshot_id WHERE r.first_asin <= ? AND r.last_asin >= ?",
+                db, params=(asin, asin))
+        history = self._read(self._latest(matches, last), list(columns), 'ASIN', asin)
+        return history.sort_values(['Snapshot', 'Locale'], ignore_index=True)
+
+    def group_history(self, column, value, columns=HISTORY_COLUMNS, last=None):
+        """Mean of ``columns`` and the product count per snapshot and locale
+        for the rows where ``column`` (a ``GROUP_COLUMNS`` entry) is ``value``."""
+        with self._connect() as db:
+            matches = pd.read_sql_query(
+                "SELECT g.snapshot_id, s.path, s.taken_at, g.row_group FROM group_rows g "
+                "JOIN snapshots s ON s.id = g.snapshot_id WHERE g.column_name = ? AND g.value = ?",
+                db, params=(column, str(value)))
+        rows = self._read(self._latest(matches, last), list(columns), column, value)
+        grouped = rows.groupby(['Snapshot', 'Locale'], observed=True)
+        history = grouped[list(columns)].mean()
+        history.insert(0, 'Products', grouped.size())
+        return history.reset_index()
+
+    def brand_history(self, brand, columns=HISTORY_COLUMNS, last=None):
+        return self.group_history('Brand', brand, columns, last)
+
+    def category_history(self, category, columns=HISTORY_COLUMNS, last=None):
+        return self.group_history('Categories: Root', category, columns, last)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Store Keepa snapshots and query their history.")
+    parser.add_argument('--root', default=SNAPSHOT_ROOT, help=f"store directory (default: {SNAPSHOT_ROOT})")
+    commands = parser.add_subparsers(dest='command', required=True)
+    add = commands.add_parser('add', help="store Keepa exports as snapshots")
+    add.add_argument('keepa', nargs='+', help="raw Keepa export CSVs")
+    history = commands.add_parser('history', help="price and rank history")
+    history.add_argument('asin', nargs='?', help="ASIN to show")
+    history.add_argument('--brand', help="show a brand instead of an ASIN")
+    history.add_argument('--category', help="show a root category instead of an ASIN")
+    history.add_argument('--last', type=int, help="only the last N snapshots")
+    args = parser.parse_args(argv)
+
+    store = SnapshotStore(args.root)
+    if args.command == 'add':
+        for path in args.keepa:
+            print(f"{path} -> snapshot {store.append(path)}")
+    elif args.brand:
+        print(store.brand_history(args.brand, last=args.last).to_string(index=False))
+    elif args.category:
+        print(store.category_history(args.category, last=args.last).to_string(index=False))
+    elif args.asin:
+        print(store.asin_history(args.asin, last=args.last).to_string(index=False))
+    else:
+        parser.error("history needs an ASIN, --brand or --category")
+
+
+if __name__ == '__main__':
+    main()
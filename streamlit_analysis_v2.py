@@ -1,873 +1,1303 @@
-import streamlit as st
-import pandas as pd
-import plotly.express as px
-
-# combined_pricing_v1.csv
-
-# Load your data
-df = pd.read_csv(r"fragance_it_keepa.csv")
-df1 = pd.read_csv(r"combined_pricing_v1.csv")
-df.columns = [col.replace("🚚", "").strip() for col in df.columns]
-
-# Add Introduction
-st.markdown("""
-<h1>Brand and Category Performance Dashboard</h1>
-<p>Welcome to the Brand and Category Performance Dashboard. This tool provides an in-depth analysis of brand performance, pricing trends, and category popularity. This data dashboard is based on <b>Italy location.</b> Utilize this dashboard to gain valuable insights and refine your strategy.</p>
-""", unsafe_allow_html=True)
-
-# Sidebar header
-st.sidebar.title('Table of Contents')
-
-# Table of Contents list
-st.sidebar.markdown("""
-- **[Overview](#overview)**
-- **[Brand Performance](#brand-performance)**
-- **[Statistical Summary](#statistical-summary)**
-- **[Price Drop Analysis](#price-drop-analysis)**
-- **[Category Insights](#category-insights)**
-- **[Customer Reviews](#customer-reviews)**
-- **[Contact](#contact)**
-""")
-
-# Overview
-st.markdown("<a id='overview'></a><h2>1. Overview</h2>", unsafe_allow_html=True)
-st.markdown("""
-<p>This section provides an initial overview of the dataset, including key elements such as product identifiers, sales data, and pricing metrics. Understanding these fundamentals will help guide the subsequent analyses.</p>
-""", unsafe_allow_html=True)
-# Initial Observations
-st.markdown("""
-<p>We start by examining the key aspects of the data:</p>
-<ul>
-    <li><b>Product Identification:</b> Unique identifiers like ASIN, EAN, and PartNumber.</li>
-    <li><b>Product Details:</b> Product attributes such as Title, Brand, and Image.</li>
-    <li><b>Sales Data:</b> Sales ranks and their changes over time.</li>
-    <li><b>Pricing Data:</b> Current Buy Box prices and price changes over various periods.</li>
-    <li><b>Category:</b> Main, Sub, and Tree categories.</li>
-</ul>
-""", unsafe_allow_html=True)
-
-
-
-# Data Cleaning
-numeric_columns = [
-    'Sales Rank: 90 days avg.', 'Sales Rank: 30 days avg.',
-    'Buy Box : Current', 'Buy Box : 90 days avg.',
-    'Buy Box : 1 day drop %', 'Buy Box : 7 days drop %',
-    'Buy Box : 30 days drop %', 'Buy Box : 90 days drop %',
-    'Referral Fee %', 'Item: Dimension (cm³)', 'Item: Weight (g)'
-]
-
-# Remove non-numeric characters and convert to float
-for col in numeric_columns:
-    if col in df.columns:
-        df[col] = pd.to_numeric(df[col].replace('[^\d.]', '', regex=True), errors='coerce')
-
-data_cleaned = df.dropna(subset=['Brand'])
-
-# Brand Performance
-st.markdown("<a id='brand-performance'></a><h2>2. Brand Performance</h2>", unsafe_allow_html=True)
-
-# Top 10 Brands by Average Current Buy Box Price
-buy_box_column = 'Buy Box : Current'
-if buy_box_column not in data_cleaned.columns:
-    st.error(f"Column '{buy_box_column}' not found in the data.")
-else:
-    average_price_by_brand = data_cleaned.groupby('Brand')[buy_box_column].mean().sort_values(ascending=False).head(10)
-    average_price_by_brand_df = average_price_by_brand.reset_index()
-    average_price_by_brand_df.columns = ['Brand', 'Average Current Buy Box Price']
-    
-    st.header('Top 10 Brands by Average Current Buy Box Price')
-    fig = px.bar(average_price_by_brand_df, x='Brand', y='Average Current Buy Box Price', 
-                 title='Top 10 Brands by Average Current Buy Box Price',
-                 labels={'Average Current Buy Box Price': 'Average Current Buy Box Price (€)'})
-    st.plotly_chart(fig, use_container_width=True)
-
-# Premium and Luxury Branding
-st.subheader("Premium and Luxury Branding")
-st.write(
-    "**Brands:** La Mer (€239.43), Penhaligon's (€212.29), La Prairie (€144.00)"
-)
-st.write(
-    "**Insight:** These brands have the highest average prices, indicating a strong premium market position. "
-    "They cater to customers seeking luxury and exclusivity."
-)
-st.write(
-    "**Strategy:** Maintain premium pricing to reinforce brand prestige. Consider exclusive promotions or limited editions to enhance their luxury appeal."
-)
-
-# Competitive Mid-Range Pricing
-st.subheader("Competitive Mid-Range Pricing")
-st.write(
-    "**Brands:** Loewe (€96.51), Tom Ford (€90.83), Helena Rubinstein (€85.90), Guerlain (€74.91)"
-)
-st.write(
-    "**Insight:** These brands are priced in the mid-range, balancing premium features with accessibility. They attract a wide customer base by offering a mix of quality and value."
-)
-st.write(
-    "**Strategy:** Utilize competitive pricing to appeal to a broad audience. Differentiate through superior product quality and brand experience."
-)
-
-# Value-Oriented Pricing
-st.subheader("Value-Oriented Pricing")
-st.write(
-    "**Brands:** BVLGARI (€72.70), Chanel (€65.90), Tiffany (€63.70)"
-)
-st.write(
-    "**Insight:** Positioned as value-oriented but still aspirational, these brands offer quality at more accessible prices. They target consumers looking for premium features without the highest price tag."
-)
-st.write(
-    "**Strategy:** Highlight the quality and heritage of these brands in marketing. Ensure pricing reflects the value proposition and remains competitive in the market."
-)
-
-# Price Range Dynamics
-st.subheader("Price Range Dynamics")
-st.write(
-    "**Range:** €63.70 (Tiffany) to €239.43 (La Mer)"
-)
-st.write(
-    "**Insight:** The broad price range reflects a diverse market with varying customer segments. High-priced brands cater to luxury consumers, while lower-priced brands appeal to those seeking value."
-)
-st.write(
-    "**Strategy:** Develop tailored pricing strategies for different segments. Focus on exclusivity for higher-priced brands and emphasize value for more accessible options."
-)
-
-# Summary
-st.subheader("Summary")
-st.write(
-    "1. **Premium Brands:** Reinforce luxury positioning with high prices and exclusive offers."
-)
-st.write(
-    "2. **Mid-Range Brands:** Attract a wider audience with competitive pricing and high quality."
-)
-st.write(
-    "3. **Value Brands:** Offer accessible luxury with a focus on quality and brand heritage."
-)
-st.write(
-    "4. **Overall:** Regularly review and adjust pricing to align with market dynamics and maintain optimal positioning."
-)
-
-
-# Top 10 Brands by Average Sales Rank (90 days avg.)
-top_brands_sales_rank = data_cleaned.groupby('Brand')['Sales Rank: 90 days avg.'].mean().sort_values().head(10)
-top_brands_sales_rank = top_brands_sales_rank.round(2)
-top_brands_sales_rank_df = top_brands_sales_rank.reset_index()
-top_brands_sales_rank_df.columns = ['Brand', 'Avg. Sales Rank (90 days avg.)']
-
-st.header('Top 10 Brands by Average Sales Rank (90 days avg.)')
-fig = px.bar(top_brands_sales_rank_df, x='Brand', y='Avg. Sales Rank (90 days avg.)', 
-             title='Top 10 Brands by Average Sales Rank (90 days avg.)',
-             labels={'Avg. Sales Rank (90 days avg.)': 'Average Sales Rank (90 days avg.)'})
-st.plotly_chart(fig, use_container_width=True)
-
-# Sales Rank Insights
-st.subheader("Sales Rank Insights")
-
-# High Sales Performance
-st.write("### High Sales Performance")
-st.write(
-    "**Top Performers:** BVLGARI (€53,700.50), Valentino (€41,021.50), Prada (€24,965.33)"
-)
-st.write(
-    "**Insight:** These brands have the lowest average sales ranks, indicating they are top performers with strong sales and high customer engagement."
-)
-st.write(
-    "**Strategy:** Maintain and build on successful sales strategies. Explore expanding product lines and increasing marketing efforts to sustain or enhance market dominance."
-)
-
-# Mid-Range Sales Performance
-st.write("### Mid-Range Sales Performance")
-st.write(
-    "**Brands:** Guerlain (€76,867.50), GIORGIO ARMANI (€75,474.50), Tiffany (€69,457.00)"
-)
-st.write(
-    "**Insight:** These brands have moderate sales ranks, showing competitive performance but facing more competition."
-)
-st.write(
-    "**Strategy:** Analyze the competitive landscape and identify ways to improve sales ranks. Enhance product differentiation and customer engagement to strengthen market position."
-)
-
-# Lower Sales Performance
-st.write("### Lower Sales Performance")
-st.write(
-    "**Brands:** Carolina Herrera (€107,276.00), PETZL (€97,427.50), Versace (€87,774.50), Tom Ford (€86,000.20)"
-)
-st.write(
-    "**Insight:** These brands have higher average sales ranks, suggesting weaker performance compared to others."
-)
-st.write(
-    "**Strategy:** Investigate the causes of lower sales. Implement targeted marketing, improve product offerings, adjust pricing, and consider promotions to boost visibility and sales."
-)
-
-# Summary of Recommendations
-st.write("### Summary of Recommendations")
-st.write(
-    "1. **Leverage High Performance:** For top-performing brands, continue optimizing successful strategies and explore expansion opportunities."
-)
-st.write(
-    "2. **Enhance Competitive Positioning:** For mid-range brands, focus on improving strategies and customer engagement to gain a competitive edge."
-)
-st.write(
-    "3. **Address Sales Challenges:** For lower-performing brands, identify areas for improvement and implement targeted actions to enhance sales and visibility. Regularly monitor and adjust strategies as needed."
-)
-
-# Statistical Summary
-st.markdown("<a id='statistical-summary'></a><h2>4. Statistical Summary</h2>", unsafe_allow_html=True)
-
-# Calculate Summary Statistics
-def calculate_summary_statistics(series):
-    return {
-        'Min': series.min(),
-        'Q1': series.quantile(0.25),
-        'Median': series.median(),
-        'Q3': series.quantile(0.75),
-        'Max': series.max(),
-        'Mean': series.mean(),
-        'Mode': series.mode()[0] if not series.mode().empty else None,
-        'Variance': series.var(),
-        'Standard Deviation': series.std()
-    }
-
-# Apply the calculation for each column
-summary_stats = {}
-for col in numeric_columns:
-    if col in data_cleaned.columns:
-        summary_stats[col] = calculate_summary_statistics(data_cleaned[col].dropna())
-
-# Create DataFrame for summary stats
-stats_df = pd.DataFrame(summary_stats).T
-stats_df.columns = ['Min', 'Q1', 'Median', 'Q3', 'Max', 'Mean', 'Mode', 'Variance', 'Standard Deviation']
-
-# Display the statistical summary
-st.write("### Detailed Statistical Summary of Key Metrics:")
-# st.dataframe(stats_df)
-
-# # Optional: Format numbers for better readability
-# st.write("### Formatted Statistical Summary:")
-stats_df_formatted = stats_df.applymap(lambda x: f"{x:,.2f}" if isinstance(x, (int, float)) else x)
-st.dataframe(stats_df_formatted)
-
-# Business Insights
-st.markdown("<h2>Business Insights</h2>", unsafe_allow_html=True)
-
-# Section: Buy Box Price Drops
-# Sales Insights
-st.header("Sales Insights")
-
-# 1. Buy Box Price Drops
-st.subheader("1. Buy Box Price Drops")
-st.write(
-    "**Short-Term Drops:** Median percentage drops are 0.00% for 1 day, 7 days, and 30 days, rising to 3.00% for 90 days. Maximum recorded drop is 26.00%."
-)
-st.write(
-    "**Implication:** Minor daily or weekly fluctuations are typical, but substantial drops over longer periods may indicate seasonal sales or inventory clearances. Regular monitoring and price adjustments can help optimize profitability and stay competitive."
-)
-
-# 2. Referral Fee %
-st.subheader("2. Referral Fee %")
-st.write(
-    "**Consistency:** Median referral fee percentage is 15.45%, with a maximum of 15.46%."
-)
-st.write(
-    "**Implication:** The stable referral fee allows for predictable cost planning. Ensure product pricing accounts for this fee while staying competitive."
-)
-
-# 3. Buy Box Prices
-st.subheader("3. Buy Box Prices")
-st.write(
-    "**Current Prices:** Median Buy Box price is €47.63, ranging up to €299.00."
-)
-st.write(
-    "**Historical Trends:** Prices have remained stable over 30 and 90 days, indicating steady pricing trends."
-)
-st.write(
-    "**Implication:** Compare current prices to historical averages to guide pricing adjustments. Competitive pricing enhances visibility and sales."
-)
-
-# 4. Sales Rank
-st.subheader("4. Sales Rank")
-st.write(
-    "**Trends:** Median sales rank is 85,315 for 30 days and 132,678 for 90 days, with significant variability."
-)
-st.write(
-    "**Implication:** Target products with improving sales ranks for promotional strategies. For products with lower ranks, analyze performance factors and adjust marketing strategies."
-)
-
-# Summary of Recommendations
-st.subheader("Summary of Recommendations")
-st.write(
-    "1. **Price Management:** Regularly review and adjust pricing based on observed drops and historical trends."
-)
-st.write(
-    "2. **Cost Management:** Factor in the stable referral fee percentage to ensure costs are covered while maintaining competitiveness."
-)
-st.write(
-    "3. **Performance Monitoring:** Use sales rank data to identify and promote high-performing products. Adjust strategies for products with lower sales ranks."
-)
-st.write(
-    "4. **Logistics Optimization:** Adapt logistics and inventory management to efficiently handle diverse product dimensions and weights."
-)
-
-
-
-
-# Price Drop Analysis
-st.markdown("<a id='price-drop-analysis'></a><h2>5. Price Drop Analysis</h2>", unsafe_allow_html=True)
-
-top_brands_price_drop = data_cleaned.groupby('Brand')['Buy Box : 30 days drop %'].mean().sort_values(ascending=False)
-top_brands_price_drop = top_brands_price_drop.round(2)
-top_brands_price_drop_df = top_brands_price_drop.reset_index()
-top_brands_price_drop_df.columns = ['Brand', 'Average Price Drop (30 days)']
-
-st.subheader('Top 10 Brands by Average Price Drop (30 days)')
-fig = px.bar(top_brands_price_drop_df, x='Brand', y='Average Price Drop (30 days)', 
-             title='Top 10 Brands by Average Price Drop (30 days)',
-             labels={'Average Price Drop (30 days)': 'Average Price Drop (30 days) (%)'})
-st.plotly_chart(fig, use_container_width=True)
-
-# Average Price Drop Insights (30 Days)
-st.header("Average Price Drop Insights (30 Days)")
-
-# No Price Drop
-st.subheader("No Price Drop")
-st.write(
-    "**Brands:** La Prairie, GIORGIO ARMANI, La Mer, ON"
-)
-st.write(
-    "**Insight:** These brands have not experienced any average price drop in the past 30 days, reflecting stable pricing strategies and strong market positioning."
-)
-st.write(
-    "**Actionable Strategy:** Continue maintaining stable prices to uphold brand value and customer trust. Stay vigilant for any market changes that might require price adjustments."
-)
-
-# Low Price Drop
-st.subheader("Low Price Drop")
-st.write(
-    "**Brands:** Prada (0.33%), Valentino (0.75%), Tiffany (1.00%), Penhaligon's (1.00%), Loewe (1.00%)"
-)
-st.write(
-    "**Insight:** These brands show minimal price drops, indicating cautious pricing adjustments and stable market positioning."
-)
-st.write(
-    "**Actionable Strategy:** Monitor market trends and competitive pricing closely. Implement incremental price adjustments if necessary to remain competitive while preserving brand value."
-)
-
-# Moderate Price Drop
-st.subheader("Moderate Price Drop")
-st.write(
-    "**Brands:** Dior (1.33%), Chanel (1.90%), PETZL (2.00%), ZWILLING (2.00%), Helena Rubinstein (2.00%), Guerlain (2.00%), Biotherm (2.00%)"
-)
-st.write(
-    "**Insight:** These brands have experienced moderate price drops, possibly in response to market pressures or inventory management."
-)
-st.write(
-    "**Actionable Strategy:** Investigate the reasons for these moderate drops and adjust pricing strategies to balance competitiveness with profitability. Address any market dynamics affecting pricing."
-)
-
-# Significant Price Drop
-st.subheader("Significant Price Drop")
-st.write(
-    "**Brands:** Carolina Herrera (3.00%), Tom Ford (5.20%), Versace (7.50%), BVLGARI (8.50%)"
-)
-st.write(
-    "**Insight:** Significant price drops may indicate aggressive pricing strategies, inventory clearance, or competitive responses."
-)
-st.write(
-    "**Actionable Strategy:** Review pricing strategies to understand the causes of substantial drops. Evaluate inventory levels, market competition, and consumer demand to optimize pricing effectively."
-)
-
-# Summary of Recommendations
-st.subheader("Summary of Recommendations")
-st.write(
-    "1. **Maintain Stability:** For brands with no price drop, continue to monitor the market to ensure prices align with market conditions and brand positioning."
-)
-st.write(
-    "2. **Monitor and Adjust Incrementally:** For brands with low price drops, make small adjustments as needed while focusing on maintaining brand value and competitive positioning."
-)
-st.write(
-    "3. **Analyze and Adapt Moderately:** For brands with moderate price drops, analyze market trends and adjust pricing strategies to ensure competitiveness while managing profitability."
-)
-st.write(
-    "4. **Strategic Review for Significant Drops:** For brands with significant price drops, conduct a thorough review of pricing strategies and market dynamics to address underlying issues and optimize pricing."
-)
-
-
-
-# Category Insights
-st.markdown("<a id='category-insights'></a><h2>6. Category Insights</h2>", unsafe_allow_html=True)
-
-# Pie chart for Root Categories
-popular_categories_root = data_cleaned['Categories: Root'].value_counts().head(10)
-popular_categories_root_df = popular_categories_root.reset_index()
-popular_categories_root_df.columns = ['Category', 'Count']
-
-fig_root = px.pie(popular_categories_root_df, names='Category', values='Count', title='Top 10 Popular Root Categories')
-st.plotly_chart(fig_root, use_container_width=True)
-
-# Pie chart for Subcategories
-popular_categories_sub = data_cleaned['Categories: Sub'].value_counts().head(10)
-popular_categories_sub_df = popular_categories_sub.reset_index()
-popular_categories_sub_df.columns = ['Subcategory', 'Count']
-
-fig_sub = px.pie(popular_categories_sub_df, names='Subcategory', values='Count', title='Top 10 Popular Subcategories')
-st.plotly_chart(fig_sub, use_container_width=True)
-
-# Calculate category-wise sales performance
-category_sales_performance = data_cleaned.groupby('Categories: Root')['Sales Rank: 90 days avg.'].mean().sort_values(ascending=False)
-
-# Round to two decimal places and format as currency
-category_sales_performance = category_sales_performance.round(2).apply(lambda x: f'€{x:.2f}')
-
-# Convert Series to DataFrame
-category_sales_performance_df = category_sales_performance.reset_index()
-category_sales_performance_df.columns = ['Main Category', 'Avg. Sales Rank (90 days avg.)']
-
-# Streamlit app
-st.title('Category-Wise Sales Performance')
-
-# Display the data frame
-# st.write("### Average Sales Rank by Category")
-# st.dataframe(category_sales_performance_df)
-
-# Plotly chart
-fig = px.bar(
-    category_sales_performance_df,
-    x='Main Category',
-    y='Avg. Sales Rank (90 days avg.)',
-    title='Average Sales Rank by Category',
-    labels={'Avg. Sales Rank (90 days avg.)': 'Average Sales Rank (€)'},
-    text='Avg. Sales Rank (90 days avg.)',
-    color='Avg. Sales Rank (90 days avg.)',
-    color_continuous_scale=px.colors.sequential.Plasma
-)
-
-fig.update_layout(
-    xaxis_title='Main Category',
-    yaxis_title='Average Sales Rank (€)',
-    xaxis_tickangle=-45,
-    width=800,
-    height=600
-)
-
-# Display the plot
-st.plotly_chart(fig, use_container_width=True)
-
-# High Sales Volume Categories
-st.header("Sales Insights by Category")
-
-st.subheader("High Sales Volume Categories")
-
-# Casa e Cucina
-st.write(
-    "**Casa e Cucina (€453,215.00)**"
-)
-st.write(
-    "**Insight:** This category exhibits the highest average sales volume, reflecting significant consumer demand and market success in home and kitchen products. The substantial revenue indicates that products in this category are performing exceptionally well."
-)
-st.write(
-    "**Actionable Strategy:** To capitalize on this strong performance, focus on amplifying marketing efforts and increasing inventory in this category. Explore opportunities to introduce new or premium products to sustain and further enhance sales."
-)
-
-# Giochi e Giocattoli
-st.write(
-    "**Giochi e Giocattoli (€422,243.00)**"
-)
-st.write(
-    "**Insight:** Toys and games also show a high sales volume, indicating robust consumer interest and a substantial revenue contribution. The strong performance suggests that this category is a major revenue driver."
-)
-st.write(
-    "**Actionable Strategy:** Leverage seasonal trends with targeted promotions and marketing campaigns. Stay updated with the latest trends in toys and games to maintain a competitive edge and maximize revenue."
-)
-
-st.subheader("Moderate Sales Volume Categories")
-
-# Moda
-st.write(
-    "**Moda (€105,114.50)**"
-)
-st.write(
-    "**Insight:** Fashion products show a moderate sales volume, indicating steady performance but not as strong as the top categories. This suggests consistent consumer interest but with potential for growth."
-)
-st.write(
-    "**Actionable Strategy:** Enhance sales through collaborations with fashion influencers and by offering limited-time promotions. Focus on popular and trending fashion items to boost market presence."
-)
-
-# Bellezza
-st.write(
-    "**Bellezza (€90,656.90)**"
-)
-st.write(
-    "**Insight:** Beauty products have a solid sales volume, indicating healthy demand, though not as high as the leading categories. This reflects a steady but not dominant position in the market."
-)
-st.write(
-    "**Actionable Strategy:** Increase marketing efforts and expand the product line to include new trends in beauty. Develop customer loyalty programs and encourage product reviews to drive additional sales."
-)
-
-# Salute e Cura della Persona
-st.write(
-    "**Salute e Cura della Persona (€88,738.00)**"
-)
-st.write(
-    "**Insight:** Health and personal care products have a good sales volume, showing strong consumer interest in health-related items. This suggests that the category is performing well but could benefit from further strategic focus."
-)
-st.write(
-    "**Actionable Strategy:** Strengthen partnerships with health influencers and focus on educating consumers about the benefits of the products. Consider bundling items or creating special offers to attract more customers."
-)
-
-# Sport e Tempo Libero
-st.write(
-    "**Sport e Tempo Libero (€64,951.67)**"
-)
-st.write(
-    "**Insight:** Sports and leisure products demonstrate a moderate sales volume, indicating steady performance but lower compared to top categories. This suggests a stable market presence with room for growth."
-)
-st.write(
-    "**Actionable Strategy:** Capitalize on seasonal trends and major sports events to promote products. Enhance visibility through targeted promotions to boost sales in this category."
-)
-
-st.subheader("Low Sales Volume Categories")
-
-# Alimentari e Cura della Casa
-st.write(
-    "**Alimentari e Cura della Casa (€0.00)**"
-)
-st.write(
-    "**Insight:** This category shows zero sales, which could indicate a lack of market presence or insufficient consumer interest. The absence of sales suggests a significant issue that needs addressing."
-)
-st.write(
-    "**Actionable Strategy:** Investigate the underlying reasons for zero sales. Consider introducing new products or revising the marketing strategy. Analyze consumer demand and adjust the product offerings to better meet market needs."
-)
-
-# Cancelleria e Prodotti per Ufficio
-st.write(
-    "**Cancelleria e Prodotti per Ufficio (€0.00)**"
-)
-st.write(
-    "**Insight:** Similar to the food and home care category, this category also reports zero sales, potentially due to market fit issues or inadequate product availability."
-)
-st.write(
-    "**Actionable Strategy:** Review the current product lineup and assess market needs. Explore new product options or improve the visibility and accessibility of office supplies to increase sales."
-)
-
-
-# # Define the business insights
-# insights = {
-#     "High Sales Volume Categories": {
-#         "Casa e Cucina (€453,215.00)": {
-#             "Insight": "This category has the highest average sales rank, indicating it generates the most significant sales volume among the categories. This suggests a strong market demand for home and kitchen products.",
-#             "Actionable Strategy": "Focus marketing efforts and inventory investment in this category. Explore opportunities to introduce new products or premium options to leverage the high sales volume."
-#         },
-#         "Giochi e Giocattoli (€422,243.00)": {
-#             "Insight": "Toys and games also show a high average sales rank, reflecting robust consumer interest. The high sales rank suggests a significant portion of revenue comes from this category.",
-#             "Actionable Strategy": "Consider seasonal promotions and targeted marketing campaigns to capitalize on trends and maximize revenue from this category. Evaluate popular trends in toys and games to stay competitive."
-#         }
-#     },
-#     "Moderate Sales Volume Categories": {
-#         "Moda (€105,114.50)": {
-#             "Insight": "The fashion category shows a moderate average sales rank, indicating a steady but not exceptional sales volume compared to the top categories.",
-#             "Actionable Strategy": "Develop strategies to boost sales, such as collaborations with influencers or limited-time offers. Enhance product selection and focus on trending fashion items."
-#         },
-#         "Bellezza (€90,656.90)": {
-#             "Insight": "Beauty products have a solid average sales rank, indicating a healthy demand. This category is important but not as dominant as the top two categories.",
-#             "Actionable Strategy": "Increase marketing efforts and consider expanding the product line to include new beauty trends. Focus on customer loyalty programs and product reviews to drive sales."
-#         },
-#         "Salute e Cura della Persona (€88,738.00)": {
-#             "Insight": "Health and personal care products show a good sales rank, reflecting consumer interest in health-related products.",
-#             "Actionable Strategy": "Strengthen partnerships with health influencers and focus on product education. Consider bundling products or creating special offers to attract more customers."
-#         },
-#         "Sport e Tempo Libero (€64,951.67)": {
-#             "Insight": "Sports and leisure products have a moderate sales rank, suggesting steady but lower sales compared to the top categories.",
-#             "Actionable Strategy": "Leverage seasonal trends and promote products around major sports events or recreational activities. Enhance product visibility and consider promotions to boost sales."
-#         }
-#     },
-#     "Low Sales Volume Categories": {
-#         "Alimentari e Cura della Casa (€0.00)": {
-#             "Insight": "This category shows zero sales, which could indicate a lack of product presence or low consumer demand.",
-#             "Actionable Strategy": "Investigate the reasons for the lack of sales. Consider introducing new products or enhancing the marketing strategy for this category. Evaluate consumer demand and adjust product offerings accordingly."
-#         },
-#         "Cancelleria e Prodotti per Ufficio (€0.00)": {
-#             "Insight": "Similar to the food and home care category, this category also has zero sales, indicating potential issues with market fit or product availability.",
-#             "Actionable Strategy": "Assess the current product lineup and market needs. Consider exploring new product options or improving the visibility and accessibility of office supplies."
-#         }
-#     }
-# }
-
-# # Create a Streamlit app
-# st.title('Business Insights Based on Sales Performance')
-
-# # Display insights
-# for category, details in insights.items():
-#     st.subheader(category)
-#     for item, info in details.items():
-#         st.write(f"**{item}**")
-#         st.write(f"**Insight:** {info['Insight']}")
-#         st.write(f"**Actionable Strategy:** {info['Actionable Strategy']}")
-#         st.write("")  # Add a blank line for readability
-
-
-# Customer Reviews
-st.markdown("<a id='customer-reviews'></a><h2>6. Customer Reviews and Price Impact</h2>", unsafe_allow_html=True)
-# st.write("Content for Customer Reviews and Price Impact Analysis goes here.")
-# Customer Reviews Analysis
-# st.title('Customer reviews Analysis and Price Impact Analysis')
-
-# Header
-st.header('Product Price Analysis by Rating')
-
-# Ensure price and rating columns are cleaned and converted to numeric
-df1['price'] = df1['price'].astype(str).str.replace('[€,$,]', '', regex=True).replace('nan', pd.NA)
-df1['rating'] = pd.to_numeric(df1['rating'], errors='coerce')
-df1['price'] = pd.to_numeric(df1['price'], errors='coerce')
-
-# Plotting
-price_distribution_by_rating = px.box(
-    df1,
-    x='rating',
-    y='price',
-    title='Price Distribution by Rating',
-    labels={'price': 'Price (€)', 'rating': 'Rating'}
-)
-
-# Increase figure size for better readability
-price_distribution_by_rating.update_layout(
-    width=1000,  # Width in pixels
-    height=600   # Height in pixels
-)
-
-# Display the plot in Streamlit
-st.plotly_chart(price_distribution_by_rating)
-
-# Detailed Breakdown
-st.header('Detailed Breakdown:')
-
-# Rating 3.5
-st.subheader('Rating 3.5:')
-st.markdown("""
-- **Count**: 45 products
-- **Mean Price**: $58.99
-- **Median Price**: $56.90
-- **Standard Deviation**: $13.84
-- **Min Price**: $34.50
-- **Max Price**: $90.99
-- **Q1 (25th Percentile)**: $49.20
-- **Q3 (75th Percentile)**: $66.60
-
-**Interpretation**: Products with a rating of 3.5 are less expensive with a narrower price range and lower variability compared to higher ratings.
-""")
-
-# Rating 4.0
-st.subheader('Rating 4.0:')
-st.markdown("""
-- **Count**: 433 products
-- **Mean Price**: $74.81
-- **Median Price**: $47.90
-- **Standard Deviation**: $62.75
-- **Min Price**: $11.85
-- **Max Price**: $386.37
-- **Q1 (25th Percentile)**: $38.40
-- **Q3 (75th Percentile)**: $85.99
-
-**Interpretation**: For a rating of 4.0, prices have a wide range and high variability. The median is lower, indicating a significant number of lower-priced products despite the higher mean price.
-""")
-
-# Rating 4.5
-st.subheader('Rating 4.5:')
-st.markdown("""
-- **Count**: 32,659 products
-- **Mean Price**: $81.68
-- **Median Price**: $71.00
-- **Standard Deviation**: $53.12
-- **Min Price**: $0.90
-- **Max Price**: $1076.14
-- **Q1 (25th Percentile)**: $48.40
-- **Q3 (75th Percentile)**: $99.46
-
-**Interpretation**: Products with a rating of 4.5 are the most numerous and have a broad price range. The median and quartiles are high, indicating a shift to higher prices, with significant variability.
-""")
-
-# Rating 5.0
-st.subheader('Rating 5.0:')
-st.markdown("""
-- **Count**: 8,440 products
-- **Mean Price**: $98.58
-- **Median Price**: $79.51
-- **Standard Deviation**: $74.14
-- **Min Price**: $8.93
-- **Max Price**: $907.50
-- **Q1 (25th Percentile)**: $54.05
-- **Q3 (75th Percentile)**: $114.99
-
-**Interpretation**: Products with a perfect rating of 5.0 have the highest mean and median prices. The price range is extensive with the highest variability, showing that while these products are expensive on average, there is considerable variability in prices.
-""")
-
-# Summary
-st.header('Summary:')
-st.markdown("""
-- **Higher Ratings**: Generally correspond with higher average and median prices, with a wider range and increased variability.
-- **Price Range**: Expands with higher ratings, indicating that high-rated products can vary significantly in price.
-- **Quartiles**: Both the first and third quartiles increase with ratings, indicating that higher-rated products are more likely to have higher prices.
-""")
-
-
-# Calculate the correlation between price and rating
-correlation_price_rating = df1['price'].corr(df1['rating'])
-
-# Display the results
-st.title('Correlation Analysis')
-
-# Display Correlation Result
-st.write("Correlation Between Price and Rating:", correlation_price_rating)
-
-# Display Interpretation
-st.markdown("""
-### Interpretation:
-
-0.117 indicates a weak positive correlation between price and rating. This means that as the price increases, the rating tends to slightly increase as well. However, since the value is close to 0, the relationship is very weak and might not be practically significant. In other words, price does not have a strong impact on the ratings of the products in your dataset.
-""")
-
-
-
-# Calculate the correlation between the number of reviews and rating
-correlation_reviews_rating = df1['number_of_reviews'].corr(df1['rating'])
-
-# Display the results
-# st.title('Correlation Analysis')
-
-# Display Correlation Result
-st.write("Correlation Between Number of Reviews and Rating:", correlation_reviews_rating)
-
-# Display Interpretation
-st.markdown("""
-### Interpretation:
-
--0.128 indicates a weak negative correlation between the number of reviews and rating. This means that as the number of reviews increases, the rating tends to slightly decrease. Again, since the value is close to 0, this relationship is very weak and might not be practically significant. This suggests that the number of reviews is not strongly related to the ratings, but there is a slight tendency for products with more reviews to have slightly lower ratings.
-""")
-
-st.header('Source Analysis')
-
-st.write(
-    "The source of the data represents the website or platform from which the data was collected. "
-    "Here, `es` stands for Spanish and `fr` stands for French."
-)
-
-# Calculate price variation by source
-price_variation_by_source = px.box(
-    df1,
-    x='source',
-    y='price',
-    title='Price Variation by Source',
-    labels={'price': 'Price ($)', 'source': 'Source'}
-)
-
-# Streamlit title and plot
-st.header('Price Variation Analysis Across Different Sources')
-st.plotly_chart(price_variation_by_source)
-
-# Interpretation
-st.markdown("""
-### Interpretation:
-
-#### 1. Average Price:
-- **es**: The average price of products from the es source is $80.44.
-- **fr**: The average price of products from the fr source is higher at $90.28.
-
-**Implication:** On average, products from the fr source are more expensive than those from the es source.
-
-#### 2. Minimum Price:
-- **es**: The minimum price of a product from the es source is $6.34.
-- **fr**: The minimum price of a product from the fr source is significantly lower at $0.90.
-
-**Implication:** The fr source offers some products at very low prices, indicating a wider range of product prices compared to the es source.
-
-#### 3. Maximum Price:
-- **es**: The maximum price of a product from the es source is $1065.86.
-- **fr**: The maximum price of a product from the fr source is slightly higher at $1076.14.
-
-**Implication:** Both sources offer high-priced items, but the fr source has a slightly higher maximum price, reinforcing the observation that fr has a broader price range.
-
-#### 4. Average Rating:
-- **es**: The average rating of products from the es source is 4.594725.
-- **fr**: The average rating of products from the fr source is very close, at 4.595767.
-
-**Implication:** Both sources have very high average ratings, indicating that customers are generally very satisfied with products from both sources. The difference in average ratings is negligible.
+import math
+import os
+import sqlite3
 
-#### 5. Total Number of Reviews:
-- **es**: Products from the es source have a total of 69,282,983 reviews.
-- **fr**: Products from the fr source have a total of 61,063,745 reviews.
-
-**Implication:** The es source has received more reviews overall compared to the fr source. This could indicate higher sales volume or a larger customer base for the es source.
-
-### Overall Implications:
-- **Pricing:** The fr source has a broader price range, offering both very low-priced and high-priced products, while the es source has a narrower range with slightly lower average prices.
-- **Customer Satisfaction:** Both sources have very high and similar average ratings, suggesting high customer satisfaction across the board.
-- **Review Volume:** The es source has a higher total number of reviews, which might reflect higher engagement or a larger market presence compared to the fr source.
-""")
-
-# Calculate rating comparison by source
-rating_comparison_by_source = px.box(
-    df1,
-    x='source',
-    y='rating',
-    title='Rating Comparison by Source',
-    labels={'rating': 'Rating', 'source': 'Source'}
-)
-
-# Streamlit title and plot
-st.header('Rating Comparison Analysis Across Different Sources')
-st.plotly_chart(rating_comparison_by_source)
-
-# Interpretation
-st.markdown("""
-### Interpretation:
-
-#### 1. Average Rating:
-- **es**: The average rating of products from the es source is 4.594725.
-- **fr**: The average rating of products from the fr source is slightly higher at 4.595767.
-
-**Implication:** Both sources have very high average ratings, indicating that customers are generally very satisfied with products from both sources. The difference in average ratings is negligible.
-
-#### 2. Minimum Rating:
-- **es**: The minimum rating of a product from the es source is 3.5.
-- **fr**: The minimum rating of a product from the fr source is also 3.5.
-
-**Implication:** Both sources have products that are rated at least 3.5, which indicates a relatively high baseline for product quality.
-
-#### 3. Maximum Rating:
-- **es**: The maximum rating of a product from the es source is 5.0.
-- **fr**: The maximum rating of a product from the fr source is also 5.0.
-
-**Implication:** Both sources have products that are rated the highest possible rating of 5.0, indicating top-rated products are present in both sources.
+import pandas as pd
+import streamlit as st
 
-#### 4. Standard Deviation of Ratings:
-- **es**: The standard deviation of ratings for the es source is 0.211010.
-- **fr**: The standard deviation of ratings for the fr source is slightly higher at 0.215286.
+from brand_metrics import ALL_LOCALES, LOCALE_COLUMN, brand_metrics, for_locale, top_n
+from anomalies import THRESHOLD, scan_anomalies
+from box_stats import MAX_OUTLIERS, box_stats
+from category_metrics import (RANK_COLUMN, ROOT_COLUMN, SUB_COLUMN, category_metrics, category_sales_rank,
+                              top_categories)
+from category_tree import CategoryTree
+from charts import (brand_bar, category_node_bar, category_pie, category_rank_bar, histogram_bar, history_line,
+                    locale_bar, precomputed_box, source_price_scatter, window_line)
+from data_loader import (DASHBOARD_COLUMNS, KEEPA_PATH, KEEPA_PATTERN, NUMERIC_COLUMNS, PRICING_PATH, SECTION_COLUMNS,
+                         anomaly_column, file_fingerprint, keepa_paths, memory_report, read_keepa_exports, read_parse_failures, read_pricing)
+from data_watcher import DataWatcher
+from filters import FilterIndex
+from identifiers import IDENTIFIER_COLUMNS, ProductIndex, cross_source_prices
+from incremental import KeepaAggregates
+from insights import (brand_price_tiers, category_rank_tiers, correlation_insight, price_drop_tiers, rating_breakdown,
+                      rating_summary, sales_rank_tiers, source_price_insights, source_rating_insights,
+                      summary_insights)
+from margins import MarginModel, margin_histogram
+from metric_families import aggregate_metrics, family_means, metric_families, select_families
+from pricing_stream import pricing_chunks, pricing_header, stream_pricing
+from profiling import Profiler, activate, span
+from shared_data import shared_frame
+from snapshot_store import HISTORY_COLUMNS, SnapshotStore
+from summary_stats import approximate_summary_statistics, summary_statistics
+
+# Combined pricing files above this size are streamed by default
+STREAMING_THRESHOLD_BYTES = 200 * 1024 * 1024
+
+
+# Parsed and cleaned data is cached across reruns and sessions; the file
+# fingerprint is part of the cache key, so an entry is only replaced when
+# the file on disk changes. The Keepa and pricing frames themselves are
+# memory-mapped from shared Arrow files (see ``shared_data``): one read-only
+# frame per process, its numeric columns shared by all processes on the host.
+@st.cache_resource
+def snapshot_store():
+    return SnapshotStore()
+
+
+@st.cache_resource(max_entries=4, show_spinner="Loading Keepa exports...")
+def load_keepa(paths, fingerprints):
+    # The projection is part of the key: a section reading new columns gets a new shared file
+    data = shared_frame('keepa', (fingerprints, DASHBOARD_COLUMNS), lambda: read_keepa_exports(list(paths)))
+    # Every export version seen is kept as a dated snapshot for the Trends page
+    try:
+        for path in paths:
+            snapshot_store().append(path)
+    except (OSError, sqlite3.Error):
+        pass  # read-only or locked store: no history is recorded
+    return data
+
+
+# The anomaly signals (every drop, lowest-price and stock-out window) are
+# only read by the Price Drop Analysis page, into a shared frame of their own
+# with the same rows as ``load_keepa``, so the filter masks apply to it
+@st.cache_resource(max_entries=4, show_spinner="Loading price signals...")
+def load_signals(paths, fingerprints):
+    return shared_frame('keepa-signals', (fingerprints, SECTION_COLUMNS['anomalies']),
+                        lambda: read_keepa_exports(list(paths), anomaly_column))
+
+
+# Per-value row masks of the sidebar filters, built once per data version;
+# a filter change only combines masks (see ``filters``)
+@st.cache_resource(max_entries=4, show_spinner="Indexing filters...")
+def load_filter_index(paths, fingerprints):
+    return FilterIndex(load_keepa(paths, fingerprints))
+
+
+# The tree is indexed once per data version, marketplace and filter
+# selection; drilling down only looks nodes up
+@st.cache_resource(max_entries=8, show_spinner="Indexing the category tree...")
+def load_category_tree(paths, fingerprints, locale, selection=()):
+    return CategoryTree(filtered_rows(paths, fingerprints, selection, locale))
+
+
+# The identifier index and the Keepa/pricing join are built once per data
+# version and shared by every section
+@st.cache_resource(max_entries=4, show_spinner="Indexing product identifiers...")
+def load_product_index(paths, fingerprints):
+    return ProductIndex(load_keepa(paths, fingerprints))
+
+
+# Fee inputs and per-brand sums are prepared once per data version and filter
+# selection; a what-if scenario only recomputes from them (see ``margins``)
+@st.cache_resource(max_entries=8, show_spinner="Preparing the margin model...")
+def load_margin_model(paths, fingerprints, selection=()):
+    return MarginModel(filtered_rows(paths, fingerprints, selection))
+
+
+@st.cache_data(max_entries=4, show_spinner="Joining Keepa and combined pricing data...")
+def load_cross_source_prices(paths, fingerprints, pricing_fingerprint, streaming):
+    if streaming:
+        chunks = pricing_chunks(PRICING_PATH, IDENTIFIER_COLUMNS + ['price', 'rating', 'source'])
+    else:
+        chunks = [load_pricing(PRICING_PATH, pricing_fingerprint)]
+    return cross_source_prices(load_product_index(paths, fingerprints), load_keepa(paths, fingerprints), chunks)
+
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def load_memory_report(paths, fingerprints):
+    return memory_report(load_keepa(paths, fingerprints))
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def load_history(kind, value, last, snapshot_count):
+    store = snapshot_store()
+    if kind == 'ASIN':
+        return store.asin_history(value, last=last)
+    if kind == 'Brand':
+        return store.brand_history(value, last=last)
+    return store.category_history(value, last=last)
+
+
+@st.cache_resource(max_entries=4, show_spinner="Loading combined pricing data...")
+def load_pricing(path, fingerprint):
+    return shared_frame('pricing', fingerprint, lambda: read_pricing(path))
+
+
+# Brand, category and approximate summary aggregates of the latest snapshot,
+# shared by all sessions. A new snapshot of the exports only feeds the rows
+# that were added, removed or changed into them (see ``incremental``).
+@st.cache_resource
+def keepa_aggregates(paths):
+    return KeepaAggregates(NUMERIC_COLUMNS)
 
-**Implication:** The standard deviation measures the amount of variation or dispersion in the ratings. Both sources have low standard deviations, suggesting that the ratings are tightly clustered around the average. The slightly higher standard deviation for the fr source indicates a marginally wider spread in ratings, but the difference is minimal.
 
-### Overall Implications:
-- **Customer Satisfaction:** Both sources have very high average ratings, indicating strong customer satisfaction. The difference in average ratings is negligible, suggesting similar levels of customer satisfaction for products from both sources.
-- **Rating Consistency:** The minimum and maximum ratings are the same for both sources, indicating that the range of product ratings is similar. The low standard deviations indicate that most products are rated close to the average, with the fr source having a slightly wider variation in ratings.
-- **Quality Assurance:** Products from both sources maintain a high standard, with all products rated at least 3.5 and some achieving the perfect rating of 5.0. The consistency in high ratings reflects positively on the quality and reliability of products offered by both sources.
-""")
+def aggregate_table(paths, fingerprints, read):
+    """``read`` of the shared aggregates at this data version, taken under
+    their lock so that another session's refresh cannot slip in; None once
+    they have moved on to a newer version."""
+    return keepa_aggregates(paths).read(load_keepa(paths, fingerprints), fingerprints, read)
 
 
+# Brand and category tables hold every marketplace plus the ALL_LOCALES rollup.
+# Without filters they come from the incremental aggregates, with filters
+# they are computed from the selected rows.
+@st.cache_data(max_entries=16, show_spinner="Computing brand metrics...")
+def load_brand_metrics(paths, fingerprints, selection=()):
+    if not selection:
+        table = aggregate_table(paths, fingerprints, lambda aggregates: aggregates.brand_metrics(ALL_LOCALES))
+        if table is not None:
+            return table
+    return brand_metrics(filtered_rows(paths, fingerprints, selection), by=[LOCALE_COLUMN, 'Brand'],
+                         total=ALL_LOCALES)
 
 
+# Every Buy Box drop % window (see ``metric_families``) per marketplace and
+# brand, from one grouped pass; the window picker only selects from it.
+@st.cache_data(max_entries=16, show_spinner="Computing drop windows...")
+def load_drop_windows(paths, fingerprints, selection=()):
+    rows = filtered_rows(paths, fingerprints, selection)
+    families = select_families(metric_families(rows.columns), 'Buy Box', 'drop %')
+    return aggregate_metrics(rows, [LOCALE_COLUMN, 'Brand'], families, total=ALL_LOCALES)
 
-# st.subheader('Overall Summary')
-# st.write(
-#     """
-#     - **Focus on High Performers**: Prioritize marketing and inventory strategies for categories with high sales ranks (Casa e Cucina and Giochi e Giocattoli) to maximize revenue.
-#     - **Enhance Moderate Categories**: Develop strategies to increase sales in moderate-performing categories (Moda, Bellezza, Salute e Cura della Persona, and Sport e Tempo Libero).
-#     - **Revise Low Performers**: Investigate and address the reasons for zero sales in Alimentari e Cura della Casa and Cancelleria e Prodotti per Ufficio. Adjust strategies to improve performance in these categories.
-#     """
-# )
 
+@st.cache_data(max_entries=16, show_spinner="Scanning for unusual price moves...")
+def load_anomalies(paths, fingerprints, threshold, selection=()):
+    signals = load_signals(paths, fingerprints)
+    mask = row_mask(paths, fingerprints, selection)
+    return scan_anomalies(signals if mask.all() else signals[mask], threshold)
 
-# Contact
-st.markdown("<a id='contact'></a><h2>8. Contact</h2>", unsafe_allow_html=True)
-st.markdown("""
-<p>If you have any questions or require further analysis, please do not hesitate to reach out.</p>
-<p>Contact us at: <a href="mailto:muthu@wissend.com">muthu@wissend.com</a></p>
-""", unsafe_allow_html=True)
+
+@st.cache_data(max_entries=16, show_spinner="Computing category metrics...")
+def load_category_metrics(paths, fingerprints, column, selection=()):
+    if not selection:
+        table = aggregate_table(paths, fingerprints,
+                                lambda aggregates: aggregates.category_metrics(column, ALL_LOCALES))
+        if table is not None:
+            return table
+    return category_metrics(filtered_rows(paths, fingerprints, selection), column, by=LOCALE_COLUMN,
+                            total=ALL_LOCALES)
 
 
+@st.cache_data(max_entries=16, show_spinner="Computing summary statistics...")
+def load_summary_statistics(paths, fingerprints, approximate, locale, selection=()):
+    if approximate and not selection:
+        table = aggregate_table(paths, fingerprints, lambda aggregates: aggregates.summary(locale))
+        if table is not None:
+            return table
+    data = filtered_rows(paths, fingerprints, selection, locale)
+    if approximate:
+        return approximate_summary_statistics(data, NUMERIC_COLUMNS)
+    return summary_statistics(data, NUMERIC_COLUMNS)
+
+
+@st.cache_data(max_entries=4, show_spinner="Aggregating combined pricing data...")
+def load_pricing_aggregates(path, fingerprint):
+    return stream_pricing(path)
+
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def load_pricing_box_stats(path, fingerprint, value, group, max_outliers):
+    return box_stats(load_pricing(path, fingerprint), group, value, max_outliers)
+
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def load_pricing_describe(path, fingerprint, value, group):
+    values = load_pricing(path, fingerprint).groupby(group, observed=True)[value]
+    return values.describe().assign(sum=values.sum())
+
+
+# Insight text is filled in from the aggregates above and memoized per data
+# version and selection (see ``insights``); a rerun only looks it up.
+@st.cache_data(max_entries=32, show_spinner=False)
+def load_brand_insights(paths, fingerprints, marketplace, selection=()):
+    brand_table = for_locale(load_brand_metrics(paths, fingerprints, selection), marketplace)
+    return brand_price_tiers(brand_table), sales_rank_tiers(brand_table)
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def load_summary_insights(paths, fingerprints, approximate, locale, selection=()):
+    return summary_insights(load_summary_statistics(paths, fingerprints, approximate, locale, selection))
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def load_price_drop_insights(paths, fingerprints, marketplace, window, selection=()):
+    drops = family_means(for_locale(load_drop_windows(paths, fingerprints, selection), marketplace),
+                         'Buy Box', 'drop %')
+    return price_drop_tiers(drops.xs(window, level='window'))
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def load_category_insights(paths, fingerprints, marketplace, selection=()):
+    root_table = for_locale(load_category_metrics(paths, fingerprints, ROOT_COLUMN, selection), marketplace)
+    return category_rank_tiers(root_table[RANK_COLUMN])
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def load_review_insights(fingerprint, streaming):
+    describe = pricing_describe(fingerprint, 'price', 'rating', streaming)
+    price_rating = pricing_correlation(fingerprint, 'price', 'rating', streaming)
+    reviews_rating = pricing_correlation(fingerprint, 'number_of_reviews', 'rating', streaming)
+    return (rating_breakdown(describe), rating_summary(describe),
+            correlation_insight(price_rating, 'price', 'rating'),
+            correlation_insight(reviews_rating, 'the number of reviews', 'rating'))
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def load_source_insights(fingerprint, streaming):
+    prices, ratings, reviews = (pricing_describe(fingerprint, value, 'source', streaming)
+                                for value in ('price', 'rating', 'number_of_reviews'))
+    return source_price_insights(prices, ratings, reviews), source_rating_insights(ratings)
+
+
+def data_sources():
+    """Paths and fingerprints of the Keepa exports and the fingerprint of the
+    combined pricing file (None without one), as on disk."""
+    paths = tuple(keepa_paths())
+    try:
+        pricing = file_fingerprint(PRICING_PATH)
+    except OSError:
+        pricing = None
+    return paths, tuple(file_fingerprint(path) for path in paths), pricing
+
+
+def warm_caches(sources):
+    """Load a new version of the data into the shared caches: the Keepa
+    exports with their indexes and default aggregates, and the combined
+    pricing data."""
+    paths, fingerprints, pricing = sources
+    load_filter_index(paths, fingerprints)
+    load_brand_metrics(paths, fingerprints)
+    for column in (ROOT_COLUMN, SUB_COLUMN):
+        load_category_metrics(paths, fingerprints, column)
+    load_summary_statistics(paths, fingerprints, True, ALL_LOCALES)
+    load_product_index(paths, fingerprints)
+    if pricing is not None:
+        if os.path.getsize(PRICING_PATH) > STREAMING_THRESHOLD_BYTES:
+            load_pricing_aggregates(PRICING_PATH, pricing)
+        else:
+            load_pricing(PRICING_PATH, pricing)
+
+
+# New or changed data files are loaded on a background thread and swapped in
+# once complete (see ``data_watcher``); until then every session keeps
+# working on the previous version.
+@st.cache_resource
+def data_watcher():
+    return DataWatcher([KEEPA_PATTERN, KEEPA_PATH, PRICING_PATH], data_sources, warm_caches).start()
+
+
+# Every section is a page of its own and only loads the data it renders,
+# so opening Brand Performance never touches the combined pricing file.
+def data_version():
+    """(paths, fingerprints) of the Keepa exports, the key of every Keepa
+    cache, and the fingerprint of the combined pricing file, the key of every
+    pricing cache. A page reads them once and passes them down, so a reload
+    finishing halfway through a run cannot mix two versions on one page."""
+    paths, fingerprints, pricing = data_watcher().current
+    return (paths, fingerprints), pricing
+
+
+def row_mask(paths, fingerprints, selection=(), locale=ALL_LOCALES):
+    """Mask of the Keepa rows with a brand that meet the filter ``selection``."""
+    if locale != ALL_LOCALES:
+        selection = selection + ((LOCALE_COLUMN, (locale,)),)
+    return load_filter_index(paths, fingerprints).mask(selection)
+
+
+def filtered_rows(paths, fingerprints, selection=(), locale=ALL_LOCALES):
+    """Keepa rows with a brand that meet the filter ``selection``; the shared
+    frame itself when that is every row."""
+    data = load_keepa(paths, fingerprints)
+    mask = row_mask(paths, fingerprints, selection, locale)
+    return data if mask.all() else data[mask]
+
+
+def keepa_filters(keepa, marketplace=True):
+    """Sidebar filters of the Keepa sections.
+
+    Returns the selected marketplace and the filter selection (see
+    ``filters``), empty when nothing is filtered.
+    """
+    index = load_filter_index(*keepa)
+    st.sidebar.subheader('Filters')
+    locale = ALL_LOCALES
+    if marketplace:
+        locale = st.sidebar.selectbox('Marketplace', [ALL_LOCALES] + sorted(index.values(LOCALE_COLUMN)),
+                                      key='marketplace',
+                                      help='Analyse one marketplace or all Keepa exports together.')
+    selection = []
+    for column, label, key in (('Brand', 'Brand', 'filter_brand'), (ROOT_COLUMN, 'Root category', 'filter_root'),
+                               (SUB_COLUMN, 'Subcategory', 'filter_sub')):
+        values = st.sidebar.multiselect(label, sorted(index.values(column)), key=key)
+        if values:
+            selection.append((column, tuple(values)))
+    # Whole euros around the prices; no slider without any price
+    prices = index.bounds('Buy Box : Current')
+    if prices is not None:
+        bounds = (float(math.floor(prices[0])), float(math.ceil(prices[1])))
+        if bounds[0] == bounds[1]:
+            bounds = (bounds[0], bounds[1] + 1)
+        price = st.sidebar.slider('Buy Box price (€)', *bounds, value=bounds, key='filter_price')
+        if price != bounds:
+            selection.append(('Buy Box : Current', price))
+    for column, label, key in (('Buy Box: Is FBA', 'FBA', 'filter_fba'), ('Is HazMat', 'HazMat', 'filter_hazmat')):
+        flag = st.sidebar.selectbox(label, ['Any', 'Yes', 'No'], key=key)
+        if flag != 'Any':
+            selection.append((column, flag == 'Yes'))
+    return locale, tuple(selection)
+
+
+def pricing_missing(pricing):
+    """True, with a note on the page, when there is no combined pricing file."""
+    if pricing is None:
+        st.info(f"The combined pricing file `{PRICING_PATH}` was not found.")
+    return pricing is None
+
+
+def pricing_settings():
+    """Sidebar settings of the combined pricing sections."""
+    st.sidebar.subheader('Combined pricing data')
+    # In streaming mode the combined pricing file is read in chunks into running
+    # aggregates and the review and source sections render from those, so the
+    # full frame is never held in memory.
+    streaming = st.sidebar.toggle(
+        'Stream combined pricing data',
+        value=os.path.getsize(PRICING_PATH) > STREAMING_THRESHOLD_BYTES,
+        help='Aggregate the combined pricing file chunk by chunk instead of loading it whole.',
+        key='streaming'
+    )
+    # Box plots are sent as quartiles, whiskers and at most this many outliers per box
+    max_outliers = st.sidebar.number_input('Outliers per box', min_value=0, max_value=500, value=MAX_OUTLIERS,
+                                           step=10, key='max_outliers')
+    return streaming, max_outliers
+
+
+def plotly_chart(fig, **kwargs):
+    """``st.plotly_chart``, its serialization recorded when profiling."""
+    with span('plotly_chart', 'chart'):
+        st.plotly_chart(fig, **kwargs)
+
+
+def dataframe(data, **kwargs):
+    """``st.dataframe``, its serialization recorded when profiling."""
+    with span('dataframe', 'table', len(data)):
+        st.dataframe(data, **kwargs)
+
+
+def profiling_settings():
+    """Sidebar switches of the profiler; the profiler for this run, if on."""
+    with st.sidebar.expander('Profiling'):
+        enabled = st.toggle('Profile this page', key='profile',
+                            help='Record time, CPU time and rows of every stage of the next runs.')
+        memory = st.toggle('Trace memory', key='profile_memory', disabled=not enabled,
+                           help='Also record peak memory per stage; makes the run noticeably slower.')
+    return Profiler(memory) if enabled else None
+
+
+def profiling_panel(profiler):
+    """Profile of the run, with JSON and Chrome trace downloads."""
+    with st.expander('Profile of this run', expanded=True):
+        st.caption('Cached stages only appear when their cache entry is computed.')
+        st.dataframe(profiler.summary(), column_config={
+            'wall': st.column_config.NumberColumn(format="%.4f s"),
+            'cpu': st.column_config.NumberColumn(format="%.4f s"),
+        })
+        st.dataframe(profiler.to_frame(), hide_index=True)
+        col1, col2 = st.columns(2)
+        col1.download_button('Download JSON', profiler.to_json(), file_name='profile.json',
+                             mime='application/json')
+        col2.download_button('Download Chrome trace', profiler.to_chrome_trace(), file_name='profile.trace.json',
+                             mime='application/json', help='Open in chrome://tracing or ui.perfetto.dev.')
+
+
+def pricing_box_stats(fingerprint, value, group, streaming, max_outliers):
+    if streaming:
+        return load_pricing_aggregates(PRICING_PATH, fingerprint).box_stats(value, group, max_outliers)
+    return load_pricing_box_stats(PRICING_PATH, fingerprint, value, group, max_outliers)
+
+
+def pricing_describe(fingerprint, value, group, streaming):
+    if streaming:
+        return load_pricing_aggregates(PRICING_PATH, fingerprint).describe(value, group)
+    return load_pricing_describe(PRICING_PATH, fingerprint, value, group)
+
+
+def pricing_correlation(fingerprint, x, y, streaming):
+    if streaming:
+        return load_pricing_aggregates(PRICING_PATH, fingerprint).correlation(x, y)
+    df1 = load_pricing(PRICING_PATH, fingerprint)
+    return df1[x].corr(df1[y])
+
+
+def overview():
+    # Add Introduction
+    st.markdown("""
+    <h1>Brand and Category Performance Dashboard</h1>
+    <p>Welcome to the Brand and Category Performance Dashboard. This tool provides an in-depth analysis of brand performance, pricing trends, and category popularity. This data dashboard is based on <b>Italy location.</b> Utilize this dashboard to gain valuable insights and refine your strategy.</p>
+    """, unsafe_allow_html=True)
+
+    # Overview
+    st.markdown("<a id='overview'></a><h2>1. Overview</h2>", unsafe_allow_html=True)
+    st.markdown("""
+    <p>This section provides an initial overview of the dataset, including key elements such as product identifiers, sales data, and pricing metrics. Understanding these fundamentals will help guide the subsequent analyses.</p>
+    """, unsafe_allow_html=True)
+    # Initial Observations
+    st.markdown("""
+    <p>We start by examining the key aspects of the data:</p>
+    <ul>
+        <li><b>Product Identification:</b> Unique identifiers like ASIN, EAN, and PartNumber.</li>
+        <li><b>Product Details:</b> Product attributes such as Title, Brand, and Image.</li>
+        <li><b>Sales Data:</b> Sales ranks and their changes over time.</li>
+        <li><b>Pricing Data:</b> Current Buy Box prices and price changes over various periods.</li>
+        <li><b>Category:</b> Main, Sub, and Tree categories.</li>
+    </ul>
+    """, unsafe_allow_html=True)
+
+    # Cells of the Keepa exports that were present but not a valid number; loading
+    # the exports first makes sure the typed copies and their parse reports are current
+    (paths, fingerprints), _ = data_version()
+    load_keepa(paths, fingerprints)
+    parse_failures = pd.concat([read_parse_failures(path) for path in paths]).groupby(level=0).sum()
+    if not parse_failures.empty:
+        with st.expander(f"{parse_failures.sum():,} cells could not be parsed"):
+            dataframe(parse_failures)
+
+    # Labels are held as categoricals and prices and percentages as float32
+    report = load_memory_report(paths, fingerprints)
+    with st.expander(f"Keepa data in memory: {report.at['Total', 'bytes'] / 2 ** 20:,.1f} MB "
+                     f"({report.at['Total', 'saved']:.0%} saved)"):
+        dataframe(report, column_config={
+            'bytes': st.column_config.NumberColumn(format="%d"),
+            'plain bytes': st.column_config.NumberColumn(format="%d"),
+            'saved': st.column_config.NumberColumn(format="%.2f"),
+        })
+
+
+def brand_performance():
+    keepa, _ = data_version()
+    marketplace, selection = keepa_filters(keepa)
+    keepa_columns = load_keepa(*keepa).columns
+    brand_table = for_locale(load_brand_metrics(*keepa, selection), marketplace)
+
+    # Brand Performance
+    st.markdown("<a id='brand-performance'></a><h2>2. Brand Performance</h2>", unsafe_allow_html=True)
+
+    # Top 10 Brands by Average Current Buy Box Price
+    buy_box_column = 'Buy Box : Current'
+    if buy_box_column not in keepa_columns:
+        st.error(f"Column '{buy_box_column}' not found in the data.")
+    else:
+        average_price_by_brand = top_n(brand_table, buy_box_column)
+
+        st.header('Top 10 Brands by Average Current Buy Box Price')
+        fig = brand_bar(average_price_by_brand, 'Average Current Buy Box Price',
+                        title='Top 10 Brands by Average Current Buy Box Price',
+                        axis_label='Average Current Buy Box Price (€)')
+        plotly_chart(fig, use_container_width=True)
+
+    price_tiers, rank_tiers = load_brand_insights(*keepa, marketplace, selection)
+
+    # Premium and Luxury Branding
+    st.subheader("Premium and Luxury Branding")
+    st.write(
+        f"**Brands:** {price_tiers['premium']}"
+    )
+    st.write(
+        "**Insight:** These brands have the highest average prices, indicating a strong premium market position. "
+        "They cater to customers seeking luxury and exclusivity."
+    )
+    st.write(
+        "**Strategy:** Maintain premium pricing to reinforce brand prestige. Consider exclusive promotions or limited editions to enhance their luxury appeal."
+    )
+
+    # Competitive Mid-Range Pricing
+    st.subheader("Competitive Mid-Range Pricing")
+    st.write(
+        f"**Brands:** {price_tiers['mid-range']}"
+    )
+    st.write(
+        "**Insight:** These brands are priced in the mid-range, balancing premium features with accessibility. They attract a wide customer base by offering a mix of quality and value."
+    )
+    st.write(
+        "**Strategy:** Utilize competitive pricing to appeal to a broad audience. Differentiate through superior product quality and brand experience."
+    )
+
+    # Value-Oriented Pricing
+    st.subheader("Value-Oriented Pricing")
+    st.write(
+        f"**Brands:** {price_tiers['value']}"
+    )
+    st.write(
+        "**Insight:** Positioned as value-oriented but still aspirational, these brands offer quality at more accessible prices. They target consumers looking for premium features without the highest price tag."
+    )
+    st.write(
+        "**Strategy:** Highlight the quality and heritage of these brands in marketing. Ensure pricing reflects the value proposition and remains competitive in the market."
+    )
+
+    # Price Range Dynamics
+    st.subheader("Price Range Dynamics")
+    st.write(
+        f"**Range:** {price_tiers['range']}"
+    )
+    st.write(
+        "**Insight:** The broad price range reflects a diverse market with varying customer segments. High-priced brands cater to luxury consumers, while lower-priced brands appeal to those seeking value."
+    )
+    st.write(
+        "**Strategy:** Develop tailored pricing strategies for different segments. Focus on exclusivity for higher-priced brands and emphasize value for more accessible options."
+    )
+
+    # Summary
+    st.subheader("Summary")
+    st.write(
+        "1. **Premium Brands:** Reinforce luxury positioning with high prices and exclusive offers."
+    )
+    st.write(
+        "2. **Mid-Range Brands:** Attract a wider audience with competitive pricing and high quality."
+    )
+    st.write(
+        "3. **Value Brands:** Offer accessible luxury with a focus on quality and brand heritage."
+    )
+    st.write(
+        "4. **Overall:** Regularly review and adjust pricing to align with market dynamics and maintain optimal positioning."
+    )
+
+
+    # Top 10 Brands by Average Sales Rank (90 days avg.)
+    top_brands_sales_rank = top_n(brand_table, 'Sales Rank: 90 days avg.', ascending=True)
+
+    st.header('Top 10 Brands by Average Sales Rank (90 days avg.)')
+    fig = brand_bar(top_brands_sales_rank, 'Avg. Sales Rank (90 days avg.)',
+                    title='Top 10 Brands by Average Sales Rank (90 days avg.)',
+                    axis_label='Average Sales Rank (90 days avg.)')
+    plotly_chart(fig, use_container_width=True)
+
+    # Sales Rank Insights
+    st.subheader("Sales Rank Insights")
+
+    # High Sales Performance
+    st.write("### High Sales Performance")
+    st.write(
+        f"**Top Performers:** {rank_tiers['high']}"
+    )
+    st.write(
+        "**Insight:** These brands have the lowest average sales ranks, indicating they are top performers with strong sales and high customer engagement."
+    )
+    st.write(
+        "**Strategy:** Maintain and build on successful sales strategies. Explore expanding product lines and increasing marketing efforts to sustain or enhance market dominance."
+    )
+
+    # Mid-Range Sales Performance
+    st.write("### Mid-Range Sales Performance")
+    st.write(
+        f"**Brands:** {rank_tiers['mid-range']}"
+    )
+    st.write(
+        "**Insight:** These brands have moderate sales ranks, showing competitive performance but facing more competition."
+    )
+    st.write(
+        "**Strategy:** Analyze the competitive landscape and identify ways to improve sales ranks. Enhance product differentiation and customer engagement to strengthen market position."
+    )
+
+    # Lower Sales Performance
+    st.write("### Lower Sales Performance")
+    st.write(
+        f"**Brands:** {rank_tiers['lower']}"
+    )
+    st.write(
+        "**Insight:** These brands have higher average sales ranks, suggesting weaker performance compared to others."
+    )
+    st.write(
+        "**Strategy:** Investigate the causes of lower sales. Implement targeted marketing, improve product offerings, adjust pricing, and consider promotions to boost visibility and sales."
+    )
+
+    # Summary of Recommendations
+    st.write("### Summary of Recommendations")
+    st.write(
+        "1. **Leverage High Performance:** For top-performing brands, continue optimizing successful strategies and explore expansion opportunities."
+    )
+    st.write(
+        "2. **Enhance Competitive Positioning:** For mid-range brands, focus on improving strategies and customer engagement to gain a competitive edge."
+    )
+    st.write(
+        "3. **Address Sales Challenges:** For lower-performing brands, identify areas for improvement and implement targeted actions to enhance sales and visibility. Regularly monitor and adjust strategies as needed."
+    )
+
+
+def statistical_summary():
+    keepa, _ = data_version()
+    marketplace, selection = keepa_filters(keepa)
+    row_count = int(row_mask(*keepa, selection, marketplace).sum())
+
+    # Statistical Summary
+    st.markdown("<a id='statistical-summary'></a><h2>4. Statistical Summary</h2>", unsafe_allow_html=True)
+
+    # Sketch-based statistics are offered for large inputs and used by default above this size
+    APPROXIMATE_THRESHOLD_ROWS = 1_000_000
+
+    approximate_stats = st.toggle(
+        'Approximate statistics',
+        value=row_count > APPROXIMATE_THRESHOLD_ROWS,
+        help='Quartiles, median and mode from mergeable quantile sketches (about 1% relative error).'
+    )
+    stats_df = load_summary_statistics(*keepa, approximate_stats, marketplace, selection)
+
+    # Display the statistical summary
+    st.write("### Detailed Statistical Summary of Key Metrics:")
+    dataframe(stats_df, column_config={
+        column: st.column_config.NumberColumn(format="%.2f") for column in stats_df.columns
+    })
+
+    insights = load_summary_insights(*keepa, approximate_stats, marketplace, selection)
+
+    # Business Insights
+    st.markdown("<h2>Business Insights</h2>", unsafe_allow_html=True)
+
+    # Section: Buy Box Price Drops
+    # Sales Insights
+    st.header("Sales Insights")
+
+    # 1. Buy Box Price Drops
+    st.subheader("1. Buy Box Price Drops")
+    st.write(
+        f"**Short-Term Drops:** {insights['drops']}"
+    )
+    st.write(
+        "**Implication:** Minor daily or weekly fluctuations are typical, but substantial drops over longer periods may indicate seasonal sales or inventory clearances. Regular monitoring and price adjustments can help optimize profitability and stay competitive."
+    )
+
+    # 2. Referral Fee %
+    st.subheader("2. Referral Fee %")
+    st.write(
+        f"**Consistency:** {insights['referral']}"
+    )
+    st.write(
+        "**Implication:** The stable referral fee allows for predictable cost planning. Ensure product pricing accounts for this fee while staying competitive."
+    )
+
+    # 3. Buy Box Prices
+    st.subheader("3. Buy Box Prices")
+    st.write(
+        f"**Current Prices:** {insights['prices']}"
+    )
+    st.write(
+        f"**Historical Trends:** {insights['trend']}"
+    )
+    st.write(
+        "**Implication:** Compare current prices to historical averages to guide pricing adjustments. Competitive pricing enhances visibility and sales."
+    )
+
+    # 4. Sales Rank
+    st.subheader("4. Sales Rank")
+    st.write(
+        f"**Trends:** {insights['rank']}"
+    )
+    st.write(
+        "**Implication:** Target products with improving sales ranks for promotional strategies. For products with lower ranks, analyze performance factors and adjust marketing strategies."
+    )
+
+    # Summary of Recommendations
+    st.subheader("Summary of Recommendations")
+    st.write(
+        "1. **Price Management:** Regularly review and adjust pricing based on observed drops and historical trends."
+    )
+    st.write(
+        "2. **Cost Management:** Factor in the stable referral fee percentage to ensure costs are covered while maintaining competitiveness."
+    )
+    st.write(
+        "3. **Performance Monitoring:** Use sales rank data to identify and promote high-performing products. Adjust strategies for products with lower sales ranks."
+    )
+    st.write(
+        "4. **Logistics Optimization:** Adapt logistics and inventory management to efficiently handle diverse product dimensions and weights."
+    )
+
+
+def price_drop_analysis():
+    keepa, _ = data_version()
+    marketplace, selection = keepa_filters(keepa)
+    drops = family_means(for_locale(load_drop_windows(*keepa, selection), marketplace),
+                         'Buy Box', 'drop %')
+
+    # Price Drop Analysis
+    st.markdown("<a id='price-drop-analysis'></a><h2>5. Price Drop Analysis</h2>", unsafe_allow_html=True)
+
+    drop_windows = sorted(drops.index.unique('window'))
+    if not drop_windows:
+        st.info("The Keepa exports have no Buy Box drop % columns.")
+        return
+    window = st.selectbox("Drop window (days)", drop_windows,
+                          index=drop_windows.index(30) if 30 in drop_windows else 0)
+    top_brands_price_drop = drops.xs(window, level='window').dropna().nlargest(10)
+
+    st.subheader(f'Top 10 Brands by Average Price Drop ({window} days)')
+    fig = brand_bar(top_brands_price_drop, f'Average Price Drop ({window} days)',
+                    title=f'Top 10 Brands by Average Price Drop ({window} days)',
+                    axis_label=f'Average Price Drop ({window} days) (%)')
+    plotly_chart(fig, use_container_width=True)
+
+    st.subheader('Price Drop of the Top 10 Brands by Window')
+    fig = window_line(drops[drops.index.isin(top_brands_price_drop.index, level='Brand')],
+                      title=f'Average Buy Box Price Drop by Window (top 10 brands over {window} days)',
+                      axis_label='Average Price Drop (%)')
+    plotly_chart(fig, use_container_width=True)
+
+    # ASINs whose drops, lowest-price flags or stock-outs stand out from
+    # both their brand and their subcategory (see ``anomalies``)
+    st.subheader('Unusual Price Moves and Stock-outs')
+    threshold = st.slider('Alert threshold (robust z-score)', 2.0, 10.0, THRESHOLD, step=0.5,
+                          key='anomaly_threshold')
+    alerts = load_anomalies(*keepa, threshold, selection)
+    if marketplace != ALL_LOCALES:
+        alerts = alerts[alerts['Locale'] == marketplace]
+    st.write(f"**{len(alerts):,}** ASINs with at least one unusual signal, strongest first.")
+    dataframe(alerts.head(100), hide_index=True, column_config={
+        column: st.column_config.NumberColumn(format="%.2f")
+        for column in alerts.columns if column == 'Value' or column.endswith('median') or column == 'Score'
+    })
+
+    # Average Price Drop Insights of the selected window
+    drop_tiers = load_price_drop_insights(*keepa, marketplace, window, selection)
+    st.header(f"Average Price Drop Insights ({window} Days)")
+
+    # No Price Drop
+    st.subheader("No Price Drop")
+    st.write(
+        f"**Brands:** {drop_tiers['none']}"
+    )
+    st.write(
+        f"**Insight:** These brands have not experienced any average price drop in the past {window} days, reflecting stable pricing strategies and strong market positioning."
+    )
+    st.write(
+        "**Actionable Strategy:** Continue maintaining stable prices to uphold brand value and customer trust. Stay vigilant for any market changes that might require price adjustments."
+    )
+
+    # Low Price Drop
+    st.subheader("Low Price Drop")
+    st.write(
+        f"**Brands:** {drop_tiers['low']}"
+    )
+    st.write(
+        "**Insight:** These brands show minimal price drops, indicating cautious pricing adjustments and stable market positioning."
+    )
+    st.write(
+        "**Actionable Strategy:** Monitor market trends and competitive pricing closely. Implement incremental price adjustments if necessary to remain competitive while preserving brand value."
+    )
+
+    # Moderate Price Drop
+    st.subheader("Moderate Price Drop")
+    st.write(
+        f"**Brands:** {drop_tiers['moderate']}"
+    )
+    st.write(
+        "**Insight:** These brands have experienced moderate price drops, possibly in response to market pressures or inventory management."
+    )
+    st.write(
+        "**Actionable Strategy:** Investigate the reasons for these moderate drops and adjust pricing strategies to balance competitiveness with profitability. Address any market dynamics affecting pricing."
+    )
+
+    # Significant Price Drop
+    st.subheader("Significant Price Drop")
+    st.write(
+        f"**Brands:** {drop_tiers['significant']}"
+    )
+    st.write(
+        "**Insight:** Significant price drops may indicate aggressive pricing strategies, inventory clearance, or competitive responses."
+    )
+    st.write(
+        "**Actionable Strategy:** Review pricing strategies to understand the causes of substantial drops. Evaluate inventory levels, market competition, and consumer demand to optimize pricing effectively."
+    )
+
+    # Summary of Recommendations
+    st.subheader("Summary of Recommendations")
+    st.write(
+        "1. **Maintain Stability:** For brands with no price drop, continue to monitor the market to ensure prices align with market conditions and brand positioning."
+    )
+    st.write(
+        "2. **Monitor and Adjust Incrementally:** For brands with low price drops, make small adjustments as needed while focusing on maintaining brand value and competitive positioning."
+    )
+    st.write(
+        "3. **Analyze and Adapt Moderately:** For brands with moderate price drops, analyze market trends and adjust pricing strategies to ensure competitiveness while managing profitability."
+    )
+    st.write(
+        "4. **Strategic Review for Significant Drops:** For brands with significant price drops, conduct a thorough review of pricing strategies and market dynamics to address underlying issues and optimize pricing."
+    )
+
+
+def category_insights():
+    keepa, _ = data_version()
+    marketplace, selection = keepa_filters(keepa)
+    root_table = for_locale(load_category_metrics(*keepa, ROOT_COLUMN, selection), marketplace)
+    sub_table = for_locale(load_category_metrics(*keepa, SUB_COLUMN, selection), marketplace)
+
+    # Category Insights
+    st.markdown("<a id='category-insights'></a><h2>6. Category Insights</h2>", unsafe_allow_html=True)
+
+    # Pie chart for Root Categories
+    fig_root = category_pie(top_categories(root_table), 'Category', title='Top 10 Popular Root Categories')
+    plotly_chart(fig_root, use_container_width=True)
+
+    # Pie chart for Subcategories
+    fig_sub = category_pie(top_categories(sub_table), 'Subcategory', title='Top 10 Popular Subcategories')
+    plotly_chart(fig_sub, use_container_width=True)
+
+    # Category-wise sales performance
+    st.title('Category-Wise Sales Performance')
+    fig = category_rank_bar(category_sales_rank(root_table))
+    plotly_chart(fig, use_container_width=True)
+
+    # Drill-down through Categories: Tree, from the root categories to the leaves
+    st.header("Category Tree")
+    tree = load_category_tree(*keepa, marketplace, selection)
+    node = None
+    for depth in range(tree.nodes['depth'].max() + 1 if len(tree.nodes) else 0):
+        children = tree.children(node)
+        if children.empty:
+            break
+        choice = st.selectbox(f'Level {depth + 1}', [None] + list(children.index), key=f'tree_level_{depth}',
+                              format_func=lambda n: 'All' if n is None else tree.nodes.at[n, 'name'])
+        if choice is None:
+            break
+        node = choice
+    if node is not None:
+        st.caption(tree.nodes.at[node, 'path'])
+        price_column, rank_column = tree.metrics[:2]
+        col1, col2, col3 = st.columns(3)
+        col1.metric('Products', f"{tree.nodes.at[node, 'Products']:,}")
+        col2.metric('Avg. Buy Box Price', f"€{tree.nodes.at[node, price_column]:,.2f}")
+        col3.metric('Avg. Sales Rank (90 days)', f"{tree.nodes.at[node, rank_column]:,.0f}")
+    children = tree.children(node)
+    if not children.empty:
+        plotly_chart(category_node_bar(children, title='Products per Category'), use_container_width=True)
+        dataframe(children.drop(columns=['path', 'depth', 'parent']).set_index('name'), column_config={
+            column: st.column_config.NumberColumn(format="%.2f") for column in tree.metrics
+        })
+    if node is not None:
+        with st.expander("ASINs in this category"):
+            dataframe(pd.Series(tree.asins(node), name='ASIN'), hide_index=True)
+
+    # High Sales Volume Categories
+    st.header("Sales Insights by Category")
+    category_tiers = load_category_insights(*keepa, marketplace, selection)
+
+    st.subheader("High Sales Volume Categories")
+    st.write(
+        f"**Categories (average sales rank, 90 days):** {category_tiers['high']}"
+    )
+    st.write(
+        "**Insight:** These categories have the best average sales ranks, reflecting significant consumer demand and market success. The products in these categories are performing exceptionally well."
+    )
+    st.write(
+        "**Actionable Strategy:** To capitalize on this strong performance, focus on amplifying marketing efforts and increasing inventory in these categories. Explore opportunities to introduce new or premium products and leverage seasonal trends with targeted promotions."
+    )
+
+    st.subheader("Moderate Sales Volume Categories")
+    st.write(
+        f"**Categories (average sales rank, 90 days):** {category_tiers['moderate']}"
+    )
+    st.write(
+        "**Insight:** These categories show steady performance but not as strong as the top categories. This suggests consistent consumer interest with potential for growth."
+    )
+    st.write(
+        "**Actionable Strategy:** Enhance sales through collaborations with influencers and limited-time promotions. Focus on popular and trending items, expand the product line and encourage product reviews to drive additional sales."
+    )
+
+    st.subheader("Low Sales Volume Categories")
+    st.write(
+        f"**Categories (average sales rank, 90 days):** {category_tiers['low']}"
+    )
+    st.write(
+        f"**Without a sales rank:** {category_tiers['unranked']}"
+    )
+    st.write(
+        "**Insight:** These categories rank lowest or record no sales rank at all, which could indicate a lack of market presence, insufficient consumer interest or issues with market fit and product availability."
+    )
+    st.write(
+        "**Actionable Strategy:** Investigate the underlying reasons for the weak sales. Review the current product lineup and assess market needs, consider introducing new products or revising the marketing strategy, and improve the visibility of the offers."
+    )
+
+
+    # # Define the business insights
+    # insights = {
+    #     "High Sales Volume Categories": {
+    #         "Casa e Cucina (€453,215.00)": {
+    #             "Insight": "This category has the highest average sales rank, indicating it generates the most significant sales volume among the categories. This suggests a strong market demand for home and kitchen products.",
+    #             "Actionable Strategy": "Focus marketing efforts and inventory investment in this category. Explore opportunities to introduce new products or premium options to leverage the high sales volume."
+    #         },
+    #         "Giochi e Giocattoli (€422,243.00)": {
+    #             "Insight": "Toys and games also show a high average sales rank, reflecting robust consumer interest. The high sales rank suggests a significant portion of revenue comes from this category.",
+    #             "Actionable Strategy": "Consider seasonal promotions and targeted marketing campaigns to capitalize on trends and maximize revenue from this category. Evaluate popular trends in toys and games to stay competitive."
+    #         }
+    #     },
+    #     "Moderate Sales Volume Categories": {
+    #         "Moda (€105,114.50)": {
+    #             "Insight": "The fashion category shows a moderate average sales rank, indicating a steady but not exceptional sales volume compared to the top categories.",
+    #             "Actionable Strategy": "Develop strategies to boost sales, such as collaborations with influencers or limited-time offers. Enhance product selection and focus on trending fashion items."
+    #         },
+    #         "Bellezza (€90,656.90)": {
+    #             "Insight": "Beauty products have a solid average sales rank, indicating a healthy demand. This category is important but not as dominant as the top two categories.",
+    #             "Actionable Strategy": "Increase marketing efforts and consider expanding the product line to include new beauty trends. Focus on customer loyalty programs and product reviews to drive sales."
+    #         },
+    #         "Salute e Cura della Persona (€88,738.00)": {
+    #             "Insight": "Health and personal care products show a good sales rank, reflecting consumer interest in health-related products.",
+    #             "Actionable Strategy": "Strengthen partnerships with health influencers and focus on product education. Consider bundling products or creating special offers to attract more customers."
+    #         },
+    #         "Sport e Tempo Libero (€64,951.67)": {
+    #             "Insight": "Sports and leisure products have a moderate sales rank, suggesting steady but lower sales compared to the top categories.",
+    #             "Actionable Strategy": "Leverage seasonal trends and promote products around major sports events or recreational activities. Enhance product visibility and consider promotions to boost sales."
+    #         }
+    #     },
+    #     "Low Sales Volume Categories": {
+    #         "Alimentari e Cura della Casa (€0.00)": {
+    #             "Insight": "This category shows zero sales, which could indicate a lack of product presence or low consumer demand.",
+    #             "Actionable Strategy": "Investigate the reasons for the lack of sales. Consider introducing new products or enhancing the marketing strategy for this category. Evaluate consumer demand and adjust product offerings accordingly."
+    #         },
+    #         "Cancelleria e Prodotti per Ufficio (€0.00)": {
+    #             "Insight": "Similar to the food and home care category, this category also has zero sales, indicating potential issues with market fit or product availability.",
+    #             "Actionable Strategy": "Assess the current product lineup and market needs. Consider exploring new product options or improving the visibility and accessibility of office supplies."
+    #         }
+    #     }
+    # }
+
+    # # Create a Streamlit app
+    # st.title('Business Insights Based on Sales Performance')
+
+    # # Display insights
+    # for category, details in insights.items():
+    #     st.subheader(category)
+    #     for item, info in details.items():
+    #         st.write(f"**{item}**")
+    #         st.write(f"**Insight:** {info['Insight']}")
+    #         st.write(f"**Actionable Strategy:** {info['Actionable Strategy']}")
+    #         st.write("")  # Add a blank line for readability
+
+
+def customer_reviews():
+    _, pricing = data_version()
+    if pricing_missing(pricing):
+        return
+    streaming, max_outliers = pricing_settings()
+
+    # Customer Reviews
+    st.markdown("<a id='customer-reviews'></a><h2>6. Customer Reviews and Price Impact</h2>", unsafe_allow_html=True)
+    # st.write("Content for Customer Reviews and Price Impact Analysis goes here.")
+    # Customer Reviews Analysis
+    # st.title('Customer reviews Analysis and Price Impact Analysis')
+
+    # Header
+    st.header('Product Price Analysis by Rating')
+
+    # Plotting
+    price_distribution_by_rating = precomputed_box(
+        pricing_box_stats(pricing, 'price', 'rating', streaming, max_outliers),
+        title='Price Distribution by Rating',
+        x_label='Rating',
+        y_label='Price (€)',
+        # Increase figure size for better readability
+        width=1000,  # Width in pixels
+        height=600   # Height in pixels
+    )
+
+    # Display the plot in Streamlit
+    plotly_chart(price_distribution_by_rating)
+
+    breakdown, summary, price_rating, reviews_rating = load_review_insights(pricing, streaming)
+
+    # Detailed Breakdown
+    st.header('Detailed Breakdown:')
+    if not breakdown:
+        st.info("No priced products to break down by rating.")
+    for rating, text in breakdown.items():
+        st.subheader(f'Rating {rating}:')
+        st.markdown(text)
+
+    # Summary
+    st.header('Summary:')
+    st.markdown(summary)
+
+
+    # Calculate the correlation between price and rating
+    correlation_price_rating = pricing_correlation(pricing, 'price', 'rating', streaming)
+
+    # Display the results
+    st.title('Correlation Analysis')
+
+    # Display Correlation Result
+    st.write("Correlation Between Price and Rating:", correlation_price_rating)
+
+    # Display Interpretation
+    st.markdown("### Interpretation:\n\n" + price_rating)
+
+
+
+    # Calculate the correlation between the number of reviews and rating
+    correlation_reviews_rating = pricing_correlation(pricing, 'number_of_reviews', 'rating', streaming)
+
+    # Display the results
+    # st.title('Correlation Analysis')
+
+    # Display Correlation Result
+    st.write("Correlation Between Number of Reviews and Rating:", correlation_reviews_rating)
+
+    # Display Interpretation
+    st.markdown("### Interpretation:\n\n" + reviews_rating)
+
+
+def source_analysis():
+    _, pricing = data_version()
+    if pricing_missing(pricing):
+        return
+    streaming, max_outliers = pricing_settings()
+    price_text, rating_text = load_source_insights(pricing, streaming)
+
+    st.header('Source Analysis')
+
+    st.write(
+        "The source of the data represents the website or platform from which the data was collected. "
+        "Here, `es` stands for Spanish and `fr` stands for French."
+    )
+
+    # Calculate price variation by source
+    price_variation_by_source = precomputed_box(
+        pricing_box_stats(pricing, 'price', 'source', streaming, max_outliers),
+        title='Price Variation by Source',
+        x_label='Source',
+        y_label='Price ($)'
+    )
+
+    # Streamlit title and plot
+    st.header('Price Variation Analysis Across Different Sources')
+    plotly_chart(price_variation_by_source)
+
+    # Interpretation
+    st.markdown("### Interpretation:\n\n" + price_text)
+
+    # Calculate rating comparison by source
+    rating_comparison_by_source = precomputed_box(
+        pricing_box_stats(pricing, 'rating', 'source', streaming, max_outliers),
+        title='Rating Comparison by Source',
+        x_label='Source',
+        y_label='Rating'
+    )
+
+    # Streamlit title and plot
+    st.header('Rating Comparison Analysis Across Different Sources')
+    plotly_chart(rating_comparison_by_source)
+
+    # Interpretation
+    st.markdown("### Interpretation:\n\n" + rating_text)
+
+
+
+
+
+    # st.subheader('Overall Summary')
+    # st.write(
+    #     """
+    #     - **Focus on High Performers**: Prioritize marketing and inventory strategies for categories with high sales ranks (Casa e Cucina and Giochi e Giocattoli) to maximize revenue.
+    #     - **Enhance Moderate Categories**: Develop strategies to increase sales in moderate-performing categories (Moda, Bellezza, Salute e Cura della Persona, and Sport e Tempo Libero).
+    #     - **Revise Low Performers**: Investigate and address the reasons for zero sales in Alimentari e Cura della Casa and Cancelleria e Prodotti per Ufficio. Adjust strategies to improve performance in these categories.
+    #     """
+    # )
+
+
+def marketplace_comparison():
+    keepa, _ = data_version()
+    _, selection = keepa_filters(keepa, marketplace=False)
+    brand_table = load_brand_metrics(*keepa, selection)
+    root_table = load_category_metrics(*keepa, ROOT_COLUMN, selection)
+
+    st.markdown("<a id='marketplace-comparison'></a><h2>Marketplace Comparison</h2>", unsafe_allow_html=True)
+    locales = [locale for locale in brand_table.index.unique(LOCALE_COLUMN) if locale != ALL_LOCALES]
+    if len(locales) < 2:
+        st.info("Only one Keepa export was found. Add the exports of other marketplaces "
+                "(e.g. fragance_es_keepa.csv) to compare them.")
+        return
+
+    # Brands and categories with the most products across all marketplaces
+    per_locale = brand_table.drop(index=ALL_LOCALES, level=LOCALE_COLUMN)
+    brands = for_locale(brand_table, ALL_LOCALES)['Products'].nlargest(10).index
+    plotly_chart(locale_bar(
+        per_locale['Buy Box : Current'][per_locale.index.isin(brands, level='Brand')],
+        'Average Current Buy Box Price', title='Average Current Buy Box Price of the Top 10 Brands by Marketplace',
+        axis_label='Average Current Buy Box Price (€)'), use_container_width=True)
+
+    categories = top_categories(for_locale(root_table, ALL_LOCALES)).index
+    per_locale = root_table.drop(index=ALL_LOCALES, level=LOCALE_COLUMN)
+    plotly_chart(locale_bar(
+        per_locale['Products'][per_locale.index.isin(categories, level=ROOT_COLUMN)],
+        'Products', title='Products per Root Category by Marketplace', axis_label='Products',
+        name_label='Category'), use_container_width=True)
+
+    st.write("### Brand Metrics by Marketplace")
+    dataframe(brand_table[brand_table.index.isin(brands, level='Brand')].sort_index(), column_config={
+        column: st.column_config.NumberColumn(format="%.2f") for column in brand_table.columns
+    })
+
+
+def trends():
+    (paths, fingerprints), _ = data_version()
+    load_keepa(paths, fingerprints)
+
+    st.markdown("<a id='trends'></a><h2>Trends</h2>", unsafe_allow_html=True)
+    st.markdown("""
+    <p>Price and sales rank history over the stored Keepa snapshots. Every new version of an export is kept as a dated snapshot when the dashboard loads it.</p>
+    """, unsafe_allow_html=True)
+    snapshot_count = len(snapshot_store().snapshots())
+
+    kind = st.radio('History of', ['ASIN', 'Brand', 'Category'], horizontal=True, key='history_kind')
+    if kind == 'ASIN':
+        value = st.text_input('ASIN or EAN', key='history_asin').strip()
+        product = load_product_index(paths, fingerprints).lookup([value])[0] if value else -1
+        if product >= 0:
+            value = load_product_index(paths, fingerprints).asins[product]
+    elif kind == 'Brand':
+        brands = load_brand_metrics(paths, fingerprints).index.unique('Brand')
+        value = st.selectbox('Brand', sorted(brands), key='history_brand')
+    else:
+        categories = load_category_metrics(paths, fingerprints, ROOT_COLUMN).index.unique(ROOT_COLUMN)
+        value = st.selectbox('Category', sorted(categories), key='history_category')
+    last = st.slider('Snapshots', min_value=1, max_value=max(snapshot_count, 2), value=max(snapshot_count, 2),
+                     key='history_last')
+    if not value:
+        return
+
+    history = load_history(kind, value, last, snapshot_count)
+    if history.empty:
+        st.info(f"{value} is not in any stored snapshot.")
+        return
+    price_column, rank_column = HISTORY_COLUMNS
+    plotly_chart(history_line(history, price_column, title=f'Current Buy Box Price of {value}',
+                                 axis_label='Current Buy Box Price (€)'), use_container_width=True)
+    plotly_chart(history_line(history, rank_column, title=f'Sales Rank (90 days avg.) of {value}',
+                                 axis_label='Sales Rank (90 days avg.)'), use_container_width=True)
+    dataframe(history, hide_index=True)
+
+
+def cross_source_comparison():
+    keepa, pricing = data_version()
+    if pricing_missing(pricing):
+        return
+    marketplace, selection = keepa_filters(keepa)
+    streaming, _ = pricing_settings()
+
+    st.markdown("<a id='cross-source-prices'></a><h2>Cross-Source Prices</h2>", unsafe_allow_html=True)
+    st.markdown("""
+    <p>Keepa products matched to the combined pricing data by ASIN (or EAN), with the Keepa Buy Box price of every marketplace next to the price and rating of every source.</p>
+    """, unsafe_allow_html=True)
+    if not any(name in pricing_header(PRICING_PATH) for name in IDENTIFIER_COLUMNS):
+        st.info("The combined pricing data has neither an `asin` nor an `ean` column to match products on.")
+        return
+
+    paths, fingerprints = keepa
+    index = load_product_index(paths, fingerprints)
+    table = load_cross_source_prices(paths, fingerprints, pricing, streaming)
+    if selection or marketplace != ALL_LOCALES:
+        asins = load_keepa(paths, fingerprints)['ASIN'][row_mask(paths, fingerprints, selection, marketplace)]
+        table = table[table.index.isin(asins)]
+    col1, col2, col3 = st.columns(3)
+    col1.metric('Keepa products', f"{len(index):,}")
+    col2.metric('Matched in pricing data', f"{len(table):,}")
+    col3.metric('EAN cells in scientific notation', f"{index.lossy_eans:,}",
+                help='Stored as e.g. 3.61427E+12 in the export; these cannot be matched exactly.')
+    if table.empty:
+        st.info("No product of the Keepa exports appears in the combined pricing data.")
+        return
+    plotly_chart(source_price_scatter(table), use_container_width=True)
+    dataframe(table, column_config={
+        column: st.column_config.NumberColumn(format="%.2f") for column in table.columns if column != 'Brand'
+    })
+
+
+def margin_analysis():
+    keepa, _ = data_version()
+    marketplace, selection = keepa_filters(keepa)
+    model = load_margin_model(*keepa, selection)
+
+    st.markdown("<a id='margin-analysis'></a><h2>Margin Analysis</h2>", unsafe_allow_html=True)
+    st.markdown("""
+    <p>Net proceeds per ASIN after the referral fee, the FBA pick &amp; pack fee and the cost of goods, at the current Buy Box price or under a what-if scenario.</p>
+    """, unsafe_allow_html=True)
+    if not len(model):
+        st.info("No product of the selection has a Buy Box price.")
+        return
+
+    st.subheader('What-if Scenario')
+    col1, col2, col3, col4 = st.columns(4)
+    price_change = col1.slider('Price change (%)', -50, 50, 0, key='margin_price_change')
+    cogs = col2.number_input('Cost of goods (% of current price)', 0.0, 100.0, 0.0, step=5.0, key='margin_cogs')
+    referral = fba = None
+    if col3.checkbox('Override referral fee', key='margin_override_referral'):
+        referral = col3.number_input('Referral fee (%)', 0.0, 50.0, 15.0, step=0.5, key='margin_referral')
+    if col4.checkbox('Override FBA fee', key='margin_override_fba'):
+        fba = col4.number_input('FBA fee (€)', 0.0, 50.0, 4.0, step=0.25, key='margin_fba')
+    scenario = dict(price_change=price_change, cogs=cogs, referral=referral, fba=fba)
+
+    with span('margin scenario', 'section', len(model)):
+        proceeds = model.proceeds(**scenario)
+        if marketplace != ALL_LOCALES:
+            proceeds = proceeds[proceeds[LOCALE_COLUMN] == marketplace]
+        brands = for_locale(model.group_margins(**scenario, total=ALL_LOCALES), marketplace)
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric('Priced ASINs', f"{len(proceeds):,}")
+    col2.metric('Median margin', f"{proceeds['Margin %'].median():.1f}%")
+    col3.metric('Mean net proceeds', f"€{proceeds['Net proceeds'].mean():.2f}")
+    col4.metric('Loss-making ASINs', f"{(proceeds['Net proceeds'] < 0).mean():.1%}")
+
+    plotly_chart(histogram_bar(margin_histogram(proceeds['Margin %']), title='ASINs by Margin',
+                               axis_label='Margin (%)'), use_container_width=True)
+    plotly_chart(brand_bar(top_n(brands, 'Total net proceeds'), 'Total Net Proceeds',
+                           title='Top 10 Brands by Total Net Proceeds per Unit Sold',
+                           axis_label='Total Net Proceeds (€)'), use_container_width=True)
+    plotly_chart(brand_bar(top_n(brands, 'Margin %', ascending=True), 'Average Margin',
+                           title='10 Brands with the Lowest Average Margin', axis_label='Average Margin (%)'),
+                 use_container_width=True)
+
+    st.write("### Lowest-margin ASINs")
+    lowest = proceeds.nsmallest(20, 'Margin %')
+    dataframe(lowest, hide_index=True, column_config={
+        column: st.column_config.NumberColumn(format="%.2f") for column in lowest.columns[len(model.by) + 1:]
+    })
+
+
+def contact():
+    # Contact
+    st.markdown("<a id='contact'></a><h2>8. Contact</h2>", unsafe_allow_html=True)
+    st.markdown("""
+    <p>If you have any questions or require further analysis, please do not hesitate to reach out.</p>
+    <p>Contact us at: <a href="mailto:muthu@wissend.com">muthu@wissend.com</a></p>
+    """, unsafe_allow_html=True)
+
+
+# Status of the background reload of the data files
+watcher = data_watcher()
+if watcher.reloading:
+    st.sidebar.caption('Loading new data in the background...')
+if watcher.error is not None:
+    st.sidebar.warning(f"Reloading the data failed, showing the previous version: {watcher.error}")
+
+# Sidebar navigation; only the selected section runs
+page = st.navigation([
+    st.Page(overview, title='Overview', url_path='overview', default=True),
+    st.Page(brand_performance, title='Brand Performance', url_path='brand-performance'),
+    st.Page(statistical_summary, title='Statistical Summary', url_path='statistical-summary'),
+    st.Page(price_drop_analysis, title='Price Drop Analysis', url_path='price-drop-analysis'),
+    st.Page(category_insights, title='Category Insights', url_path='category-insights'),
+    st.Page(marketplace_comparison, title='Marketplace Comparison', url_path='marketplace-comparison'),
+    st.Page(trends, title='Trends', url_path='trends'),
+    st.Page(customer_reviews, title='Customer Reviews', url_path='customer-reviews'),
+    st.Page(source_analysis, title='Source Analysis', url_path='source-analysis'),
+    st.Page(cross_source_comparison, title='Cross-Source Prices', url_path='cross-source-prices'),
+    st.Page(margin_analysis, title='Margin Analysis', url_path='margin-analysis'),
+    st.Page(contact, title='Contact', url_path='contact'),
+])
+
+# The profiler is offered with DASHBOARD_DEBUG=1 or ?debug=1 (see ``profiling``)
+profiler = None
+if os.environ.get('DASHBOARD_DEBUG') == '1' or st.query_params.get('debug') == '1':
+    profiler = profiling_settings()
+if profiler is None:
+    page.run()
+else:
+    with activate(profiler), span(page.title, 'section'):
+        page.run()
+    profiling_panel(profiler)
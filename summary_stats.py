@@ -0,0 +1,98 @@
+"""Statistical summary of the numeric Keepa columns.
+
+``summary_statistics`` computes every statistic for all columns at once
+with frame-level reductions. ``SummarySketch`` is the approximate variant
+for large inputs: it is built from mergeable running stats and quantile
+sketches, so it can be fed chunk by chunk or combined across files.
+
+Both return plain floats; number formatting is left to the display layer.
+"""
+import numpy as np
+import pandas as pd
+
+from pricing_stream import GroupStats, QuantileSketch
+from profiling import profiled
+
+SUMMARY_COLUMNS = ['Min', 'Q1', 'Median', 'Q3', 'Max', 'Mean', 'Mode', 'Variance', 'Standard Deviation']
+
+
+@profiled()
+def summary_statistics(frame, columns):
+    """Exact summary, one row per column of ``frame``."""
+    data = frame[[name for name in columns if name in frame.columns]].astype('float64')
+    quantiles = data.quantile([0, 0.25, 0.5, 0.75, 1]).T
+    modes = data.mode(dropna=True)
+    return pd.DataFrame({
+        'Min': quantiles[0],
+        'Q1': quantiles[0.25],
+        'Median': quantiles[0.5],
+        'Q3': quantiles[0.75],
+        'Max': quantiles[1],
+        'Mean': data.mean(),
+        'Mode': modes.iloc[0] if len(modes) else np.nan,
+        'Variance': data.var(),
+        'Standard Deviation': data.std(),
+    }, columns=SUMMARY_COLUMNS)
+
+
+class SummarySketch:
+    """Mergeable approximate summary of several columns.
+
+    Quartiles and median carry the relative error ``alpha`` of the quantile
+    sketch, the mode is the centre of the fullest sketch bucket; mean and
+    variance are exact, and so are min and max until rows are subtracted.
+    """
+
+    def __init__(self, alpha=0.01):
+        self.stats = GroupStats()
+        self.sketch = QuantileSketch(alpha)
+        # Min and max of GroupStats do not survive a subtract
+        self.subtracted = False
+
+    def update(self, frame, columns):
+        columns = [name for name in columns if name in frame.columns]
+        # One flat array keyed by column name: each column is one sketch group
+        keys = np.repeat(np.array(columns, dtype=object), len(frame))
+        values = frame[columns].to_numpy(dtype='float64', na_value=np.nan).ravel(order='F')
+        self.stats.update(keys, values)
+        self.sketch.update(keys, values)
+        return self
+
+    def merge(self, other):
+        self.stats.merge(other.stats)
+        self.sketch.merge(other.sketch)
+        self.subtracted |= other.subtracted
+        return self
+
+    def subtract(self, other):
+        """Take the rows summarised by ``other`` back out. Min and max then
+        come from the sketch, with the same relative error as the quartiles."""
+        self.stats.subtract(other.stats)
+        self.sketch.subtract(other.sketch)
+        self.subtracted = True
+        return self
+
+    def summary(self):
+        stats = self.stats.summary()
+        quartiles = self.sketch.quantiles((0, 0.25, 0.5, 0.75, 1))
+        exact = not self.subtracted
+        return pd.DataFrame({
+            'Min': stats['min'] if exact else quartiles['0%'],
+            'Q1': quartiles['25%'],
+            'Median': quartiles['50%'],
+            'Q3': quartiles['75%'],
+            'Max': stats['max'] if exact else quartiles['100%'],
+            'Mean': stats['mean'],
+            'Mode': self.sketch.modes(),
+            'Variance': stats['var'],
+            'Standard Deviation': stats['std'],
+        }, columns=SUMMARY_COLUMNS)
+
+
+@profiled()
+def approximate_summary_statistics(frame, columns, alpha=0.01, chunksize=1_000_000):
+    """Sketch-based summary of ``frame``, built chunk by chunk."""
+    sketch = SummarySketch(alpha)
+    for start in range(0, len(frame), chunksize):
+        sketch.update(frame.iloc[start:start + chunksize], columns)
+    return sketch.summary().reindex([name for name in columns if name in frame.columns])
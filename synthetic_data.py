@@ -0,0 +1,234 @@
+"""Synthetic Keepa exports and combined pricing files for benchmarks.
+
+The files match the real formats: the Keepa header of the Italian export
+(delivery emoji included), display strings such as ``€ 121.60``, ``3%``,
+``-`` and ``yes``/``no``, EANs partly in scientific notation, and category
+paths of a generated tree. Values are drawn from pools of preformatted
+strings, so writing ten million rows takes minutes, not hours. Files are
+written in chunks and the output only depends on ``rows`` and ``seed``.
+
+Usage:
+    python synthetic_data.py --rows 1000000 --out bench_data
+"""
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from keepa_schema import clean_column_name, column_kind
+
+KEEPA_COLUMNS = [
+    'Locale', 'ASIN', 'Product Codes: EAN', 'Image', 'Title', 'Brand', 'Buy Box 🚚: Current',
+    'Buy Box 🚚: 90 days avg.', 'Sales Rank: 90 days avg.', 'Sales Rank: 90 days drop %', 'Bought in past month',
+    'Buy Box 🚚: 90 days OOS', 'Buy Box: Is FBA', 'Buy Box Seller', 'Sales Rank: 30 days avg.',
+    'Buy Box 🚚: 30 days avg.', 'Buy Box 🚚: 180 days avg.', 'Buy Box 🚚: 1 day drop %', 'Buy Box 🚚: 7 days drop %',
+    'Buy Box 🚚: 30 days drop %', 'Buy Box 🚚: 90 days drop %', 'Buy Box 🚚: Price drop since last visit',
+    'Buy Box 🚚: Drop % since last visit', 'Buy Box 🚚: Last visit', 'Buy Box 🚚: Lowest', 'Buy Box 🚚: Is Lowest',
+    'Buy Box 🚚: Is Lowest 90 days', 'Buy Box 🚚: Highest', 'Buy Box 🚚: Stock',
+    'Buy Box 🚚: Availability of the Buy Box', 'Amazon: Current', 'Amazon: 90 days avg.', 'Buy Box: % Amazon 90 days',
+    'Amazon: 90 days OOS', 'Amazon: 30 days avg.', 'Amazon: 180 days avg.', 'Amazon: 1 day drop %',
+    'Amazon: 7 days drop %', 'Amazon: 30 days drop %', 'Amazon: 90 days drop %', 'Amazon: Price drop since last visit',
+    'Amazon: Drop % since last visit', 'Amazon: Last visit', 'Amazon: Lowest', 'Amazon: Is Lowest',
+    'Amazon: Is Lowest 90 days', 'Amazon: Highest', 'Amazon: Stock', 'Amazon: OOS Count 30 days',
+    'Amazon: OOS Count 90 days', 'Amazon: Availability of the Amazon offer', 'Amazon: Amazon offer shipping delay',
+    'Buy Box: % Top Seller 90 days', 'Buy Box: % Amazon 30 days', 'Buy Box: Winner Count 90 days',
+    'Count of retrieved live offers: New, FBA', 'Count of retrieved live offers: New, FBM',
+    'Buy Box: % Amazon 180 days', 'Buy Box: % Amazon 365 days', 'Buy Box: % Top Seller 30 days',
+    'Buy Box: % Top Seller 180 days', 'Buy Box: % Top Seller 365 days', 'Buy Box: Winner Count 30 days',
+    'Buy Box: Winner Count 180 days', 'Buy Box: Winner Count 365 days', 'New: Current', 'New: 30 days avg.',
+    'New: 90 days avg.', 'New: 180 days avg.', 'New: 1 day drop %', 'New: 7 days drop %', 'New: 30 days drop %',
+    'New: 90 days drop %', 'New: Price drop since last visit', 'New: Drop % since last visit', 'New: Last visit',
+    'New: Lowest', 'New: Is Lowest', 'New: Is Lowest 90 days', 'New: Highest', 'New: 90 days OOS',
+    'FBA Pick&Pack Fee', 'Referral Fee %', 'Referral Fee based on current Buy Box price', 'Categories: Root',
+    'Categories: Sub', 'Categories: Tree', 'Categories: Launchpad', 'Product Codes: PartNumber',
+    'Item: Dimension (cm³)', 'Item: Weight (g)', 'Is HazMat',
+]
+
+PRICING_COLUMNS = ['asin', 'title', 'price', 'rating', 'number_of_reviews', 'source']
+
+SOURCES = ['amazon', 'ebay', 'notino', 'douglas', 'sephora', 'primor']
+
+CATEGORY_ROOTS = ['Bellezza', 'Salute e cura della persona', 'Casa e cucina', 'Moda']
+CATEGORY_FAMILIES = ['Fragranze e profumi', 'Cura della pelle', 'Trucco', 'Cura dei capelli', 'Bagno e corpo',
+                     'Manicure e pedicure']
+CATEGORY_GROUPS = ['Donna', 'Uomo', 'Unisex', 'Set regalo']
+CATEGORY_LEAVES = ['Eau de Parfum', 'Eau de Toilette', 'Creme per il corpo', 'Deodoranti']
+
+AVAILABILITY = ['Disponibilità immediata', 'Generalmente  spedito entro 2-3 giorni',
+                'Generalmente  spedito entro 3-4 giorni']
+AMAZON_OFFERS = ['no Amazon offer exists', 'Amazon offer is in stock and shippable', 'Amazon offer is back-ordered']
+
+# Share of empty cells per kind of column
+MISSING_SHARE = {'money': 0.3, 'percent': 0.3, 'int': 0.1, 'float': 0.2, 'bool': 0.0, 'string': 0.1}
+
+POOL_SIZE = 4096
+BASE36 = np.frombuffer(b'0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ', dtype=np.uint8)
+
+
+def asins(ids):
+    """Distinct ASIN-shaped codes (``B0`` plus 8 base-36 digits) for ids."""
+    # Odd multiplier prime to 36: a bijection on 36**8 that scatters the ids
+    scrambled = (np.asarray(ids, dtype=np.int64) * 1_000_003 + 7_919) % 36 ** 8
+    digits = scrambled[:, None] // 36 ** np.arange(7, -1, -1, dtype=np.int64) % 36
+    codes = np.concatenate([np.full((len(digits), 2), [ord('B'), ord('0')], dtype=np.uint8),
+                            BASE36[digits]], axis=1)
+    return codes.view('S10').ravel().astype(str)
+
+
+def eans(rng, n):
+    """EAN-13 codes with a valid check digit."""
+    digits = rng.integers(0, 10, size=(n, 12))
+    digits[:, 0] = rng.choice([3, 4, 8], size=n)
+    check = (10 - (digits * np.tile([1, 3], 6)).sum(axis=1) % 10) % 10
+    return (digits @ 10 ** np.arange(12, 0, -1, dtype=np.int64) + check).astype(str)
+
+
+def category_paths():
+    return [' › '.join(path) for path in
+            ((root, family, group, leaf) for root in CATEGORY_ROOTS for family in CATEGORY_FAMILIES
+             for group in CATEGORY_GROUPS for leaf in CATEGORY_LEAVES)]
+
+
+def zipf_choice(rng, values, n, exponent=1.1):
+    """``n`` draws from ``values``, the first ones the most frequent."""
+    weights = 1.0 / np.arange(1, len(values) + 1) ** exponent
+    return np.asarray(values, dtype=object)[rng.choice(len(values), size=n, p=weights / weights.sum())]
+
+
+def value_pool(rng, kind, name=''):
+    """Preformatted display strings of one kind of Keepa column."""
+    if kind == 'money':
+        return np.char.add('€ ', np.char.mod('%.2f', rng.lognormal(np.log(45), 0.7, POOL_SIZE))).astype(object)
+    if kind == 'percent':
+        return np.char.add(rng.integers(-60, 101, POOL_SIZE).astype(str), '%').astype(object)
+    if kind == 'int' and not name.startswith('Sales Rank'):
+        # Counts of offers, winners and OOS events
+        return rng.lognormal(np.log(5), 1.0, POOL_SIZE).astype(np.int64).astype(str).astype(object)
+    if kind == 'int':
+        return rng.lognormal(np.log(40_000), 1.5, POOL_SIZE).astype(np.int64).astype(str).astype(object)
+    if kind == 'float':
+        return rng.integers(1, 2_000, POOL_SIZE).astype(str).astype(object)
+    return np.array(['yes', 'no'], dtype=object)
+
+
+def with_missing(rng, values, share, placeholder=''):
+    values = np.asarray(values, dtype=object)
+    if share:
+        values[rng.random(len(values)) < share] = placeholder
+    return values
+
+
+def keepa_frame(rows, seed=0, locale='it', start=0, brands=None):
+    """Raw Keepa rows ``start`` to ``start + rows`` as display strings."""
+    rng = np.random.default_rng([seed, start])
+    brands = brands or max(50, min(20_000, (start + rows) // 200))
+    ids = np.arange(start, start + rows)
+    paths = zipf_choice(rng, category_paths(), rows, exponent=0.8)
+    parts = pd.Series(paths).str.split(' › ', regex=False)
+
+    codes = eans(rng, rows).astype(object)
+    lossy = rng.random(rows) < 0.1
+    codes[lossy] = np.char.add(np.char.mod('%.5f', codes[lossy].astype(np.int64) / 1e12), 'E+12')
+    pairs = ~lossy & (rng.random(rows) < 0.1)
+    codes[pairs] = np.char.add(np.char.add(codes[pairs].astype(str), ', '), eans(rng, int(pairs.sum())))
+
+    special = {
+        'Locale': np.full(rows, locale, dtype=object),
+        'ASIN': asins(ids),
+        'Product Codes: EAN': codes,
+        'Image': np.char.add(np.char.add('https://m.media-amazon.com/images/I/', asins(ids)), '.jpg'),
+        'Title': np.char.add('Prodotto ', ids.astype(str)),
+        'Brand': with_missing(rng, zipf_choice(rng, [f'BRAND {i:05d}' for i in range(brands)], rows), 0.03),
+        'Buy Box Seller': with_missing(rng, zipf_choice(rng, ['Amazon'] + [f'3rd Party (A{i:013d})'
+                                                                          for i in range(200)], rows), 0.4),
+        'Buy Box 🚚: Availability of the Buy Box': with_missing(rng, zipf_choice(rng, AVAILABILITY, rows), 0.4),
+        'Amazon: Availability of the Amazon offer': zipf_choice(rng, AMAZON_OFFERS, rows),
+        'Amazon: Amazon offer shipping delay': np.full(rows, '', dtype=object),
+        'Categories: Root': parts.str[0].to_numpy(dtype=object),
+        'Categories: Sub': parts.str[-1].to_numpy(dtype=object),
+        'Categories: Tree': paths,
+        'Product Codes: PartNumber': with_missing(rng, codes.copy(), 0.05),
+    }
+    columns = {}
+    for name in KEEPA_COLUMNS:
+        if name in special:
+            columns[name] = special[name]
+            continue
+        kind = column_kind(clean_column_name(name))
+        pool = value_pool(rng, kind, name)
+        values = pool[rng.integers(0, len(pool), rows)]
+        # Keepa writes '-' for some empty percentages
+        columns[name] = with_missing(rng, values, MISSING_SHARE[kind], '-' if kind == 'percent' else '')
+    return pd.DataFrame(columns)
+
+
+def pricing_frame(rows, seed=0, catalogue=None, start=0):
+    """Rows of the combined pricing file, matching ``catalogue`` Keepa ASINs."""
+    rng = np.random.default_rng([seed, start, 1])
+    products = rng.integers(0, catalogue or max(rows // 3, 1), rows)
+    prices = np.char.add('€', np.char.mod('%.2f', rng.lognormal(np.log(45), 0.7, rows))).astype(object)
+    return pd.DataFrame({
+        'asin': asins(products),
+        'title': np.char.add('Prodotto ', products.astype(str)),
+        'price': with_missing(rng, prices, 0.05),
+        'rating': rng.choice(np.arange(1.0, 5.5, 0.5), size=rows,
+                             p=np.array([1, 1, 1, 2, 3, 5, 9, 14, 10]) / 46),
+        'number_of_reviews': rng.lognormal(np.log(300), 2.0, rows).astype(np.int64),
+        'source': zipf_choice(rng, SOURCES, rows),
+    })
+
+
+def write_chunks(path, frames):
+    with open(path, 'w', encoding='utf-8', newline='') as handle:
+        for number, frame in enumerate(frames):
+            frame.to_csv(handle, index=False, header=number == 0)
+    return path
+
+
+def write_keepa(path, rows, seed=0, locale='it', chunksize=100_000):
+    """Write a synthetic Keepa export of ``rows`` rows to ``path``."""
+    brands = max(50, min(20_000, rows // 200))
+    return write_chunks(path, (keepa_frame(min(chunksize, rows - start), seed, locale, start, brands)
+                               for start in range(0, rows, chunksize)))
+
+
+def write_pricing(path, rows, seed=0, catalogue=None, chunksize=500_000):
+    """Write a synthetic combined pricing file of ``rows`` rows to ``path``."""
+    return write_chunks(path, (pricing_frame(min(chunksize, rows - start), seed, catalogue, start)
+                               for start in range(0, rows, chunksize)))
+
+
+def synthetic_paths(directory, rows):
+    return (os.path.join(directory, f'synthetic_{rows}_keepa.csv'),
+            os.path.join(directory, f'synthetic_{rows}_pricing.csv'))
+
+
+def ensure_files(directory, rows, seed=0):
+    """Keepa and pricing files of ``rows`` rows in ``directory``, written
+    unless they exist. The pricing rows refer to the Keepa ASINs."""
+    os.makedirs(directory, exist_ok=True)
+    keepa_path, pricing_path = synthetic_paths(directory, rows)
+    if not os.path.exists(keepa_path):
+        write_keepa(keepa_path + '.partial', rows, seed)
+        os.replace(keepa_path + '.partial', keepa_path)
+    if not os.path.exists(pricing_path):
+        write_pricing(pricing_path + '.partial', rows, seed, catalogue=rows)
+        os.replace(pricing_path + '.partial', pricing_path)
+    return keepa_path, pricing_path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write synthetic Keepa and combined pricing files.")
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000], help="rows per file (default: 10000)")
+    parser.add_argument('--out', default='bench_data', help="output directory (default: bench_data)")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    for rows in args.rows:
+        for path in ensure_files(args.out, rows, args.seed):
+            print(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from anomalies import flag_columns, scan_anomalies, signal_columns
+
+DROP = 'Buy Box : 30 days drop %'
+OOS = 'Amazon: 90 days OOS'
+LOWEST = 'Buy Box : Is Lowest'
+
+
+def catalogue(signals, brands=None, subs=None):
+    rows = len(next(iter(signals.values())))
+    return pd.DataFrame({
+        'Locale': 'it',
+        'ASIN': [f'B{index:09d}' for index in range(rows)],
+        'Brand': pd.Categorical(brands if brands is not None else ['Chanel'] * rows),
+        'Categories: Sub': pd.Categorical(subs if subs is not None else ['Eau de Parfum'] * rows),
+        **signals,
+    })
+
+
+def test_signal_and_flag_columns():
+    columns = [LOWEST, 'Amazon: Is Lowest 90 days', DROP, 'New: Drop % since last visit', OOS,
+               'New: OOS Count 30 days', 'Buy Box : Current', 'Buy Box : 90 days avg.']
+    assert signal_columns(columns) == columns[:6]
+    assert flag_columns(signal_columns(columns)) == {LOWEST, 'Amazon: Is Lowest 90 days'}
+
+
+def test_threshold_on_the_robust_z_score():
+    values = np.array([-2.0, -1.0, -1.0, 0.0, 0.0, 0.0, 1.0, 1.0, 2.0, 0.0])
+    # Median 0 and MAD 1: the robust z-score of a value is |value| / 1.4826
+    values[-1] = 1.4826 * 4
+    frame = catalogue({DROP: values})
+    alerts = scan_anomalies(frame)
+    assert alerts['ASIN'].tolist() == ['B000000009']
+    assert alerts.loc[0, 'Score'] == pytest.approx(4.0)
+    assert alerts.loc[0, 'Signal'] == DROP and alerts.loc[0, 'Value'] == values[-1]
+    assert alerts.loc[0, 'Brand median'] == 0.0
+    # At or below the score it is flagged, above it is not
+    assert len(scan_anomalies(frame, threshold=4.0)) == 1
+    assert scan_anomalies(frame, threshold=4.01).empty
+    # Drops score both ways
+    assert scan_anomalies(catalogue({DROP: -values}))['Score'].tolist() == pytest.approx([4.0])
+
+
+def test_zero_mad_falls_back_to_the_mean_absolute_deviation():
+    values = np.zeros(20)
+    values[-3:] = [1.0, 2.0, 50.0]
+    alerts = scan_anomalies(catalogue({OOS: values}))
+    # MAD 0, mean absolute deviation 53 / 20
+    assert alerts['ASIN'].tolist() == ['B000000019']
+    assert alerts.loc[0, 'Score'] == pytest.approx(50 / (1.2533 * 53 / 20))
+
+
+def test_constant_and_all_nan_signals_never_alert():
+    rows = 12
+    outlier = np.zeros(rows)
+    outlier[0] = 1.0
+    frame = catalogue({
+        DROP: np.full(rows, 5.0),
+        OOS: np.full(rows, np.nan),
+        'New: OOS Count 30 days': np.r_[np.arange(rows - 1.0), 500.0],
+    })
+    with np.errstate(all='ignore'), pytest.warns(RuntimeWarning):
+        alerts = scan_anomalies(frame)
+    assert alerts['ASIN'].tolist() == [f'B{rows - 1:09d}']
+    assert alerts['Signal'].tolist() == ['New: OOS Count 30 days']
+    assert alerts['Signals'].tolist() == [1]
+
+
+def test_flags_are_scored_by_the_group_share():
+    flags = [False] * 49 + [True]
+    alerts = scan_anomalies(catalogue({LOWEST: pd.array(flags, dtype='boolean')}))
+    share = 1 / 50
+    assert alerts['ASIN'].tolist() == ['B000000049']
+    assert alerts.loc[0, 'Brand median'] == pytest.approx(share)
+    assert alerts.loc[0, 'Score'] == pytest.approx((1 - share) / np.sqrt(share * (1 - share)))
+
+
+def test_a_signal_must_stand_out_from_every_peer_group():
+    small = [0.0, 1.0, -1.0, 0.5, -0.5, 0.2, -0.2, 0.8, -0.8]
+    brands = ['Chanel'] * 10 + ['Dior'] * 10
+    subs = ['Colonia'] + ['Eau de Parfum'] * 9 + ['Colonia'] * 9 + ['Eau de Parfum']
+    # Row 0 is far from its brand but typical of its subcategory
+    values = np.array([40.0] + small + [40.0 + value for value in small] + [0.0])
+    frame = catalogue({DROP: values}, brands, subs)
+    assert 'B000000000' not in scan_anomalies(frame)['ASIN'].tolist()
+    assert 'B000000000' in scan_anomalies(frame, peers=['Brand'])['ASIN'].tolist()
+    # Groups smaller than min_group are compared with the whole catalogue,
+    # where row 0 is typical again
+    assert 'B000000000' not in scan_anomalies(frame, peers=['Brand'], min_group=11)['ASIN'].tolist()
@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+import figure_cache
+from figure_cache import FigureCache, cached_figure, content_hash, figure_bytes
+
+
+def bar(values):
+    return go.Figure(go.Bar(x=np.arange(len(values)), y=np.asarray(values, dtype='float64')))
+
+
+def test_equal_contents_hash_the_same():
+    frame = pd.DataFrame({'Brand': ['Chanel', 'Dior'], 'Price': [1.0, 2.0]})
+    assert content_hash(frame, 'title', 3) == content_hash(frame.copy(), 'title', 3)
+    assert content_hash(frame) != content_hash(frame.assign(Price=[1.0, 2.5]))
+    assert content_hash(frame) != content_hash(frame.rename(columns={'Price': 'Rank'}))
+    assert content_hash(frame) != content_hash(frame.astype({'Price': 'float32'}))
+    assert content_hash(np.arange(3)) == content_hash(np.arange(3))
+    assert content_hash(np.arange(3)) != content_hash(np.arange(3).astype('float64'))
+
+
+def test_figure_bytes_counts_the_data_arrays():
+    assert figure_bytes(bar(np.ones(10_000))) >= 2 * 8 * 10_000
+    assert figure_bytes(bar(np.ones(10))) < 8 * 10_000
+
+
+def test_lru_evicts_by_size():
+    size = figure_bytes(bar(np.ones(1000)))
+    cache = FigureCache(max_bytes=2 * size)
+    cache.put('a', bar(np.ones(1000)))
+    cache.put('b', bar(np.ones(1000)))
+    assert cache.get('a') is not None
+    # 'b' is now the least recently used
+    cache.put('c', bar(np.ones(1000)))
+    assert cache.get('b') is None
+    assert cache.get('a') is not None and cache.get('c') is not None
+    assert cache.bytes == 2 * size
+    # A figure above the cap is not cached at all
+    cache.put('d', bar(np.ones(10_000)))
+    assert cache.get('d') is None and list(cache.entries) == ['a', 'c']
+
+
+def test_cached_builder_serves_equal_inputs_from_the_cache(monkeypatch):
+    monkeypatch.setattr(figure_cache, 'FIGURES', FigureCache())
+    calls = []
+
+    @cached_figure
+    def builder(frame, title=None):
+        calls.append(title)
+        return bar(frame['Price'])
+
+    frame = pd.DataFrame({'Price': [1.0, 2.0]})
+    fig = builder(frame, title='Prices')
+    assert builder(frame.copy(), title='Prices') is fig
+    assert builder(frame, title='Other') is not fig
+    assert calls == ['Prices', 'Other']
@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+
+from filters import FilterIndex
+
+
+def catalogue():
+    rng = np.random.default_rng(3)
+    rows = 500
+    return pd.DataFrame({
+        'Locale': rng.choice(['it', 'es', 'fr'], rows),
+        'Brand': pd.Categorical(rng.choice(['Chanel', 'Dior', 'Guerlain', None], rows),
+                                categories=['Chanel', 'Dior', 'Guerlain', 'Tom Ford']),
+        'Categories: Root': rng.choice(['Bellezza', 'Moda'], rows),
+        'Buy Box: Is FBA': pd.array(rng.choice([True, False, None], rows), dtype='boolean'),
+        'Buy Box : Current': np.where(rng.random(rows) < 0.1, np.nan, rng.uniform(5, 300, rows)),
+    })
+
+
+def test_mask_matches_a_scan():
+    frame = catalogue()
+    index = FilterIndex(frame)
+    selection = (('Brand', ('Dior', 'Tom Ford')), ('Locale', ('it', 'fr')), ('Buy Box: Is FBA', True),
+                 ('Buy Box : Current', (20.0, 150.0)))
+    expected = (frame['Brand'].isin(['Dior', 'Tom Ford']) & frame['Locale'].isin(['it', 'fr'])
+                & frame['Buy Box: Is FBA'].fillna(False) & frame['Buy Box : Current'].between(20, 150))
+    np.testing.assert_array_equal(index.mask(selection), expected.to_numpy(dtype=bool))
+
+
+def test_every_label_value_maps_to_its_rows():
+    frame = catalogue()
+    index = FilterIndex(frame)
+    for column in ('Locale', 'Brand', 'Categories: Root'):
+        for value in index.values(column):
+            np.testing.assert_array_equal(index.condition_mask(column, (value,)),
+                                          (frame[column] == value).to_numpy(dtype=bool))
+    assert not index.condition_mask('Brand', ('Tom Ford',)).any()
+
+
+def test_rows_without_a_brand_are_left_out():
+    frame = catalogue()
+    np.testing.assert_array_equal(FilterIndex(frame).mask(()), frame['Brand'].notna().to_numpy())
+
+
+def test_bounds():
+    frame = catalogue()
+    assert FilterIndex(frame).bounds('Buy Box : Current') == (frame['Buy Box : Current'].min(),
+                                                             frame['Buy Box : Current'].max())
+    assert FilterIndex(frame.assign(**{'Buy Box : Current': np.nan})).bounds('Buy Box : Current') is None
@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+
+from identifiers import ProductIndex, cross_source_prices, parse_asins, parse_eans, valid_check_digit
+
+
+def test_check_digit():
+    codes = pd.Series(['4006381333931', '4006381333932', '96385074', '012345678905', '10012345678902'],
+                      dtype='string')
+    assert valid_check_digit(codes).tolist() == [True, False, True, True, True]
+    assert valid_check_digit(codes[:0]).tolist() == []
+
+
+def test_parse_eans_splits_multi_ean_cells_and_counts_lossy_ones():
+    cells = pd.Series(['3145891073706, 0751125331875', '3.61427E+12', None, '751125331875',
+                       '4006381333932', '123', '10012345678902'])
+    eans, lossy = parse_eans(cells)
+    assert lossy == 1
+    # Indexed by row; UPC-A is padded to 13 digits and GTIN-14 kept as is
+    assert list(eans.items()) == [(0, '3145891073706'), (0, '0751125331875'), (3, '0751125331875'),
+                                  (6, '10012345678902')]
+
+
+def test_parse_asins():
+    asins = parse_asins(pd.Series([' b0btmz3634 ', 'B0BTMZ363', None, 'B0BTMZ3634']))
+    assert asins.tolist() == ['B0BTMZ3634', pd.NA, pd.NA, 'B0BTMZ3634']
+
+
+KEEPA = pd.DataFrame({
+    'ASIN': ['B000000001', 'B000000002', 'B000000001', 'B000000003', 'invalid'],
+    'Locale': ['it', 'it', 'es', 'es', 'it'],
+    'Brand': ['Chanel', 'Dior', 'Chanel', 'Guerlain', 'Dior'],
+    'Buy Box : Current': [100.0, 50.0, 110.0, 70.0, 10.0],
+    'Product Codes: EAN': ['3145891073706, 4006381333931', '0751125331875', None, '3.61427E+12', '96385074'],
+})
+
+PRICING = pd.DataFrame({
+    'asin': ['B000000001', None, 'B000000001', None, 'B000000009', None, 'b000000002'],
+    'ean': [None, '4006381333931', None, '751125331875', None, '96385074', None],
+    'source': ['amazon', 'ebay', 'ebay', 'amazon', 'amazon', 'ebay', 'ebay'],
+    'price': [98.0, 95.0, 97.0, 49.0, 10.0, 9.0, 51.0],
+    'rating': [4.5, 4.0, np.nan, 3.5, 5.0, 4.0, 4.5],
+})
+
+
+def test_product_index_lookup():
+    index = ProductIndex(KEEPA)
+    assert len(index) == 3
+    assert index.lossy_eans == 1
+    assert index.lookup(['B000000002', '4006381333931', '0751125331875', '96385074', 'B000000009']).tolist() == [
+        1, 0, 1, -1, -1]
+
+
+def test_cross_source_prices():
+    table = cross_source_prices(ProductIndex(KEEPA), KEEPA, [PRICING])
+    assert list(table.index) == ['B000000001', 'B000000002']
+    assert table.loc['B000000001', 'Keepa it'] == 100.0
+    assert table.loc['B000000001', 'Keepa es'] == 110.0
+    # The EAN match and the ASIN match of ebay are averaged
+    assert table.loc['B000000001', 'price ebay'] == 96.0
+    assert table.loc['B000000001', 'rating ebay'] == 4.0
+    assert table.loc['B000000002', 'price amazon'] == 49.0
+    assert table['Brand'].tolist() == ['Chanel', 'Dior']
+
+
+def test_chunked_join_matches_the_whole_frame():
+    index = ProductIndex(KEEPA)
+    whole = cross_source_prices(index, KEEPA, [PRICING])
+    for size in (1, 2, 3):
+        chunks = [PRICING.iloc[start:start + size] for start in range(0, len(PRICING), size)]
+        pd.testing.assert_frame_equal(cross_source_prices(index, KEEPA, chunks), whole)
+    # A file with only one of the identifier columns still matches on it
+    assert list(cross_source_prices(index, KEEPA, [PRICING.drop(columns='asin')]).index) == [
+        'B000000001', 'B000000002']
+    assert cross_source_prices(index, KEEPA, [PRICING.drop(columns=['asin', 'ean'])]).empty
@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from brand_metrics import ALL_LOCALES, brand_metrics
+from category_metrics import ROOT_COLUMN, SUB_COLUMN, category_metrics
+from incremental import KeepaAggregates
+from summary_stats import summary_statistics
+
+COLUMNS = ['Buy Box : Current', 'Sales Rank: 90 days avg.', 'Buy Box : 30 days drop %']
+
+
+def snapshot(rows, seed):
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame({
+        'Locale': rng.choice(['it', 'es'], rows),
+        'ASIN': [f'B{index:09d}' for index in range(rows)],
+        'Brand': rng.choice(['Chanel', 'Dior', 'Guerlain', None], rows),
+        ROOT_COLUMN: rng.choice(['Bellezza', 'Moda'], rows),
+        SUB_COLUMN: rng.choice(['Eau de Parfum', 'Eau de Toilette', 'Colonia'], rows),
+        'Buy Box : Current': rng.uniform(5, 300, rows).round(2),
+        'Sales Rank: 90 days avg.': rng.integers(1, 500_000, rows).astype(float),
+        'Buy Box : 30 days drop %': rng.normal(0, 5, rows),
+    })
+    frame.loc[rng.random(rows) < 0.1, 'Buy Box : Current'] = np.nan
+    return frame
+
+
+def next_snapshot(previous, seed):
+    """Drop some rows, change the price of others and add new ones."""
+    rng = np.random.default_rng(seed)
+    current = previous[rng.random(len(previous)) > 0.1].copy()
+    changed = rng.random(len(current)) < 0.2
+    current.loc[changed, 'Buy Box : Current'] = rng.uniform(5, 300, changed.sum()).round(2)
+    added = snapshot(50, seed + 1)
+    added['ASIN'] = [f'N{seed}{index:07d}' for index in range(len(added))]
+    return pd.concat([current, added], ignore_index=True)
+
+
+def assert_tables_equal(incremental, full):
+    pd.testing.assert_frame_equal(incremental.sort_index(), full.sort_index(), check_like=True, rtol=1e-9,
+                                  check_dtype=False, check_index_type=False)
+
+
+@pytest.fixture
+def snapshots():
+    first = snapshot(400, 1)
+    second = next_snapshot(first, 2)
+    return first, second, next_snapshot(second, 3)
+
+
+def test_refresh_counts_the_diff(snapshots):
+    first, second, _ = snapshots
+    aggregates = KeepaAggregates(COLUMNS)
+    aggregates.refresh(first, 'first')
+    added, removed, changed = aggregates.refresh(second, 'second')
+    assert added == second['Brand'].notna()[second['ASIN'].str.startswith('N')].sum()
+    assert removed > 0 and changed > 0
+    assert aggregates.refresh(second, 'second') == (0, 0, 0)
+
+
+def test_incremental_refresh_matches_full_recompute(snapshots):
+    aggregates = KeepaAggregates(COLUMNS)
+    for version, frame in enumerate(snapshots):
+        aggregates.refresh(frame, version)
+    latest = snapshots[-1].dropna(subset=['Brand'])
+
+    assert_tables_equal(aggregates.brand_metrics(),
+                        brand_metrics(latest, by=['Locale', 'Brand'], total=ALL_LOCALES))
+    for column in (ROOT_COLUMN, SUB_COLUMN):
+        assert_tables_equal(aggregates.category_metrics(column),
+                            category_metrics(latest, column, by='Locale', total=ALL_LOCALES))
+
+    summary, exact = aggregates.summary(), summary_statistics(latest, COLUMNS)
+    for statistic in ('Mean', 'Variance'):
+        np.testing.assert_allclose(summary[statistic], exact[statistic], rtol=1e-6)
+    # Quartiles carry the relative error of the quantile sketch
+    for statistic in ('Q1', 'Median', 'Q3'):
+        np.testing.assert_allclose(summary[statistic], exact[statistic], rtol=0.02, atol=0.1)
+
+
+def test_read_of_a_retired_version_returns_none(snapshots):
+    first, second, _ = snapshots
+    aggregates = KeepaAggregates(COLUMNS)
+    version = lambda aggregates: aggregates.version
+    assert aggregates.read(first, 'first', version) == 'first'
+    assert aggregates.read(second, 'second', version) == 'second'
+    assert aggregates.read(first, 'first', version) is None
+    assert aggregates.version == 'second'
+
+
+def test_summary_of_a_locale_without_branded_rows_is_empty(snapshots):
+    first = snapshots[0].copy()
+    first.loc[first['Locale'] == 'es', 'Brand'] = None
+    aggregates = KeepaAggregates(COLUMNS)
+    aggregates.refresh(first, 'first')
+    summary = aggregates.summary('es')
+    assert list(summary.index) == COLUMNS
+    assert summary['Mean'].isna().all()
+    assert aggregates.summary('it')['Mean'].notna().all()
@@ -0,0 +1,74 @@
+import pandas as pd
+import pyarrow as pa
+
+import ingest
+from keepa_schema import apply_schema, arrow_schema, compact_table
+
+RAW = pd.DataFrame({
+    'ASIN': ['B000000001', 'B000000002', 'B000000003'],
+    'Brand': ['Chanel', 'Dior', 'Chanel'],
+    'Buy Box 🚚: Current': ['€ 121.60', '-', '€ 1.234,50'],
+    'Buy Box : 30 days drop %': ['3%', '-20%', ''],
+    'Buy Box: Is FBA': ['yes', 'no', '-'],
+    'Sales Rank: Current': ['1,204', '87', 'unknown'],
+    'Item: Weight (g)': ['250', '', '97.5'],
+})
+
+
+def write_csv(tmp_path, frame=RAW):
+    path = tmp_path / 'fragance_it_keepa.csv'
+    frame.to_csv(path, index=False)
+    return str(path)
+
+
+def test_kinds_map_to_dtypes():
+    typed, _ = apply_schema(RAW)
+    assert dict(typed.dtypes.astype(str)) == {
+        'ASIN': 'string',
+        'Brand': 'string',
+        'Buy Box : Current': 'float64',
+        'Buy Box : 30 days drop %': 'float64',
+        'Buy Box: Is FBA': 'boolean',
+        'Sales Rank: Current': 'Int64',
+        'Item: Weight (g)': 'float64',
+    }
+    assert typed['Buy Box : Current'].tolist()[::2] == [121.6, 1234.5]
+    assert typed['Buy Box : 30 days drop %'].tolist()[:2] == [0.03, -0.2]
+    assert typed['Buy Box: Is FBA'].tolist()[:2] == [True, False]
+    assert typed['Sales Rank: Current'].tolist()[:2] == [1204, 87]
+
+
+def test_compact_table():
+    typed, _ = apply_schema(RAW)
+    table = compact_table(pa.Table.from_pandas(typed, schema=arrow_schema(typed.columns), preserve_index=False))
+    assert pa.types.is_dictionary(table.schema.field('Brand').type)
+    assert table.schema.field('Buy Box : Current').type == pa.float32()
+    assert table.schema.field('Sales Rank: Current').type == pa.int64()
+
+
+def test_parse_failures_are_stored_with_the_copy(tmp_path):
+    parquet_path = ingest.ingest(write_csv(tmp_path))
+    assert ingest.parse_failures(parquet_path).to_dict() == {'Sales Rank: Current': 1}
+    assert ingest.parse_failures(str(tmp_path / 'missing.parquet')).empty
+
+
+def test_copy_is_stale_after_a_schema_version_bump(tmp_path, monkeypatch):
+    csv_path = write_csv(tmp_path)
+    assert not ingest.is_current(csv_path)
+    ingest.ingest(csv_path)
+    assert ingest.is_current(csv_path)
+
+    monkeypatch.setattr(ingest, 'SCHEMA_VERSION', ingest.SCHEMA_VERSION + 1)
+    assert not ingest.is_current(csv_path)
+    # read_typed rebuilds it under the new version
+    frame = ingest.read_typed(csv_path, columns=lambda name: name.startswith('Buy Box'))
+    assert list(frame.columns) == ['Buy Box : Current', 'Buy Box : 30 days drop %', 'Buy Box: Is FBA']
+    assert ingest.is_current(csv_path)
+
+
+def test_copy_is_stale_when_the_csv_changes(tmp_path):
+    csv_path = write_csv(tmp_path)
+    ingest.ingest(csv_path)
+    write_csv(tmp_path, RAW.iloc[:2])
+    assert not ingest.is_current(csv_path)
+    assert len(ingest.read_typed(csv_path, compact=True)) == 2
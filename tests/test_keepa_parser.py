@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from keepa_parser import parse_values
+
+
+def parse_one(cell, decimal='.', boolean=False):
+    frame = pd.DataFrame({'value': [cell]}, dtype=object)
+    parsed, failures = parse_values(frame, boolean_columns=['value'] if boolean else (), decimal=decimal)
+    return parsed.at[0, 'value'], failures['value']
+
+
+@pytest.mark.parametrize('cell, expected', [
+    ('€ 121.60', 121.6),
+    ('$3', 3.0),
+    ('3%', 0.03),
+    ('-20%', -0.2),
+    ('−5', -5.0),
+    ('1.234,50', 1234.5),
+    ('1,234.50', 1234.5),
+    ('1.234.567', 1234567.0),
+    ('1,234,567', 1234567.0),
+    ('1,5', 1.5),
+    ('12', 12.0),
+])
+def test_numbers(cell, expected):
+    value, failed = parse_one(cell)
+    assert value == pytest.approx(expected)
+    assert failed == 0
+
+
+@pytest.mark.parametrize('cell', ['', '-', '–', None])
+def test_placeholders_are_missing_not_failures(cell):
+    value, failed = parse_one(cell)
+    assert np.isnan(value)
+    assert failed == 0
+
+
+@pytest.mark.parametrize('cell, decimal, expected', [
+    ('1.234', '.', 1.234),
+    ('1.234', ',', 1234.0),
+    ('1,234', '.', 1234.0),
+    ('1,234', ',', 1.234),
+])
+def test_one_separator_before_three_digits_follows_decimal(cell, decimal, expected):
+    value, _ = parse_one(cell, decimal)
+    assert value == pytest.approx(expected)
+
+
+def test_yes_no_only_in_boolean_columns():
+    assert parse_one('yes', boolean=True)[0] == 1.0
+    assert parse_one('No', boolean=True)[0] == 0.0
+    value, failed = parse_one('yes')
+    assert np.isnan(value) and failed == 1
+
+
+def test_failures_are_counted_per_column():
+    frame = pd.DataFrame({'a': ['1', 'abc', '-'], 'b': ['x', 'y', '2']}, dtype=object)
+    parsed, failures = parse_values(frame)
+    assert failures.to_dict() == {'a': 1, 'b': 2}
+    assert parsed['b'].tolist()[2] == 2.0
@@ -0,0 +1,80 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from margins import MarginModel, margin_histogram
+
+FRAME = pd.DataFrame({
+    'Locale': ['it', 'it', 'it', 'it', 'es', 'es', 'es', 'es', 'it'],
+    'ASIN': [f'B{index:09d}' for index in range(9)],
+    'Brand': ['Chanel', 'Chanel', 'Dior', 'Dior', 'Chanel', 'Dior', 'Dior', 'Chanel', 'Dior'],
+    'Buy Box : Current': [100.0, 40.0, 0.0, 75.5, 120.0, -3.0, np.nan, 60.0, 19.99],
+    'Referral Fee %': [15.0, np.nan, 15.0, 8.0, np.nan, 15.0, 15.0, np.nan, 12.0],
+    'Referral Fee based on current Buy Box price': [15.0, 6.0, 0.0, 6.04, np.nan, 0.45, np.nan, 9.0, 2.4],
+    'FBA Pick&Pack Fee': [4.5, np.nan, 3.0, 5.2, 6.1, 2.0, 2.0, np.nan, 3.1],
+})
+
+SCENARIOS = [
+    {},
+    {'price_change': -10, 'cogs': 40},
+    {'price_change': 25, 'cogs': 10, 'referral': 7},
+    {'cogs': 30, 'fba': 4},
+    {'price_change': -50, 'cogs': 60, 'referral': 20, 'fba': 0},
+]
+
+
+def row_wise(frame, price_change=0.0, cogs=0.0, referral=None, fba=None):
+    """Net proceeds and margin computed one ASIN at a time."""
+    priced = frame[frame['Buy Box : Current'] > 0]
+    percents = priced['Referral Fee %'] / 100
+    percents = percents.fillna(priced['Referral Fee based on current Buy Box price'] / priced['Buy Box : Current'])
+    median = percents.median()
+    rows = []
+    for (_, row), percent in zip(priced.iterrows(), percents):
+        current = row['Buy Box : Current']
+        price = current * (1 + price_change / 100)
+        percent = median if math.isnan(percent) else percent
+        referral_fee = price * (percent if referral is None else referral / 100)
+        fba_fee = (0.0 if math.isnan(row['FBA Pick&Pack Fee']) else row['FBA Pick&Pack Fee']) if fba is None else fba
+        net = price - referral_fee - fba_fee - current * cogs / 100
+        rows.append({'Locale': row['Locale'], 'Brand': row['Brand'], 'Price': price,
+                     'Net proceeds': net, 'Margin %': 100 * net / price})
+    return pd.DataFrame(rows)
+
+
+@pytest.mark.parametrize('scenario', SCENARIOS)
+def test_proceeds_match_the_row_wise_computation(scenario):
+    model = MarginModel(FRAME)
+    expected = row_wise(FRAME, **scenario)
+    proceeds = model.proceeds(**scenario)
+    # Rows without a positive price are left out
+    assert len(model) == len(expected) == 6
+    for column in ('Price', 'Net proceeds', 'Margin %'):
+        np.testing.assert_allclose(proceeds[column], expected[column], rtol=1e-12)
+
+
+@pytest.mark.parametrize('scenario', SCENARIOS)
+def test_group_margins_match_the_row_wise_means(scenario):
+    model = MarginModel(FRAME)
+    rows = row_wise(FRAME, **scenario)
+    expected = rows.groupby(['Locale', 'Brand']).agg(**{
+        'Products': ('Price', 'size'), 'Price': ('Price', 'mean'), 'Net proceeds': ('Net proceeds', 'mean'),
+        'Margin %': ('Margin %', 'mean'), 'Total net proceeds': ('Net proceeds', 'sum'),
+    })
+    totals = rows.groupby('Brand').agg(**{
+        'Products': ('Price', 'size'), 'Price': ('Price', 'mean'), 'Net proceeds': ('Net proceeds', 'mean'),
+        'Margin %': ('Margin %', 'mean'), 'Total net proceeds': ('Net proceeds', 'sum'),
+    })
+    expected = pd.concat([expected, pd.concat({'All': totals}, names=['Locale'])])
+
+    margins = model.group_margins(**scenario, total='All')
+    pd.testing.assert_frame_equal(margins.sort_index(), expected.sort_index(), rtol=1e-12, check_dtype=False,
+                                  check_index_type=False, check_categorical=False)
+
+
+def test_margin_histogram_clips_to_the_outer_bins():
+    counts = margin_histogram([-250.0, -100.0, -2.5, 0.0, 4.9, 99.0, 400.0, np.nan], width=5)
+    assert counts.sum() == 7
+    assert counts[-100] == 2 and counts[-5] == 1 and counts[0] == 2 and counts[95] == 2
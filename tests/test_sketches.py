@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from pricing_stream import QuantileSketch
+from summary_stats import SummarySketch, summary_statistics
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(7)
+    values = pd.DataFrame({'price': rng.lognormal(4, 1, 2000), 'drop': rng.normal(0, 5, 2000)})
+    values.loc[::17, 'price'] = np.nan
+    return values
+
+
+def test_quantiles_within_relative_error(frame):
+    alpha = 0.01
+    sketch = QuantileSketch(alpha)
+    sketch.update(np.repeat('price', len(frame)), frame['price'])
+    qs = (0.1, 0.25, 0.5, 0.75, 0.9)
+    approximate = sketch.quantiles(qs).loc['price'].to_numpy()
+    exact = np.quantile(frame['price'].dropna(), qs, method='lower')
+    np.testing.assert_allclose(approximate, exact, rtol=alpha)
+
+
+def test_merged_halves_equal_the_whole(frame):
+    whole = SummarySketch().update(frame, frame.columns)
+    merged = SummarySketch().update(frame.iloc[:700], frame.columns).merge(
+        SummarySketch().update(frame.iloc[700:], frame.columns))
+    pd.testing.assert_series_equal(merged.sketch.counts.sort_index(), whole.sketch.counts.sort_index())
+    pd.testing.assert_frame_equal(merged.summary(), whole.summary(), rtol=1e-9)
+
+
+def test_subtract_takes_rows_back_out(frame):
+    sketch = SummarySketch().update(frame, frame.columns)
+    sketch.subtract(SummarySketch().update(frame.iloc[1500:], frame.columns))
+    rest = sketch.summary().reindex(frame.columns)
+    exact = summary_statistics(frame.iloc[:1500], frame.columns)
+    np.testing.assert_allclose(rest['Mean'], exact['Mean'], rtol=1e-9)
+    np.testing.assert_allclose(rest['Variance'], exact['Variance'], rtol=1e-9)
+    # Min and max now come from the sketch
+    np.testing.assert_allclose(rest['Max'], exact['Max'], rtol=0.01)
@@ -0,0 +1,81 @@
+import datetime
+import os
+
+import pandas as pd
+import pytest
+
+import snapshot_store
+from snapshot_store import SnapshotStore
+
+TAKEN_AT = datetime.datetime(2026, 3, 2, 9, 30, 0)
+
+
+def export(rows, price):
+    return pd.DataFrame({
+        'Locale': 'it',
+        'ASIN': [f'B{index:09d}' for index in range(rows)],
+        'Brand': ['Chanel' if index % 3 else 'Dior' for index in range(rows)],
+        'Categories: Root': ['Bellezza' if index < rows // 2 else 'Moda' for index in range(rows)],
+        'Buy Box 🚚: Current': [f'€ {price + index:.2f}' for index in range(rows)],
+        'Sales Rank: 90 days avg.': [str(100 + index) for index in range(rows)],
+    })
+
+
+def write_export(directory, frame, name='fragance_it_keepa.csv'):
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, name)
+    frame.to_csv(path, index=False)
+    return path
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    # Small row groups so the index has to pick among several
+    monkeypatch.setattr(snapshot_store, 'ROW_GROUP_SIZE', 4)
+    return SnapshotStore(str(tmp_path / 'snapshots'))
+
+
+def test_same_second_exports_get_their_own_partition(store, tmp_path):
+    first = store.append(write_export(tmp_path / 'a', export(10, 10)), TAKEN_AT)
+    second = store.append(write_export(tmp_path / 'b', export(10, 20)), TAKEN_AT)
+    snapshots = store.snapshots()
+    assert first != second
+    assert snapshots['path'].nunique() == 2
+    assert [os.path.basename(path) for path in snapshots['path']] == [
+        '093000_fragance_it_keepa.parquet', '093000_fragance_it_keepa_1.parquet']
+    history = store.asin_history('B000000003')
+    assert history['Buy Box : Current'].tolist() == [13.0, 23.0]
+
+
+def test_an_export_is_stored_once(store, tmp_path):
+    path = write_export(tmp_path, export(10, 10))
+    assert store.append(path, TAKEN_AT) == store.append(path, TAKEN_AT)
+    assert len(store.snapshots()) == 1
+
+
+def test_asin_history_reads_only_the_matching_row_group(store, tmp_path, monkeypatch):
+    for day, price in enumerate((10, 20, 30), start=1):
+        store.append(write_export(tmp_path / str(day), export(10, price)), TAKEN_AT.replace(day=day))
+    read = []
+    read_row_groups = snapshot_store.pq.ParquetFile.read_row_groups
+    monkeypatch.setattr(snapshot_store.pq.ParquetFile, 'read_row_groups',
+                        lambda handle, groups, **kwargs: read.append(groups) or read_row_groups(handle, groups, **kwargs))
+
+    history = store.asin_history('B000000005')
+    assert read == [[1], [1], [1]]
+    assert history['Buy Box : Current'].tolist() == [15.0, 25.0, 35.0]
+    assert history['Snapshot'].dt.day.tolist() == [1, 2, 3]
+    assert store.asin_history('B000000005', last=2)['Buy Box : Current'].tolist() == [25.0, 35.0]
+    assert store.asin_history('B999999999').empty
+
+
+def test_group_history(store, tmp_path):
+    store.append(write_export(tmp_path, export(10, 10)), TAKEN_AT)
+    brand = store.brand_history('Dior')
+    # Rows 0, 3, 6 and 9 are Dior
+    assert brand['Products'].tolist() == [4]
+    assert brand['Buy Box : Current'].tolist() == [14.5]
+    category = store.category_history('Moda')
+    assert category['Products'].tolist() == [5]
+    assert category['Sales Rank: 90 days avg.'].tolist() == [107.0]
+    assert store.brand_history('Guerlain').empty